@@ -1,22 +1,196 @@
 import sys
 import os
+import time
+import argparse
+import multiprocessing
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from gui.main_window import MainWindow
-from PyQt6.QtWidgets import QApplication
 from utils.paths import ensure_models_directory
+from utils.log import get_logger, setup_logging
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+log = get_logger("app")
+
+def add_logging_args(parser):
+    parser.add_argument("--log-level", type=str.upper, choices=LOG_LEVELS, default=None,
+                        help="Log verbosity (default: COCOSPEAK_LOG_LEVEL or INFO)")
+    parser.add_argument("--log-file", default=None, metavar="PATH",
+                        help="Also write the log to PATH (default: COCOSPEAK_LOG_FILE)")
+
+def start_logging(args):
+    if args.log_level:
+        # Inherited by batch worker processes
+        os.environ["COCOSPEAK_LOG_LEVEL"] = args.log_level
+    setup_logging(args.log_level, args.log_file)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CocoSpeak TTS App")
+    parser.add_argument("--import-report", nargs="?", const="", default=None, metavar="OUT.json",
+                        help="Print an import-time breakdown of startup modules (optionally saved as JSON) and exit")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Torch threads for inference (overrides the saved setting, like COCOSPEAK_INFER_THREADS)")
+    parser.add_argument("--autotune-threads", nargs="?", const="", default=None, metavar="MODEL",
+                        help="Measure synthesis speed at several thread counts with a model (default: the first one), "
+                             "save the fastest for this machine and exit")
+    parser.add_argument("--cuda", action="store_true", help="Run models on the GPU (server mode and --autotune-threads)")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="Skip the warm-up sentences run after loading a model (like COCOSPEAK_WARMUP=0)")
+    parser.add_argument("--metrics-json", default=None, metavar="PATH",
+                        help="Write per-stage latency metrics (p50/p95/p99, real-time factor) to PATH on exit")
+    add_logging_args(parser)
+    serve = parser.add_argument_group("server mode")
+    serve.add_argument("--serve", action="store_true", help="Run a headless HTTP synthesis server instead of the GUI")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=5002, help="Port to listen on (default: 5002)")
+    serve.add_argument("--workers", type=int, default=None, help="Concurrent synthesis workers (default: 2)")
+    serve.add_argument("--max-queue", type=int, default=None, help="Requests allowed to wait for a worker before 503 (default: 32)")
+    serve.add_argument("--preload", nargs="?", const="", default=None, metavar="MODEL",
+                       help="Load a model (default: the first one) before accepting requests")
+    # Leave unknown arguments to Qt
+    return parser.parse_known_args(argv)
+
+def parse_batch_args(argv):
+    parser = argparse.ArgumentParser(prog="cocospeak batch", description="Render every line of a manifest to audio files")
+    parser.add_argument("manifest", help="CSV (with header) or JSONL file with id, text, model, speaker, output")
+    parser.add_argument("--output-dir", default=None,
+                        help="Folder for relative output paths (default: <manifest>_audio next to the manifest)")
+    parser.add_argument("--model", default=None, help="Model for rows without one (default: the first model found)")
+    parser.add_argument("--cuda", action="store_true", help="Run models on the GPU")
+    parser.add_argument("--overwrite", action="store_true", help="Render outputs that already exist again")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes rendering shards in parallel (default: 1)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Torch threads per worker (default: CPU cores divided by workers)")
+    parser.add_argument("--shard-size", type=int, default=None, help="Items per shard handed to a worker")
+    add_logging_args(parser)
+    return parser.parse_args(argv)
+
+def run_batch_command(argv):
+    args = parse_batch_args(argv)
+    start_logging(args)
+    if not ensure_models_directory():
+        print("❌ Failed to create models directory. Exiting.")
+        sys.exit(1)
+    from tts_module.batch import run_batch
+    summary = run_batch(args.manifest, output_dir=args.output_dir, default_model=args.model,
+                        use_cuda=args.cuda, overwrite=args.overwrite, workers=args.workers,
+                        threads=args.threads, shard_size=args.shard_size)
+    sys.exit(1 if summary["failed"] or summary["invalid"] else 0)
+
+def parse_convert_args(argv):
+    parser = argparse.ArgumentParser(prog="cocospeak convert",
+                                     description="Rewrite .pth models as .safetensors for memory-mapped loading")
+    parser.add_argument("models", nargs="*", metavar="MODEL", help="Model ids, names or checkpoint paths")
+    parser.add_argument("--all", action="store_true", help="Convert every .pth/.pt/.ckpt model in the models folder")
+    parser.add_argument("--output", default=None, help="Output file (single model only; default: next to the checkpoint)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace an existing .safetensors file")
+    add_logging_args(parser)
+    args = parser.parse_args(argv)
+    if not args.models and not args.all:
+        parser.error("give one or more models, or --all")
+    if args.output and (args.all or len(args.models) > 1):
+        parser.error("--output only works with a single model")
+    return args
+
+def run_convert_command(argv):
+    args = parse_convert_args(argv)
+    start_logging(args)
+    from tts_module.model_manager import get_available_models, find_model
+    from tts_module.checkpoint import convert_to_safetensors, get_safetensors_path, CONVERTIBLE_EXTENSIONS
+    models = get_available_models()
+    if args.all:
+        paths = [m["model_path"] for m in models if m["model_path"].lower().endswith(CONVERTIBLE_EXTENSIONS)]
+        if not args.overwrite:
+            # Already converted on an earlier run
+            paths = [path for path in paths if not os.path.exists(get_safetensors_path(path))]
+    else:
+        paths = []
+        for name in args.models:
+            model = find_model(name, models)
+            if model is None and not os.path.isfile(name):
+                print(f"❌ Model not found: {name}")
+                sys.exit(1)
+            paths.append(model["model_path"] if model else os.path.abspath(name))
+    failed = 0
+    for path in paths:
+        try:
+            output = convert_to_safetensors(path, args.output, overwrite=args.overwrite)
+            print(f"✓ {path} -> {output}")
+        except Exception as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+    print(f"{len(paths) - failed} of {len(paths)} model(s) converted")
+    sys.exit(1 if failed else 0)
+
+def run_autotune(model_name, use_cuda):
+    from tts_module.model_manager import get_available_models, get_speakers_list, find_model
+    from tts_module.synthesis import load_model
+    from tts_module.threads import autotune_threads
+    models = get_available_models()
+    model = find_model(model_name, models) if model_name else (models[0] if models else None)
+    if model is None:
+        print(f"❌ Model not found: {model_name or '(no models available)'}")
+        return 1
+    synth = load_model(model["model_path"], model["config_path"], use_cuda)
+    if synth is None:
+        return 1
+    speakers = get_speakers_list(model) if model["multi_speaker"] else None
+    autotune_threads(synth, speakers[0] if speakers else None)
+    return 0
 
 def main():
+    start = time.perf_counter()
+    if sys.argv[1:2] == ["batch"]:
+        run_batch_command(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["convert"]:
+        run_convert_command(sys.argv[2:])
+        return
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.import_report is not None:
+        from utils.import_report import run_import_report
+        run_import_report(output=args.import_report or None)
+        return
+    start_logging(args)
+
     # Ensure models directory exists
     if not ensure_models_directory():
         print("❌ Failed to create models directory. Exiting.")
         sys.exit(1)
-    
-    # Create and run the application
-    app = QApplication(sys.argv)
+
+    if args.threads:
+        os.environ["COCOSPEAK_INFER_THREADS"] = str(args.threads)
+
+    if args.no_warmup:
+        os.environ["COCOSPEAK_WARMUP"] = "0"
+
+    if args.metrics_json:
+        import atexit
+        from tts_module.metrics import get_metrics
+        atexit.register(get_metrics().dump, args.metrics_json)
+
+    if args.autotune_threads is not None:
+        sys.exit(run_autotune(args.autotune_threads or None, args.cuda))
+
+    if args.serve:
+        # Headless: never import PyQt
+        from tts_module import server
+        server.run_server(host=args.host, port=args.port,
+                          workers=args.workers or server.DEFAULT_WORKERS,
+                          max_queue=server.DEFAULT_MAX_QUEUE if args.max_queue is None else args.max_queue,
+                          use_cuda=args.cuda, preload=args.preload)
+        return
+
+    # Create and run the application (torch/TTS are imported in the background by the window)
+    from PyQt6.QtWidgets import QApplication
+    from gui.main_window import MainWindow
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainWindow()
     window.show()
+    log.info("Window shown %.2fs after start", time.perf_counter() - start)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Batch worker processes re-run the frozen EXE; this lets them start as workers
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,45 @@
+import numpy as np
+from benchmarks.common import time_call
+
+SAMPLE_RATE = 22050
+CLIP_SECONDS = (5, 60)
+# Output rate the playback path resamples to on a typical device
+DEVICE_RATE = 48000
+STREAM_BLOCK = 1024
+
+def _speech_like(seconds, sample_rate=SAMPLE_RATE, seed=0):
+    # Noise under a slow envelope with some DC, roughly like raw synthesizer output
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    return (rng.standard_normal(len(t)) * 0.3 * envelope + 0.02).astype(np.float32)
+
+def run(results, workdir, repeats=3, quick=False):
+    """Post-processing (DSP chain, whole clip and streamed) and playback resampling throughput."""
+    from tts_module.dsp import DSPChain
+    for seconds in CLIP_SECONDS[:1] if quick else CLIP_SECONDS:
+        wav = _speech_like(seconds)
+        chain = DSPChain(SAMPLE_RATE)
+        timings, _ = time_call(lambda: chain.process(wav), repeats=repeats)
+        results.add_timings(f"postprocess.clip_{seconds}s", timings)
+        results.add(f"postprocess.clip_{seconds}s.x_realtime", seconds / min(timings), unit="x", better="higher")
+
+        def streamed():
+            stream = chain.stream()
+            for start in range(0, len(wav), STREAM_BLOCK):
+                stream.process(wav[start:start + STREAM_BLOCK])
+        timings, _ = time_call(streamed, repeats=repeats)
+        results.add_timings(f"postprocess.stream_{seconds}s", timings)
+
+    try:
+        from tts_module.audio import get_resampler
+    except Exception as e:
+        # tts_module.audio needs sounddevice (PortAudio)
+        results.skip("playback", f"audio output module not available: {e}")
+        return
+    wav = _speech_like(CLIP_SECONDS[0])
+    resampler = get_resampler(SAMPLE_RATE, DEVICE_RATE)
+    timings, _ = time_call(lambda: resampler(wav), repeats=repeats)
+    results.add_timings(f"playback.resample_{SAMPLE_RATE}_to_{DEVICE_RATE}", timings)
+    results.add(f"playback.resample_{SAMPLE_RATE}_to_{DEVICE_RATE}.x_realtime", CLIP_SECONDS[0] / min(timings),
+                unit="x", better="higher")
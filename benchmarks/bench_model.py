@@ -0,0 +1,43 @@
+import os
+from benchmarks.common import time_call
+from benchmarks.tiny_model import create_tiny_vits, TINY_SPEAKERS
+
+# Calibration texts by length (short prompt, sentence, paragraph)
+TEXTS = {
+    "short": "Hello there.",
+    "medium": "The quick brown fox jumps over the lazy dog, then naps in the afternoon sun.",
+    "long": ("Text to speech systems turn written words into audio. They first clean and tokenize the text, "
+             "then predict how long each sound should last, and finally generate a waveform. "
+             "Longer passages are split into sentences, and every sentence is synthesized on its own "
+             "before the pieces are joined together with short pauses in between."),
+}
+
+def run(results, workdir, repeats=3, quick=False):
+    """Model load time and tts_to_wav real-time factor on tiny random VITS models."""
+    try:
+        import torch
+        from tts_module.synthesis import load_model, tts_to_wav, get_output_sample_rate
+    except Exception as e:
+        results.skip("model", f"TTS backend not available: {e}")
+        return
+    torch.manual_seed(0)
+    variants = {"single": False} if quick else {"single": False, "multi": True}
+    for name, multi_speaker in variants.items():
+        model_path, config_path = create_tiny_vits(os.path.join(workdir, f"tiny_{name}"), multi_speaker)
+        timings, synth = time_call(lambda: load_model(model_path, config_path), repeats=repeats)
+        if synth is None:
+            results.skip(f"model.{name}", "tiny model failed to load")
+            continue
+        results.add_timings(f"load.{name}", timings)
+        sample_rate = get_output_sample_rate(synth)
+        speakers = TINY_SPEAKERS[:2] if multi_speaker else [None]
+        for speaker in speakers:
+            for length, text in TEXTS.items():
+                if quick and length == "long":
+                    continue
+                timings, wav = time_call(lambda: tts_to_wav(synth, text, speaker), repeats=repeats)
+                label = f"synthesis.{name}" + (f".{speaker}" if speaker else "") + f".{length}"
+                audio_seconds = len(wav) / sample_rate
+                results.add_timings(label, timings)
+                results.add(f"{label}.real_time_factor", min(timings) / audio_seconds, unit="x")
+                results.add(f"{label}.chars_per_s", len(text) / min(timings), unit="chars/s", better="higher")
@@ -0,0 +1,37 @@
+import os
+import time
+from benchmarks.tiny_model import create_synthetic_tree
+
+TREE_SIZES = (10, 100, 1000)
+
+def run(results, workdir, repeats=3, quick=False):
+    """get_available_models() on synthetic trees: full parse, index build, warm (indexed) scan."""
+    from tts_module.model_manager import get_available_models
+    previous = os.environ.get("COCOSPEAK_MODELS_DIR")
+    try:
+        for size in TREE_SIZES[:2] if quick else TREE_SIZES:
+            tree = os.path.join(workdir, f"tree_{size}")
+            create_synthetic_tree(tree, size)
+            os.environ["COCOSPEAK_MODELS_DIR"] = tree
+            cold = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                models = get_available_models(use_index=False)
+                cold.append(time.perf_counter() - start)
+            if len(models) != size:
+                print(f"  warning: found {len(models)} of {size} synthetic models")
+            results.add_timings(f"scan.{size}.no_index", cold)
+            start = time.perf_counter()
+            get_available_models()
+            results.add(f"scan.{size}.index_build_s", time.perf_counter() - start)
+            warm = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                get_available_models()
+                warm.append(time.perf_counter() - start)
+            results.add_timings(f"scan.{size}.indexed", warm)
+    finally:
+        if previous is None:
+            os.environ.pop("COCOSPEAK_MODELS_DIR", None)
+        else:
+            os.environ["COCOSPEAK_MODELS_DIR"] = previous
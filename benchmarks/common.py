@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import platform
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def time_call(fn, repeats=3, warmup=1):
+    """Run fn warmup + repeats times; returns (timings of the measured runs, last result)."""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+class Results:
+    """Flat metric store: name -> value, unit and which direction is better.
+
+    Metric names are stable across releases so result files can be diffed
+    with benchmarks/compare.py.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.skipped = {}
+
+    def add(self, name, value, unit="s", better="lower"):
+        self.metrics[name] = {"value": round(float(value), 6), "unit": unit, "better": better}
+        print(f"  {name}: {value:.4f} {unit}")
+
+    def add_timings(self, name, timings):
+        """Record the median of a timing list (and the fastest run)."""
+        self.add(f"{name}.median_s", statistics.median(timings))
+        self.add(f"{name}.min_s", min(timings))
+
+    def skip(self, suite, reason):
+        self.skipped[suite] = reason
+        print(f"  skipped: {reason}")
+
+def get_metadata():
+    """Machine and version information stored with every result file."""
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        meta["git_commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                            capture_output=True, text=True).stdout.strip() or None
+    except Exception:
+        meta["git_commit"] = None
+    for module in ("numpy", "scipy", "torch", "TTS"):
+        try:
+            meta[f"{module}_version"] = __import__(module).__version__
+        except Exception:
+            meta[f"{module}_version"] = None
+    return meta
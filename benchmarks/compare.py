@@ -0,0 +1,49 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 0.10]
+
+Prints every shared metric with its relative change and exits with status 1
+when a metric got worse by more than the threshold.
+"""
+import sys
+import json
+import argparse
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(old, new, threshold=0.10):
+    """Return rows of (name, old value, new value, relative change, regressed)."""
+    rows = []
+    for name in sorted(set(old["metrics"]) & set(new["metrics"])):
+        before, after = old["metrics"][name], new["metrics"][name]
+        if not before["value"]:
+            continue
+        change = (after["value"] - before["value"]) / before["value"]
+        worse = change if before.get("better", "lower") == "lower" else -change
+        rows.append((name, before["value"], after["value"], change, worse > threshold))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two CocoSpeak benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change counted as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+    old, new = load(args.old), load(args.new)
+    print(f"old: {old['meta'].get('git_commit')} {old['meta'].get('timestamp')}")
+    print(f"new: {new['meta'].get('git_commit')} {new['meta'].get('timestamp')}")
+    rows = compare(old, new, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, before, after, change, regressed in rows:
+        print(f"{name:<{width}}  {before:>12.4f}  {after:>12.4f}  {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+    for name in sorted(set(old["metrics"]) ^ set(new["metrics"])):
+        print(f"{name:<{width}}  only in {'old' if name in old['metrics'] else 'new'}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"{len(rows)} metric(s) compared, {regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Run the CocoSpeak benchmark suites and write the results as JSON.
+
+    python -m benchmarks.run [--quick] [--only model,scan,audio] [--output FILE]
+
+Everything runs offline: synthesis uses tiny randomly initialized VITS
+models and the scan suite builds synthetic model trees in a temp folder.
+Compare two result files with `python -m benchmarks.compare OLD NEW`.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import Results, get_metadata, ROOT
+from benchmarks import bench_model, bench_scan, bench_audio
+
+SUITES = {
+    "model": bench_model.run,
+    "scan": bench_scan.run,
+    "audio": bench_audio.run,
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CocoSpeak benchmarks")
+    parser.add_argument("--only", default=None, help=f"Comma-separated suites to run ({', '.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="Fewer cases, for a smoke test")
+    parser.add_argument("--repeats", type=int, default=None, help="Measured runs per case (default: 3, quick: 1)")
+    parser.add_argument("--output", default=None,
+                        help="Result file (default: benchmarks/results/<timestamp>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    suites = args.only.split(",") if args.only else list(SUITES)
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(unknown)}")
+        return 2
+    repeats = args.repeats or (1 if args.quick else 3)
+    # Keep the audio cache out of the measurements
+    os.environ["COCOSPEAK_AUDIO_CACHE"] = "0"
+
+    results = Results()
+    workdir = tempfile.mkdtemp(prefix="cocospeak-bench-")
+    start = time.perf_counter()
+    try:
+        for name in suites:
+            print(f"[{name}]")
+            try:
+                SUITES[name](results, workdir, repeats=repeats, quick=args.quick)
+            except Exception as e:
+                results.skip(name, f"failed: {e}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = get_metadata()
+    meta.update({"suites": suites, "quick": args.quick, "repeats": repeats,
+                 "seconds": round(time.perf_counter() - start, 2)})
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({"meta": meta, "metrics": results.metrics, "skipped": results.skipped}, f, indent=2, sort_keys=True)
+    print(f"{len(results.metrics)} metric(s) written to {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
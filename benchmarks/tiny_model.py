@@ -0,0 +1,79 @@
+import os
+import json
+
+# Small enough to build and run in seconds on a laptop CPU; the weights are random,
+# so the audio is noise, but every layer of a real VITS model is exercised
+TINY_VITS_ARGS = {
+    "hidden_channels": 32,
+    "hidden_channels_ffn_text_encoder": 64,
+    "num_heads_text_encoder": 2,
+    "num_layers_text_encoder": 2,
+    "num_layers_flow": 2,
+    "num_layers_posterior_encoder": 2,
+    "num_layers_dp_flow": 2,
+    "upsample_initial_channel_decoder": 32,
+    "resblock_type_decoder": "2",
+    "resblock_kernel_sizes_decoder": [3],
+    "resblock_dilation_sizes_decoder": [[1, 3]],
+}
+TINY_SPEAKERS = ["spk_a", "spk_b", "spk_c", "spk_d"]
+
+def create_tiny_vits(folder, multi_speaker=False, seed=0):
+    """Write a randomly initialized VITS checkpoint and config that Synthesizer can load.
+
+    Returns (model path, config path). Uses plain characters (no phonemizer)
+    so it works offline without espeak.
+    """
+    import torch
+    from TTS.tts.configs.shared_configs import CharactersConfig
+    from TTS.tts.configs.vits_config import VitsConfig
+    from TTS.tts.models.vits import Vits, VitsArgs
+
+    os.makedirs(folder, exist_ok=True)
+    torch.manual_seed(seed)
+    args = VitsArgs(**TINY_VITS_ARGS)
+    config = VitsConfig(
+        model_args=args,
+        use_phonemes=False,
+        text_cleaner="basic_cleaners",
+        add_blank=True,
+        characters=CharactersConfig(
+            characters_class="TTS.tts.models.vits.VitsCharacters",
+            pad="<PAD>", eos="<EOS>", bos="<BOS>", blank="<BLNK>",
+            characters="abcdefghijklmnopqrstuvwxyz",
+            punctuations="!'(),-.:;? ",
+            phonemes=None,
+        ),
+    )
+    if multi_speaker:
+        speakers_path = os.path.join(folder, "speakers.json")
+        with open(speakers_path, 'w', encoding='utf-8') as f:
+            json.dump({name: i for i, name in enumerate(TINY_SPEAKERS)}, f)
+        for target in (config, config.model_args):
+            target.use_speaker_embedding = True
+            target.num_speakers = len(TINY_SPEAKERS)
+            target.speakers_file = speakers_path
+    model = Vits.init_from_config(config)
+    model_path = os.path.join(folder, "model.pth")
+    config_path = os.path.join(folder, "config.json")
+    torch.save({"model": model.state_dict()}, model_path)
+    if multi_speaker:
+        # Saved relative, like downloaded models; load_model() runs from the model folder
+        config.speakers_file = config.model_args.speakers_file = "speakers.json"
+    config.save_json(config_path)
+    return model_path, config_path
+
+def create_synthetic_tree(folder, count):
+    """Create count fake model folders (tiny placeholder checkpoint plus a VITS config) for scan benchmarks."""
+    for i in range(count):
+        model_dir = os.path.join(folder, f"group{i // 100:02d}", f"model{i:04d}")
+        os.makedirs(model_dir, exist_ok=True)
+        with open(os.path.join(model_dir, "model.pth"), 'wb') as f:
+            f.write(os.urandom(1024))
+        config = {
+            "model": "vits",
+            "audio": {"sample_rate": 22050},
+            "model_args": {"num_speakers": 1 + i % 3, "use_speaker_embedding": i % 3 != 0},
+        }
+        with open(os.path.join(model_dir, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
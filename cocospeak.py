@@ -3,18 +3,21 @@ import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
 import numpy as np
-import sounddevice as sd
 import glob
 import json
 import threading
-from TTS.utils.manage import ModelManager
 import itertools
-from TTS.utils.synthesizer import Synthesizer  # Always import at top level
 import collections
 import keyboard
 import platform
 import subprocess
-import torch  # Add this import at the top
+from tts_module.model_manager import get_speakers_list
+from tts_module.synthesis import call_tts, get_output_sample_rate, debug_audio_info
+from tts_module.audio import get_output_engine, stop_audio
+from tts_module.dsp import DSPChain
+from utils.log import get_logger, setup_logging
+
+log = get_logger(__name__)
 
 # Suppress command prompt windows from subprocesses
 if platform.system() == "Windows":
@@ -29,31 +32,13 @@ if platform.system() == "Windows":
 
 # Check Python version
 if sys.version_info < (3, 6):
-    print("❌ Python 3.6 or higher is required!")
-    print(f"Current version: {sys.version}")
-    sys.exit(1)
+    sys.exit(f"Python 3.6 or higher is required (current version: {sys.version})")
 
 # Set environment variables for TTS backend
 # Note: Individual models may override this with their own phonemizer settings
 os.environ["TTS_BACKEND"] = "espeak"
 os.environ["GRUUT_LANG"] = "en"
 
-# Debug environment variables
-print(f"DEBUG: TTS_BACKEND = {os.environ.get('TTS_BACKEND', 'Not set')}")
-print(f"DEBUG: GRUUT_LANG = {os.environ.get('GRUUT_LANG', 'Not set')}")
-print(f"DEBUG: Running as EXE = {getattr(sys, 'frozen', False)}")
-print(f"DEBUG: sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not set')}")
-
-# Import TTS with proper error handling
-try:
-    from TTS.utils.synthesizer import Synthesizer
-    print("✓ TTS imported successfully")
-except ImportError as e:
-    print(f"❌ Failed to import TTS: {e}")
-    print("Please install TTS: pip install TTS")
-except Exception as e:
-    print(f"❌ Unexpected error importing TTS: {e}")
-
 # Add this at the top after imports
 if hasattr(sys, '_MEIPASS'):
     BASE_PATH = sys._MEIPASS
@@ -81,31 +66,27 @@ def get_models_directory():
     return models_dir
 
 def debug_path_info():
-    """Debug function to print path information"""
-    print(f"DEBUG: sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not set')}")
-    print(f"DEBUG: BASE_PATH = {BASE_PATH}")
-    print(f"DEBUG: Models directory = {get_models_directory()}")
-    print(f"DEBUG: Models directory exists = {os.path.exists(get_models_directory())}")
-    if os.path.exists(get_models_directory()):
-        print(f"DEBUG: Models directory contents = {os.listdir(get_models_directory())}")
+    """Log path information"""
+    log.debug("TTS_BACKEND=%s GRUUT_LANG=%s, running as EXE: %s", os.environ.get('TTS_BACKEND', 'Not set'),
+              os.environ.get('GRUUT_LANG', 'Not set'), getattr(sys, 'frozen', False))
+    log.debug("sys._MEIPASS=%s BASE_PATH=%s", getattr(sys, '_MEIPASS', 'Not set'), BASE_PATH)
     
-    # Print helpful information for users
+    # Helpful information for users
     models_dir = get_models_directory()
-    print(f"\n📁 Models should be placed in: {models_dir}")
+    log.info("Models should be placed in: %s", models_dir)
     if not os.path.exists(models_dir):
-        print(f"⚠️  Models directory does not exist. Creating it...")
+        log.info("Models directory does not exist, creating it")
         try:
             os.makedirs(models_dir, exist_ok=True)
-            print(f"✓ Created models directory: {models_dir}")
+            log.info("Created models directory: %s", models_dir)
         except Exception as e:
-            print(f"❌ Failed to create models directory: {e}")
+            log.error("Failed to create models directory: %s", e)
     else:
-        print(f"✓ Models directory exists")
         contents = os.listdir(models_dir)
         if contents:
-            print(f"📦 Current contents: {contents}")
+            log.debug("Models directory contents: %s", contents)
         else:
-            print(f"📭 Directory is empty")
+            log.info("Models directory is empty")
 
 def get_model_type_from_config(config_path):
     """Determine model type from config file"""
@@ -152,13 +133,13 @@ def get_model_type_from_config(config_path):
         
         return 'Unknown'
     except FileNotFoundError:
-        print(f"Config file not found: {config_path}")
+        log.warning("Config file not found: %s", config_path)
         return 'Unknown'
     except json.JSONDecodeError as e:
-        print(f"Invalid JSON in config file {config_path}: {e}")
+        log.warning("Invalid JSON in config file %s: %s", config_path, e)
         return 'Unknown'
     except Exception as e:
-        print(f"Error reading config file {config_path}: {e}")
+        log.warning("Error reading config file %s: %s", config_path, e)
         return 'Unknown'
 
 def get_model_size_mb(model_path):
@@ -166,13 +147,13 @@ def get_model_size_mb(model_path):
         size = os.path.getsize(model_path)
         return size / (1024 * 1024)
     except FileNotFoundError:
-        print(f"Model file not found: {model_path}")
+        log.warning("Model file not found: %s", model_path)
         return None
     except OSError as e:
-        print(f"Error accessing model file {model_path}: {e}")
+        log.warning("Error accessing model file %s: %s", model_path, e)
         return None
     except Exception as e:
-        print(f"Unexpected error getting model size for {model_path}: {e}")
+        log.warning("Unexpected error getting model size for %s: %s", model_path, e)
         return None
 
 def find_config_file(folder_path, base_name):
@@ -197,7 +178,7 @@ def fix_phonemizer_config(config_path):
         # DISABLED: Let users choose their own phonemizer
         # Check if phonemizer is set to espeak but we're using gruut
         # if config.get("phonemizer") == "espeak":
-        #     print(f"⚠️  Model {os.path.basename(config_path)} uses 'espeak' phonemizer, switching to 'gruut'")
+        #     log.info("Model %s uses 'espeak' phonemizer, switching to 'gruut'", os.path.basename(config_path))
         #     config["phonemizer"] = "gruut"
         #     
         #     # Also update phoneme_language if needed
@@ -208,11 +189,11 @@ def fix_phonemizer_config(config_path):
         #     with open(config_path, 'w', encoding='utf-8') as f:
         #         json.dump(config, f, indent=4, ensure_ascii=False)
         #     
-        #     print(f"✓ Updated phonemizer configuration in {config_path}")
+        #     log.info("Updated phonemizer configuration in %s", config_path)
         #     return True
         return False
     except Exception as e:
-        print(f"Warning: Could not fix phonemizer config for {config_path}: {e}")
+        log.warning("Could not fix phonemizer config for %s: %s", config_path, e)
         return False
 
 def is_tts_model_type(model_type):
@@ -231,10 +212,10 @@ def scan_available_models():
     models = {}
     models_dir = get_models_directory()
     
-    print(f"Scanning for models in: {models_dir}")
+    log.debug("Scanning for models in: %s", models_dir)
     
     if not os.path.exists(models_dir):
-        print(f"Models directory does not exist: {models_dir}")
+        log.warning("Models directory does not exist: %s", models_dir)
         return models
     
     # Only include files that look like model files
@@ -263,7 +244,7 @@ def scan_available_models():
                 fix_phonemizer_config(config_file)
                 model_type = get_model_type_from_config(config_file)
                 if not is_tts_model_type(model_type):
-                    print(f"Skipping vocoder model: {model_name}")
+                    log.debug("Skipping vocoder model: %s", model_name)
                     continue  # skip vocoders
                 folder = os.path.basename(folder_path)
                 parent_folder = os.path.basename(os.path.dirname(folder_path))
@@ -285,37 +266,23 @@ def scan_available_models():
                 use_speaker_embedding = args.get('use_speaker_embedding', False)
                 num_speakers = args.get('num_speakers', 1)
                 speakers_file = args.get('speakers_file', None)
-                speakers_list = []
-                if speakers_file:
-                    # Always join with config path (model folder)
-                    speakers_path = os.path.join(os.path.dirname(config_file), speakers_file)
-                    if os.path.exists(speakers_path):
-                        try:
-                            import torch
-                            speakers_dict = torch.load(speakers_path, map_location='cpu')
-                            if isinstance(speakers_dict, dict):
-                                speakers_list = list(speakers_dict.keys())
-                            elif isinstance(speakers_dict, list):
-                                speakers_list = [str(i) for i in range(len(speakers_dict))]
-                        except Exception as e:
-                            print(f"Failed to load speakers.pth for dropdown: {e}")
-                if not speakers_list and (use_speaker_embedding or num_speakers > 1):
-                    speakers_list = [str(i) for i in range(num_speakers)]
-                # Store speakers_list in the model config for later use
-                model_speakers = speakers_list if (use_speaker_embedding or num_speakers > 1) else None
+                # Speaker names are resolved lazily when the model is loaded
+                speakers_path = os.path.join(os.path.dirname(config_file), speakers_file) if speakers_file else None
                 models[display_name + size_str] = {
                     "model_path": os.path.join(root, file),
                     "config_path": config_file,
                     "model_type": model_type,
                     "folder": folder,
                     "description": f"{model_type} model in {folder_path} [{model_name}]{size_str}",
-                    "speakers_list": model_speakers
+                    "multi_speaker": bool(use_speaker_embedding or num_speakers > 1),
+                    "num_speakers": num_speakers,
+                    "speakers_path": speakers_path
                 }
-                print(f"Added model: {display_name + size_str}")
+                log.debug("Added model: %s", display_name + size_str)
             else:
-                print(f"No config file found for model: {model_name}")
+                log.debug("No config file found for model: %s", model_name)
     
-    print(f"Total TTS models found: {len(models)}")
+    log.info("Total TTS models found: %d", len(models))
     return models
 
 # Initialize with empty models - will be populated when app starts
@@ -329,84 +296,61 @@ VCTK_SPEAKER_MAP = {
 VCTK_SPEAKERS = list(VCTK_SPEAKER_MAP.keys())
 
 # --- TTS Functions ---
-def debug_audio_info(wav, stage=""):
-    """Debug function to print audio information"""
-    try:
-        print(f"DEBUG {stage}:")
-        print(f"  Shape: {wav.shape}")
-        print(f"  Data type: {wav.dtype}")
-        print(f"  Min value: {np.min(wav)}")
-        print(f"  Max value: {np.max(wav)}")
-        print(f"  Mean value: {np.mean(wav)}")
-        print(f"  Has NaN: {np.isnan(wav).any()}")
-        print(f"  Has Inf: {np.isinf(wav).any()}")
-        print(f"  Non-zero samples: {np.count_nonzero(wav)}")
-        print(f"  Total samples: {len(wav)}")
-    except Exception as e:
-        print(f"DEBUG {stage}: Error getting audio info: {e}")
-
 def tts_to_wav(synth, text):
     if synth is None:
         raise Exception("Model not loaded. Please load the model first.")
     
     try:
-        print(f"Starting TTS synthesis for text: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-        print(f"Text length: {len(text)} characters")
-        print(f"Running as EXE: {getattr(sys, 'frozen', False)}")
+        log.debug("Starting TTS synthesis for text: %r (%d characters)", text[:50] + ('...' if len(text) > 50 else ''), len(text))
         
         # Try with different synthesis parameters for better quality
         try:
             # First try with default parameters
             wav = synth.tts(text)
-            print("TTS synthesis completed successfully with default parameters")
+            log.debug("TTS synthesis completed with default parameters")
         except Exception as e1:
-            print(f"Default synthesis failed: {e1}")
+            log.debug("Default synthesis failed: %s", e1)
             try:
                 # Try with explicit parameters for better quality
                 wav = synth.tts(text, speaker=None, language=None)
-                print("TTS synthesis completed successfully with explicit parameters")
+                log.debug("TTS synthesis completed with explicit parameters")
             except Exception as e2:
-                print(f"Explicit synthesis failed: {e2}")
+                log.debug("Explicit synthesis failed: %s", e2)
                 # Fallback to original
                 wav = synth.tts(text)
-                print("TTS synthesis completed successfully with fallback")
+                log.debug("TTS synthesis completed with fallback")
         
         import numpy as np
         # Robust handling of wav output
         if isinstance(wav, list):
             if all(isinstance(x, (float, int, np.floating, np.integer)) for x in wav):
-                print(f"TTS output is a list of {len(wav)} floats/ints. Converting to numpy array...")
                 wav = np.array(wav, dtype=np.float32)
             elif all(hasattr(x, '__len__') for x in wav):
-                print(f"TTS output is a list with {len(wav)} segments. Concatenating...")
+                log.debug("TTS output is a list with %d segments, concatenating", len(wav))
                 wav = np.concatenate([np.asarray(seg, dtype=np.float32) for seg in wav if seg is not None and len(seg) > 0])
             else:
-                print(f"TTS output is a list of unknown type. Attempting to convert to numpy array...")
                 wav = np.array(wav, dtype=np.float32)
         elif not isinstance(wav, np.ndarray):
-            print(f"TTS output is type {type(wav)}. Attempting to convert to numpy array...")
+            log.debug("TTS output is %s, converting to a numpy array", type(wav).__name__)
             wav = np.array(wav, dtype=np.float32)
         
         # Check if wav is too short (less than 2 seconds for any text)
         if len(wav) < 44100:  # Less than 2 seconds at 22050Hz
-            print(f"WARNING: Audio is very short ({len(wav)} samples). This might indicate an issue in the exe.")
-            print(f"Expected minimum: 44100 samples for 2 seconds")
+            log.warning("Audio is very short (%d samples, expected at least 44100); this might indicate an issue in the exe", len(wav))
         
         # Add a small silence buffer to ensure the sentence completes properly
         buffer_samples = int(22050 * 0.5)  # 0.5 seconds of silence
         silence_buffer = np.zeros(buffer_samples, dtype=wav.dtype)
         wav = np.concatenate([wav, silence_buffer])
-        print(f"Added {buffer_samples} samples of silence buffer")
         
     except Exception as e:
-        print(f"TTS synthesis failed: {e}")
+        log.error("TTS synthesis failed: %s", e)
         raise Exception(f"TTS synthesis failed: {e}")
     
     try:
         wav = np.array(wav)
-        print(f"Converted to numpy array: {wav.shape}")
     except Exception as e:
-        print(f"Failed to convert to numpy array: {e}")
+        log.error("Failed to convert to numpy array: %s", e)
         raise Exception(f"Failed to convert audio to numpy array: {e}")
     
     # Debug audio info
@@ -420,42 +364,19 @@ def tts_to_wav(synth, text):
     
     return wav
 
+# Legacy post-processing settings: stronger high-pass and compression, 0.85 peak
+_clarity_chain = None
+
 def improve_audio_clarity(wav):
     """Improve audio clarity with enhanced processing"""
+    global _clarity_chain
     try:
-        # Ensure audio is float32
-        wav = wav.astype(np.float32)
-        
-        # Remove DC offset (mean centering)
-        wav = wav - np.mean(wav)
-        
-        # Apply gentle compression to reduce dynamic range
-        # This helps with clarity in the exe version
-        threshold = 0.3
-        ratio = 4.0
-        wav_abs = np.abs(wav)
-        mask = wav_abs > threshold
-        wav[mask] = np.sign(wav[mask]) * (threshold + (wav_abs[mask] - threshold) / ratio)
-        
-        # Normalize to prevent clipping while maintaining good levels
-        max_val = np.max(np.abs(wav))
-        if max_val > 0:
-            # Use a higher target level for better clarity
-            wav = wav / max_val * 0.85
-        
-        # Apply a gentle high-pass filter effect (simple approach)
-        # This helps reduce low-frequency noise that can make speech unclear
-        if len(wav) > 1000:  # Only for longer audio
-            # Simple high-pass approximation
-            wav = wav - np.convolve(wav, np.ones(50)/50, mode='same')
-        
-        # Ensure values are in valid range
-        wav = np.clip(wav, -1.0, 1.0)
-        
-        return wav
+        if _clarity_chain is None:
+            _clarity_chain = DSPChain(22050, highpass_hz=200.0, compress_threshold=0.3, target_peak=0.85)
+        return _clarity_chain.process(wav)
         
     except Exception as e:
-        print(f"Warning: Audio clarity improvement failed: {e}")
+        log.warning("Audio clarity improvement failed: %s", e)
         # Return original audio if processing fails
         return wav
 
@@ -464,21 +385,8 @@ def tts_to_wav_multi_speaker(synth, text, speaker_id):
     if synth is None:
         raise Exception("Model not loaded. Please load the model first.")
     
-    # For VCTK models, we need to use the speaker parameter
-    try:
-        # Try with speaker parameter (most common for VCTK)
-        wav = synth.tts(text, speaker=speaker_id)
-    except Exception as e:
-        try:
-            # Try speaker_id parameter
-            wav = synth.tts(text, speaker_id=speaker_id)
-        except Exception as e2:
-            try:
-                # Try speaker_name parameter
-                wav = synth.tts(text, speaker_name=str(speaker_id))
-            except Exception as e3:
-                # Try as positional argument
-                wav = synth.tts(text, speaker_id)
+    # The speaker argument name is resolved once per model
+    wav = call_tts(synth, text, speaker_id)
     
     return np.array(wav)
 
@@ -513,18 +421,12 @@ def play_audio(wav, sample_rate=22050):
         # Debug audio info before playback
         debug_audio_info(wav, "Before playback")
         
-        # Stop any currently playing audio first
-        sd.stop()
-        # Small delay to ensure previous audio is fully stopped
-        import time
-        time.sleep(0.1)
-        
         # Ensure audio is in the correct format and range
         wav = np.asarray(wav, dtype=np.float32)
         
         # Validate audio data
         if np.isnan(wav).any() or np.isinf(wav).any():
-            print("Warning: Audio contains NaN or Inf values, attempting to fix...")
+            log.warning("Audio contains NaN or Inf values, attempting to fix")
             wav = np.nan_to_num(wav, nan=0.0, posinf=1.0, neginf=-1.0)
         
         # Ensure audio is in valid range
@@ -532,23 +434,23 @@ def play_audio(wav, sample_rate=22050):
         
         # Check if audio is not silent
         if np.max(np.abs(wav)) < 0.001:
-            print("Warning: Audio appears to be silent")
+            log.warning("Audio appears to be silent")
             return
         
-        print(f"Playing audio: {len(wav)} samples at {sample_rate} Hz")
+        log.debug("Playing audio: %d samples at %d Hz", len(wav), sample_rate)
         
-        # Try sounddevice first
+        # Try the shared output stream first (queued clips play back to back)
         try:
-            sd.play(wav, samplerate=sample_rate, blocking=True)
+            get_output_engine(sample_rate).play(wav, sample_rate=sample_rate)
         except Exception as sd_error:
-            print(f"Sounddevice playback failed: {sd_error}")
+            log.warning("Sounddevice playback failed: %s", sd_error)
             # Fallback: try saving and playing with system default
             try:
                 import tempfile
                 import os
                 temp_file = os.path.join(tempfile.gettempdir(), "cocospeak_temp.wav")
                 save_wav(wav, sample_rate, temp_file)
-                print(f"Saved temporary file: {temp_file}")
+                log.debug("Saved temporary file: %s", temp_file)
                 # Try to play with system default player
                 if platform.system() == "Windows":
                     os.startfile(temp_file)
@@ -556,17 +458,16 @@ def play_audio(wav, sample_rate=22050):
                     subprocess.run(["open", temp_file], capture_output=True)
                 else:  # Linux
                     subprocess.run(["xdg-open", temp_file], capture_output=True)
-                print("Playing with system default player")
+                log.info("Playing with system default player")
             except Exception as fallback_error:
-                print(f"Fallback playback also failed: {fallback_error}")
+                log.error("Fallback playback also failed: %s", fallback_error)
                 raise fallback_error
         
     except Exception as e:
-        print(f"Audio playback error: {e}")
-        # Try to recover by stopping and waiting
+        log.error("Audio playback error: %s", e)
+        # Try to recover by dropping whatever is still queued
         try:
-            sd.stop()
-            time.sleep(0.2)
+            stop_audio()
         except:
             pass
 
@@ -578,7 +479,7 @@ def save_wav(wav, sample_rate, file_path):
         
         # Validate audio data
         if np.isnan(wav).any() or np.isinf(wav).any():
-            print("Warning: Audio contains NaN or Inf values, attempting to fix...")
+            log.warning("Audio contains NaN or Inf values, attempting to fix")
             wav = np.nan_to_num(wav, nan=0.0, posinf=1.0, neginf=-1.0)
         
         # Normalize and convert to int16
@@ -654,14 +555,9 @@ class TTSApp:
         self.cuda_frame = tk.Frame(root)
         self.cuda_frame.pack(pady=5)
 
-        # Automatically detect CUDA availability
-        try:
-            import torch
-            cuda_available = torch.cuda.is_available()
-        except Exception as e:
-            print(f"CUDA detection failed: {e}")
-            cuda_available = False
-        self.cuda_var = tk.BooleanVar(value=cuda_available)
+        # CUDA availability is detected once torch is imported in the background
+        self.cuda_var = tk.BooleanVar(value=False)
+        threading.Thread(target=self._import_backend, daemon=True).start()
         self.cuda_checkbox = tk.Checkbutton(
             self.cuda_frame, 
             text="Use CUDA (GPU)", 
@@ -798,6 +694,15 @@ class TTSApp:
         # Set focus to text entry on startup
         self.root.after(100, self.focus_text_entry)
 
+    def _import_backend(self):
+        """Import torch/TTS off the UI thread and select CUDA if it is available."""
+        try:
+            from tts_module.backend import import_backend
+            info = import_backend()
+            self.root.after(0, lambda: self.cuda_var.set(info["cuda_available"]))
+        except Exception as e:
+            log.warning("CUDA detection failed: %s", e)
+
     def _toggle_window(self):
         if self.is_minimized:
             self.root.deiconify()
@@ -850,7 +755,7 @@ class TTSApp:
 
     def refresh_models(self):
         """Refresh the model list"""
-        print("Refreshing models...")
+        log.info("Refreshing models")
         
         # Clear current models first
         self.model_configs = {}
@@ -864,7 +769,7 @@ class TTSApp:
         self.model_configs = scan_available_models()
         model_names = list(self.model_configs.keys())
         
-        print(f"Refresh complete. Found {len(model_names)} models.")
+        log.info("Refresh complete, found %d models", len(model_names))
         
         # Update combobox
         self.model_combo['values'] = model_names
@@ -1056,6 +961,7 @@ class TTSApp:
                 import zipfile
                 from urllib.parse import urljoin
                 import shutil
+                from TTS.utils.manage import ModelManager
                 manager = ModelManager()
                 
                 # Update progress for model info fetch
@@ -1171,7 +1077,7 @@ class TTSApp:
                 # Use the correct models directory for downloads
                 models_dir = get_models_directory()
                 model_folder = os.path.join(models_dir, folder_name)
-                print(f"Downloading model to: {model_folder}")
+                log.info("Downloading model to: %s", model_folder)
                 os.makedirs(model_folder, exist_ok=True)
                 local_model_path = os.path.join(model_folder, f"{folder_name}_model.pth")
                 local_config_path = os.path.join(model_folder, f"{folder_name}_config.json")
@@ -1200,6 +1106,7 @@ class TTSApp:
         def fetch_and_show():
             try:
                 self.start_loading("Fetching model list")
+                from TTS.utils.manage import ModelManager
                 manager = ModelManager()
                 model_ids = manager.list_models()
                 
@@ -1379,18 +1286,13 @@ class TTSApp:
                 self._loading_model = True
                 use_cuda = self.cuda_var.get()
                 model_config = self.model_configs[self.current_model]
-                print(f"Loading model: {self.current_model}")
-                print(f"Model path: {model_config['model_path']}")
-                print(f"Config path: {model_config['config_path']}")
-                print(f"CUDA enabled: {use_cuda}")
-                print(f"Running as EXE: {getattr(sys, 'frozen', False)}")
+                log.info("Loading model: %s", self.current_model)
+                log.debug("Model path: %s, config path: %s, CUDA: %s, running as EXE: %s", model_config['model_path'],
+                          model_config['config_path'], use_cuda, getattr(sys, 'frozen', False))
                 # Thread-safe GUI updates
                 self.root.after(0, lambda: self.status_label.config(text=f"Loading {self.current_model}..."))
                 self.root.after(0, lambda: self.start_loading("Loading model"))
                 # Check if files exist
-                print(f"Checking model files:")
-                print(f"  - Model file exists: {os.path.exists(model_config['model_path'])}")
-                print(f"  - Config file exists: {os.path.exists(model_config['config_path'])}")
                 if not os.path.exists(model_config["model_path"]):
                     raise FileNotFoundError(f"Model file not found: {model_config['model_path']}\nPlease download the model first.")
                 if not os.path.exists(model_config["config_path"]):
@@ -1399,43 +1301,32 @@ class TTSApp:
                 try:
                     model_size = os.path.getsize(model_config["model_path"]) / (1024*1024)
                     config_size = os.path.getsize(model_config["config_path"]) / 1024
-                    print(f"  - Model file size: {model_size:.1f} MB")
-                    print(f"  - Config file size: {config_size:.1f} KB")
+                    log.debug("Model file size: %.1f MB, config file size: %.1f KB", model_size, config_size)
                 except Exception as size_e:
-                    print(f"  - Could not get file sizes: {size_e}")
+                    log.debug("Could not get file sizes: %s", size_e)
                 # Load config and check for multi-speaker
                 with open(model_config["config_path"], 'r', encoding='utf-8') as f:
                     config_data = json.load(f)
                 use_speaker_embedding = False
                 num_speakers = 1
-                speakers_list = []
+                speakers_path = None
                 if "model_args" in config_data:
                     args = config_data["model_args"]
                     use_speaker_embedding = args.get("use_speaker_embedding", False)
                     num_speakers = args.get("num_speakers", 1)
                     speakers_file = args.get("speakers_file", None)
-                    # Try to load speakers.pth or similar
                     if speakers_file:
                         speakers_path = os.path.join(os.path.dirname(model_config["config_path"]), speakers_file)
-                        print(f"[DEBUG] Attempting to load speakers mapping from: {speakers_path}")
-                        if os.path.exists(speakers_path):
-                            try:
-                                import torch
-                                speakers_dict = torch.load(speakers_path, map_location="cpu")
-                                if isinstance(speakers_dict, dict):
-                                    speakers_list = list(speakers_dict.keys())
-                                    print(f"Loaded {len(speakers_list)} speakers from {speakers_file}")
-                                elif isinstance(speakers_dict, list):
-                                    speakers_list = [str(i) for i in range(len(speakers_dict))]
-                                    print(f"Loaded {len(speakers_list)} speakers (list) from {speakers_file}")
-                                else:
-                                    print(f"speakers.pth is not a dict or list!")
-                            except Exception as e:
-                                print(f"Failed to load speakers.pth: {e}")
-                # Fallback: if no speakers.pth, but multi-speaker, use numeric IDs
-                if not speakers_list and (use_speaker_embedding or num_speakers > 1):
-                    speakers_list = [str(i) for i in range(num_speakers)]
-                    print(f"Fallback: using numeric speaker IDs: {speakers_list}")
+                # Speaker names come from the speakers index in models/.cache when present,
+                # otherwise from speakers.pth (numeric IDs as a last resort)
+                speakers_list = get_speakers_list({
+                    "config_path": model_config["config_path"],
+                    "multi_speaker": bool(use_speaker_embedding or num_speakers > 1),
+                    "num_speakers": num_speakers,
+                    "speakers_path": speakers_path
+                }) or []
+                if speakers_list:
+                    log.info("Loaded %d speakers", len(speakers_list))
                 # Update speaker dropdown if multi-speaker
                 if (use_speaker_embedding or num_speakers > 1) and speakers_list:
                     self.speaker_combo['values'] = speakers_list
@@ -1450,6 +1341,7 @@ class TTSApp:
                 try:
                     os.chdir(model_folder)
                     # Load the synthesizer as before
+                    from TTS.utils.synthesizer import Synthesizer
                     try:
                         self.synth = Synthesizer(
                             tts_checkpoint=model_config["model_path"],
@@ -1467,60 +1359,43 @@ class TTSApp:
                 # Try to configure phonemizer to avoid subprocess calls
                 try:
                     if hasattr(self.synth, 'synthesizer') and hasattr(self.synth.synthesizer, 'phonemizer'):
-                        print("Configuring phonemizer to avoid subprocess calls...")
                         # Try to set phonemizer to use internal processing
                         if hasattr(self.synth.synthesizer.phonemizer, 'backend'):
-                            print(f"Current phonemizer backend: {self.synth.synthesizer.phonemizer.backend}")
+                            log.debug("Current phonemizer backend: %s", self.synth.synthesizer.phonemizer.backend)
                 except Exception as phonemizer_e:
-                    print(f"Could not configure phonemizer: {phonemizer_e}")
+                    log.debug("Could not configure phonemizer: %s", phonemizer_e)
                 
-                print(f"✓ Synthesizer created successfully")
+                log.info("Synthesizer created")
+                # Play and save at the model's own output rate
+                self.sample_rate = get_output_sample_rate(self.synth)
+                log.debug("Output sample rate: %d Hz", self.sample_rate)
                 
                 # Test synthesis with a short text
-                print("Running test synthesis...")
+                log.debug("Running test synthesis")
                 try:
                     # Use first speaker for test if multi-speaker
                     test_wav = None
                     if (use_speaker_embedding or num_speakers > 1) and speakers_list:
                         test_speaker = speakers_list[0]
-                        test_errors = []
                         try:
-                            test_wav = self.synth.tts("Test", speaker=test_speaker)
-                        except Exception as e1:
-                            test_errors.append(f"speaker: {e1}")
-                            try:
-                                test_wav = self.synth.tts("Test", speaker_idx=test_speaker)
-                            except Exception as e2:
-                                test_errors.append(f"speaker_idx: {e2}")
-                                try:
-                                    test_wav = self.synth.tts("Test", speaker_id=test_speaker)
-                                except Exception as e3:
-                                    test_errors.append(f"speaker_id: {e3}")
-                                    try:
-                                        test_wav = self.synth.tts("Test", speaker_name=str(test_speaker))
-                                    except Exception as e4:
-                                        test_errors.append(f"speaker_name: {e4}")
-                                        try:
-                                            test_wav = self.synth.tts("Test", test_speaker)
-                                        except Exception as e5:
-                                            test_errors.append(f"positional: {e5}")
-                        if test_wav is None:
-                            print(f"⚠️  Test synthesis failed: All attempts failed: {' | '.join(test_errors)}")
+                            test_wav = call_tts(self.synth, "Test", test_speaker)
+                        except Exception as e:
+                            log.warning("Test synthesis failed: %s", e)
                     else:
                         test_wav = self.synth.tts("Test")
                     if test_wav is not None:
-                        print(f"✓ Test synthesis successful: {len(test_wav)} samples")
+                        log.debug("Test synthesis produced %d samples", len(test_wav))
                         if len(test_wav) < 44100:  # Less than 2 seconds
-                            print(f"⚠️  WARNING: Test synthesis produced very short audio ({len(test_wav)} samples)")
+                            log.warning("Test synthesis produced very short audio (%d samples)", len(test_wav))
                         # Check if the test audio makes sense (not just noise)
                         test_audio_mean = np.mean(np.abs(test_wav))
-                        print(f"Test audio mean amplitude: {test_audio_mean}")
+                        log.debug("Test audio mean amplitude: %.4f", test_audio_mean)
                         if test_audio_mean < 0.01:
-                            print(f"⚠️  WARNING: Test audio seems too quiet, might be noise")
+                            log.warning("Test audio seems too quiet, might be noise")
                         elif test_audio_mean > 0.5:
-                            print(f"⚠️  WARNING: Test audio seems too loud, might be distorted")
+                            log.warning("Test audio seems too loud, might be distorted")
                 except Exception as test_e:
-                    print(f"⚠️  Test synthesis failed: {test_e}")
+                    log.warning("Test synthesis failed: %s", test_e)
                 
                 # Thread-safe success updates
                 self.root.after(0, lambda: self.status_label.config(text=f"{self.current_model} loaded ({'CUDA' if use_cuda else 'CPU'})"))
@@ -1643,34 +1518,8 @@ class TTSApp:
                             speaker = speaker_name  # fallback to name if not found
                         else:
                             speaker = speaker_name
-                if speaker is not None:
-                    # Try all common argument names for multi-speaker models
-                    wav = None
-                    errors = []
-                    try:
-                        wav = self.synth.tts(text, speaker=speaker)
-                    except Exception as e1:
-                        errors.append(f"speaker: {e1}")
-                        try:
-                            wav = self.synth.tts(text, speaker_idx=speaker)
-                        except Exception as e2:
-                            errors.append(f"speaker_idx: {e2}")
-                            try:
-                                wav = self.synth.tts(text, speaker_id=speaker)
-                            except Exception as e3:
-                                errors.append(f"speaker_id: {e3}")
-                                try:
-                                    wav = self.synth.tts(text, speaker_name=str(speaker))
-                                except Exception as e4:
-                                    errors.append(f"speaker_name: {e4}")
-                                    try:
-                                        wav = self.synth.tts(text, speaker)
-                                    except Exception as e5:
-                                        errors.append(f"positional: {e5}")
-                    if wav is None:
-                        raise Exception("All attempts to synthesize with speaker failed: " + " | ".join(errors))
-                else:
-                    wav = self.synth.tts(text)
+                # One tts() call; the speaker argument name is resolved once per model
+                wav = call_tts(self.synth, text, speaker)
                 self.root.after(0, lambda: self.start_loading("Playing audio..."))
                 self.root.after(0, lambda: self.status_label.config(text="Playing audio..."))
                 play_audio(wav, self.sample_rate)
@@ -1724,7 +1573,7 @@ class TTSApp:
                 if args.get("use_speaker_embedding", False) or args.get("num_speakers", 1) > 1:
                     is_multi_speaker = True
             except Exception as e:
-                print(f"Warning: Could not parse config for multi-speaker check: {e}")
+                log.warning("Could not parse config for multi-speaker check: %s", e)
             # Optional: Speaker mapping file
             speaker_file_path = filedialog.askopenfilename(
                 title="(Optional) Select Speaker Mapping File (e.g., speakers.pth)",
@@ -1746,7 +1595,7 @@ class TTSApp:
             # Use the correct models directory for imports
             models_dir = get_models_directory()
             dest_folder = os.path.join(models_dir, "custom", model_name)
-            print(f"Importing custom model to: {dest_folder}")
+            log.info("Importing custom model to: %s", dest_folder)
             os.makedirs(dest_folder, exist_ok=True)
             dest_model = os.path.join(dest_folder, os.path.basename(model_path))
             dest_config = os.path.join(dest_folder, os.path.basename(config_path))
@@ -1757,7 +1606,7 @@ class TTSApp:
             if speaker_file_path:
                 dest_speaker = os.path.join(dest_folder, "speakers.pth")
                 shutil.copy2(speaker_file_path, dest_speaker)
-                print(f"✓ Imported speaker mapping file as: {dest_speaker}")
+                log.info("Imported speaker mapping file as: %s", dest_speaker)
             messagebox.showinfo("Success", f"Custom model imported as '{model_name}'.")
             self.refresh_models()
         except Exception as e:
@@ -1773,24 +1622,22 @@ class TTSApp:
             
             # Stop any audio playback
             try:
-                sd.stop()
-                import time
-                time.sleep(0.2)  # Give audio time to stop
+                stop_audio()
             except Exception as audio_error:
-                print(f"Audio cleanup warning: {audio_error}")
+                log.warning("Audio cleanup failed: %s", audio_error)
             
             # Clear synthesizer to free memory
             if hasattr(self, 'synth') and self.synth is not None:
                 self.synth = None
             
-            print("✓ Cleanup completed")
+            log.debug("Cleanup completed")
         except Exception as e:
-            print(f"Warning: Error during cleanup: {e}")
+            log.warning("Error during cleanup: %s", e)
 
     def on_phonemizer_change(self, event=None):
         selected = self.phonemizer_var.get()
         os.environ["TTS_BACKEND"] = selected
-        print(f"Phonemizer set to: {selected}")
+        log.info("Phonemizer set to: %s", selected)
         
         # Update the config file if a model is loaded
         if hasattr(self, 'current_model') and self.current_model:
@@ -1810,15 +1657,15 @@ class TTSApp:
                     with open(config_file, 'w', encoding='utf-8') as f:
                         json.dump(config, f, indent=4, ensure_ascii=False)
                     
-                    print(f"✓ Updated config file {config_file} to use {selected} phonemizer")
+                    log.info("Updated config file %s to use %s phonemizer", config_file, selected)
                     
                     # Reload the model to apply the new phonemizer
                     if hasattr(self, 'synth') and self.synth is not None:
-                        print("Reloading model to apply new phonemizer...")
+                        log.info("Reloading model to apply new phonemizer")
                         self.load_model()
                         
                 except Exception as e:
-                    print(f"Warning: Could not update config file: {e}")
+                    log.warning("Could not update config file: %s", e)
 
     def remove_selected_from_queue(self):
         sel = self.queue_listbox.curselection()
@@ -1834,6 +1681,7 @@ class TTSApp:
         self.update_queue_listbox()
 
 if __name__ == "__main__":
+    setup_logging()
     root = tk.Tk()
     app = TTSApp(root)
     
@@ -24,6 +24,8 @@ a = Analysis(
         'sounddevice', 'soundfile', 'numpy', 'torch', 'requests',
         'platform', 'json', 'shutil', 'datetime', 're', 'ctypes',
         'tts_module.audio', 'tts_module.synthesis', 'tts_module.model_manager',
+        'tts_module.synth_cache', 'tts_module.pipeline', 'tts_module.model_watcher', 'tts_module.backend', 'tts_module.audio_cache', 'tts_module.dsp',
+        'tts_module.server', 'tts_module.batch', 'tts_module.batched', 'tts_module.threads', 'tts_module.metrics', 'tts_module.checkpoint', 'safetensors', 'safetensors.torch', 'utils.import_report', 'utils.log',
         'gui.main_window', 'gui.dialogs', 'utils.paths'
     ],
     hookspath=['.'],
@@ -1,14 +1,18 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QListWidget, QProgressBar, QLineEdit,
-                             QFileDialog, QMessageBox, QGroupBox, QFrame)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+                             QFileDialog, QMessageBox, QGroupBox, QFrame,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
 import os
 import json
 import shutil
-from TTS.utils.manage import ModelManager
 import requests
 from tts_module.model_manager import get_models_directory
+from tts_module.metrics import get_metrics, STAGES
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 class OnlineModelDialog(QDialog):
     """Dialog for downloading online models."""
@@ -178,9 +182,7 @@ class ModelDownloadThread(QThread):
             # This is the actual download - it will take time
             model_info = manager.download_model(self.model_id)
 
-            # Debug: print what model_info contains
-            print(f"Model info type: {type(model_info)}")
-            print(f"Model info: {model_info}")
+            log.debug("Model info (%s): %s", type(model_info).__name__, model_info)
 
             # After download, move files to models directory in a new folder
             models_dir = get_models_directory()
@@ -195,7 +197,7 @@ class ModelDownloadThread(QThread):
                 folder_name = 'tacotron2'
                 
             model_folder = os.path.join(models_dir, folder_name)
-            print(f"Downloading model to: {model_folder}")
+            log.info("Downloading model to: %s", model_folder)
             os.makedirs(model_folder, exist_ok=True)
 
             # Handle the model_info tuple like in your old codebase
@@ -208,19 +210,19 @@ class ModelDownloadThread(QThread):
                 
                 if os.path.exists(model_path):
                     shutil.copy2(model_path, local_model_path)
-                    print(f"Copied model: {model_path} -> {local_model_path}")
+                    log.info("Copied model: %s -> %s", model_path, local_model_path)
                 else:
-                    print(f"Model path not found: {model_path}")
+                    log.error("Model path not found: %s", model_path)
                     
                 if os.path.exists(config_path):
                     shutil.copy2(config_path, local_config_path)
-                    print(f"Copied config: {config_path} -> {local_config_path}")
+                    log.info("Copied config: %s -> %s", config_path, local_config_path)
                 else:
-                    print(f"Config path not found: {config_path}")
+                    log.error("Config path not found: %s", config_path)
                     
                 files_copied = os.path.exists(local_model_path) and os.path.exists(local_config_path)
             else:
-                print(f"Unexpected model_info format: {model_info}")
+                log.error("Unexpected model_info format: %s", model_info)
                 files_copied = False
 
             self._stop_progress = True
@@ -411,7 +413,7 @@ class CustomModelImportDialog(QDialog):
                 if args.get("use_speaker_embedding", False) or args.get("num_speakers", 1) > 1:
                     is_multi_speaker = True
             except Exception as e:
-                print(f"Warning: Could not parse config for multi-speaker check: {e}")
+                log.warning("Could not parse config for multi-speaker check: %s", e)
                 
             if is_multi_speaker and not self.speaker_path:
                 reply = QMessageBox.question(
@@ -426,7 +428,7 @@ class CustomModelImportDialog(QDialog):
             models_dir = get_models_directory()
             dest_folder = os.path.join(models_dir, "custom", model_name)
             
-            print(f"Importing custom model to: {dest_folder}")
+            log.info("Importing custom model to: %s", dest_folder)
             os.makedirs(dest_folder, exist_ok=True)
             
             dest_model = os.path.join(dest_folder, os.path.basename(self.model_path))
@@ -439,7 +441,7 @@ class CustomModelImportDialog(QDialog):
             if self.speaker_path:
                 dest_speaker = os.path.join(dest_folder, "speakers.pth")
                 shutil.copy2(self.speaker_path, dest_speaker)
-                print(f"✓ Imported speaker mapping file as: {dest_speaker}")
+                log.info("Imported speaker mapping file as: %s", dest_speaker)
                 
             QMessageBox.information(self, "Success", f"Custom model imported as '{model_name}'.")
             self.accept()
@@ -532,4 +534,99 @@ class HotkeyDialog(QDialog):
             return
             
         # TODO: Implement hotkey removal
-        QMessageBox.information(self, "Remove Hotkey", "Hotkey removal not yet implemented") 
\ No newline at end of file
+        QMessageBox.information(self, "Remove Hotkey", "Hotkey removal not yet implemented") 
+
+class MetricsDialog(QDialog):
+    """Live table of per-stage latency percentiles."""
+
+    COLUMNS = ("Stage", "Count", "p50", "p95", "p99", "Max", "Total")
+    REFRESH_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performance Stats")
+        self.resize(720, 460)
+        self.setModal(False)
+        self.setup_ui()
+        self.refresh()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_MS)
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        title_label = QLabel("Stage Latencies")
+        title_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        layout.addWidget(title_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        save_btn = QPushButton("Save JSON...")
+        save_btn.clicked.connect(self.save_json)
+        button_layout.addWidget(save_btn)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        button_layout.addWidget(reset_btn)
+        button_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    @staticmethod
+    def format_value(value, unit):
+        if value is None:
+            return "-"
+        if unit == "seconds":
+            return f"{value * 1000:.1f} ms" if value < 10 else f"{value:.1f} s"
+        return f"{value:.3f}"
+
+    def refresh(self):
+        snapshot = get_metrics().snapshot()
+        histograms = snapshot["histograms"]
+        self.table.setRowCount(len(histograms))
+        for row, (name, stats) in enumerate(histograms.items()):
+            values = [name, str(stats["count"])]
+            values += [self.format_value(stats[key], stats["unit"]) for key in ("p50", "p95", "p99", "max")]
+            values.append(self.format_value(stats["sum"], "seconds") if stats["unit"] == "seconds" else "")
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                else:
+                    item.setToolTip(STAGES.get(name, ""))
+                self.table.setItem(row, column, item)
+        counters = snapshot["counters"]
+        parts = [f"{name}: {value:g}" for name, value in counters.items()]
+        if not histograms:
+            parts.insert(0, "No measurements yet. Speak some text to collect timings.")
+        self.summary_label.setText("  |  ".join(parts))
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Metrics", "cocospeak_metrics.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            get_metrics().dump(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Save Metrics", f"Could not save metrics: {e}")
+
+    def reset(self):
+        get_metrics().reset()
+        self.refresh()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
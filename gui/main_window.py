@@ -4,63 +4,141 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QComboBox, QTextEdit, QPushButton, QCheckBox,
                              QMessageBox, QFileDialog, QProgressBar, QListWidget,
-                             QDialog, QLineEdit, QFrame, QSplitter, QGroupBox)
+                             QDialog, QLineEdit, QFrame, QSplitter, QGroupBox, QSpinBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QKeyEvent, QKeySequence
 import keyboard
 import threading
 import collections
+import itertools
+import time
 import platform
 import json
-from tts_module.model_manager import get_available_models
-from tts_module.synthesis import load_model, tts_to_wav
-from tts_module.audio import play_audio, save_wav, get_default_output_path
-from gui.dialogs import OnlineModelDialog, CustomModelImportDialog, HotkeyDialog
+from tts_module.model_manager import (get_available_models, get_speakers_list, get_models_directory,
+                                      get_changed_folders, rescan_model_folders, is_path_under)
+from tts_module.model_watcher import ModelWatcher, watcher_enabled
+from tts_module.synth_cache import get_synthesizer_cache
+from tts_module.synthesis import (get_cached_model, fetch_cached_model, cached_tts_to_wav, tts_to_chunks,
+                                  get_output_sample_rate, warm_up, warmup_enabled, is_warmed_up, get_synth_lock,
+                                  TAIL_SILENCE_SECONDS)
+from tts_module.audio import play_audio, play_stream, stop_audio, save_wav, get_default_output_path
+from tts_module.pipeline import SynthesisPipeline, get_default_lookahead
+from tts_module.backend import import_backend
+from tts_module.threads import get_inference_threads, save_threads, configure_torch_threads, autotune_threads
+from tts_module.metrics import get_metrics
+from utils.log import get_logger
+from gui.dialogs import OnlineModelDialog, CustomModelImportDialog, HotkeyDialog, MetricsDialog
+
+log = get_logger(__name__)
+
+def synthesize_with_fallback(synth, text, speaker_id, pad_seconds=TAIL_SILENCE_SECONDS, dsp=True):
+    """Synthesize text, retrying with preprocessed text on vocabulary errors.
+
+    Waits while ModelLoadThread is still warming up the same synthesizer.
+    """
+    with get_synth_lock(synth):
+        # Try synthesis with original text first
+        try:
+            return cached_tts_to_wav(synth, text, speaker_id, pad_seconds=pad_seconds, dsp=dsp)
+        except Exception as vocab_error:
+            # If it's a vocabulary error, try with preprocessed text
+            if "not found in the vocabulary" in str(vocab_error) or "Character" in str(vocab_error):
+                log.info("Vocabulary error detected, preprocessing text: %r", text)
+                processed_text = SynthesisThread.preprocess_text(text)
+                if processed_text != text:
+                    log.info("Text preprocessed: %r -> %r", text, processed_text)
+                
+                # Try again with preprocessed text
+                return cached_tts_to_wav(synth, processed_text, speaker_id, pad_seconds=pad_seconds, dsp=dsp)
+            # If it's not a vocabulary error, re-raise the original exception
+            raise vocab_error
+
+def render_queue_item(text, speaker_id, model_path, config_path, use_cuda):
+    """Pipeline render function: synthesize one queue entry with the resident model.
+
+    Returns (wav, sample rate, load seconds, synthesis seconds, whether the
+    model had to be loaded).
+    """
+    load_start = time.perf_counter()
+    synth, loaded = fetch_cached_model(model_path, config_path, use_cuda)
+    load_time = time.perf_counter() - load_start
+    if synth is None:
+        raise Exception("Failed to load model")
+    synth_start = time.perf_counter()
+    wav = synthesize_with_fallback(synth, text, speaker_id)
+    return wav, get_output_sample_rate(synth), load_time, time.perf_counter() - synth_start, loaded
 
 class SynthesisThread(QThread):
     """Thread for running synthesis to avoid blocking the UI."""
-    finished = pyqtSignal(object)  # Emits the audio data
+    finished = pyqtSignal(object, int)  # Emits (audio data, sample rate)
+    played = pyqtSignal(object, int)  # Emits (audio data, sample rate) after streamed playback
     error = pyqtSignal(str)  # Emits error message
+    model_loaded = pyqtSignal(object, object)  # Emits (synthesizer, model key) when the worker had to load
+    timings = pyqtSignal(float, float, bool)  # Emits (load seconds, synthesis seconds, model was loaded)
     
-    def __init__(self, model_path, config_path, text, speaker_id, use_cuda):
+    def __init__(self, model_path, config_path, text, speaker_id, use_cuda, synth=None, synth_key=None,
+                 stream=False):
         super().__init__()
         self.model_path = model_path
         self.config_path = config_path
         self.text = text
         self.speaker_id = speaker_id
         self.use_cuda = use_cuda
+        # Resident synthesizer handed over by the main window; only reused
+        # when it was loaded for the same model path, config and CUDA flag.
+        self.synth = synth
+        self.synth_key = synth_key
+        self.model_key = (model_path, config_path, use_cuda)
+        # Stream mode synthesizes sentence by sentence and plays while the
+        # next sentence is generated.
+        self.stream = stream
         
     def run(self):
         try:
-            # Load model
-            synth = load_model(self.model_path, self.config_path, self.use_cuda)
+            load_time = 0.0
+            loaded = False
+            synth = self.synth if self.synth_key == self.model_key else None
             if synth is None:
-                self.error.emit("Failed to load model")
-                return
+                # Load model (resident synthesizer missing or stale)
+                load_start = time.perf_counter()
+                synth, loaded = fetch_cached_model(self.model_path, self.config_path, self.use_cuda)
+                load_time = time.perf_counter() - load_start
+                get_metrics().observe("gui.model_load", load_time)
+                if synth is None:
+                    self.error.emit("Failed to load model")
+                    return
+                self.model_loaded.emit(synth, self.model_key)
                 
-            # Try synthesis with original text first
-            try:
-                wav = tts_to_wav(synth, self.text, self.speaker_id)
-                self.finished.emit(wav)
-            except Exception as vocab_error:
-                # If it's a vocabulary error, try with preprocessed text
-                if "not found in the vocabulary" in str(vocab_error) or "Character" in str(vocab_error):
-                    print(f"Vocabulary error detected, preprocessing text: '{self.text}'")
-                    processed_text = self.preprocess_text(self.text)
-                    if processed_text != self.text:
-                        print(f"Text preprocessed: '{self.text}' -> '{processed_text}'")
-                    
-                    # Try again with preprocessed text
-                    wav = tts_to_wav(synth, processed_text, self.speaker_id)
-                    self.finished.emit(wav)
-                else:
-                    # If it's not a vocabulary error, re-raise the original exception
-                    raise vocab_error
+            sample_rate = get_output_sample_rate(synth)
+            synth_start = time.perf_counter()
+            if self.stream:
+                wav = play_stream(self.stream_chunks(synth), sample_rate)
+            else:
+                wav = self.synthesize(synth, self.text)
+            synth_time = time.perf_counter() - synth_start
+            get_metrics().observe("gui.synthesis", synth_time)
+            
+            log.info("Timing: model load %.3fs (%s), %s %.3fs", load_time, "reloaded" if loaded else "resident",
+                     "synthesis + streamed playback" if self.stream else "synthesis", synth_time)
+            self.timings.emit(load_time, synth_time, loaded)
+            if self.stream:
+                self.played.emit(wav, sample_rate)
+            else:
+                self.finished.emit(wav, sample_rate)
             
         except Exception as e:
             self.error.emit(str(e))
     
-    def preprocess_text(self, text):
+    def synthesize(self, synth, text, pad_seconds=TAIL_SILENCE_SECONDS):
+        """Synthesize text, retrying with preprocessed text on vocabulary errors."""
+        return synthesize_with_fallback(synth, text, self.speaker_id, pad_seconds)
+    
+    def stream_chunks(self, synth):
+        """Yield synthesized audio sentence by sentence."""
+        return tts_to_chunks(synth, self.text, self.speaker_id, synthesize_with_fallback)
+    
+    @staticmethod
+    def preprocess_text(text):
         """Preprocess text to handle character vocabulary issues."""
         # Remove or replace problematic characters
         import re
@@ -98,27 +176,140 @@ class SynthesisThread(QThread):
         
         return processed
 
+class BackendImportThread(QThread):
+    """Thread for importing torch and TTS after the window is shown."""
+    ready = pyqtSignal(object)  # Emits backend info (CUDA availability, import time)
+    error = pyqtSignal(str)  # Emits error message
+    
+    def run(self):
+        try:
+            self.ready.emit(import_backend())
+        except Exception as e:
+            self.error.emit(str(e))
+
+class ModelScanThread(QThread):
+    """Thread for scanning the models directory to avoid blocking the UI."""
+    model_found = pyqtSignal(object)  # Emits each model entry as it is found
+    scan_finished = pyqtSignal(list)  # Emits the complete model list
+    error = pyqtSignal(str)  # Emits error message
+    
+    def run(self):
+        try:
+            models = get_available_models(on_model=self.model_found.emit)
+            self.scan_finished.emit(models)
+        except Exception as e:
+            self.error.emit(str(e))
+
+class ModelRescanThread(QThread):
+    """Thread for rescanning only the model folders touched by file system changes."""
+    finished = pyqtSignal(object, object)  # Emits (changed paths, models found in the changed folders)
+    error = pyqtSignal(str)  # Emits error message
+    
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+        
+    def run(self):
+        try:
+            models = rescan_model_folders(get_changed_folders(self.paths))
+            self.finished.emit(self.paths, models)
+        except Exception as e:
+            self.error.emit(str(e))
+
+class SpeakersThread(QThread):
+    """Thread that resolves a model's speaker names (may unpickle its speakers file)."""
+    finished = pyqtSignal(object, object)  # Emits (model entry, speaker names or None)
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        
+    def run(self):
+        try:
+            speakers = get_speakers_list(self.model)
+        except Exception as e:
+            log.warning("Could not list speakers: %s", e)
+            speakers = None
+        self.finished.emit(self.model, speakers)
+
 class ModelLoadThread(QThread):
     """Thread for loading models to avoid blocking the UI."""
-    finished = pyqtSignal(object)  # Emits the synthesizer
+    finished = pyqtSignal(object, object)  # Emits (synthesizer, warm-up seconds or None)
+    warming_up = pyqtSignal()  # Emitted when the model is loaded and the warm-up starts
     error = pyqtSignal(str)  # Emits error message
     
-    def __init__(self, model_path, config_path, use_cuda):
+    def __init__(self, model_path, config_path, use_cuda, warm=True):
         super().__init__()
         self.model_path = model_path
         self.config_path = config_path
         self.use_cuda = use_cuda
+        self.warm = warm
+        self.model_key = (model_path, config_path, use_cuda)
         
     def run(self):
         try:
-            synth = load_model(self.model_path, self.config_path, self.use_cuda)
+            synth = get_cached_model(self.model_path, self.config_path, self.use_cuda)
             if synth is None:
                 self.error.emit("Failed to load model")
                 return
-            self.finished.emit(synth)
+            # A resident synthesizer from the cache was usually warmed up already
+            warmup_time = None
+            if self.warm and not is_warmed_up(synth):
+                self.warming_up.emit()
+                warmup_time = warm_up(synth)
+            self.finished.emit(synth, warmup_time)
         except Exception as e:
             self.error.emit(str(e))
 
+class AutotuneThread(QThread):
+    """Thread that measures synthesis speed at several torch thread counts."""
+    finished = pyqtSignal(int, object)  # Emits (best thread count, {threads: real-time factor})
+    error = pyqtSignal(str)  # Emits error message
+    
+    def __init__(self, synth, speaker_id):
+        super().__init__()
+        self.synth = synth
+        self.speaker_id = speaker_id
+        
+    def run(self):
+        try:
+            best, measurements = autotune_threads(self.synth, self.speaker_id)
+            self.finished.emit(best, measurements)
+        except Exception as e:
+            self.error.emit(str(e))
+
+# The queue hands over to the next entry this long before the current clip
+# ends, so back-to-back entries play without a gap
+QUEUE_HANDOFF_SECONDS = 0.25
+
+class QueuePlaybackThread(QThread):
+    """Thread that waits for a pre-rendered queue item and plays it."""
+    rendered = pyqtSignal(object, int)  # Emits (audio data, sample rate) once it is ready
+    played = pyqtSignal()  # Emitted after playback returns
+    error = pyqtSignal(str)  # Emits synthesis error message
+    play_error = pyqtSignal(str)  # Emits playback error message
+    timings = pyqtSignal(float, float, bool)  # Emits (load seconds, synthesis seconds, model was loaded)
+    
+    def __init__(self, pipeline, item_id):
+        super().__init__()
+        self.pipeline = pipeline
+        self.item_id = item_id
+        
+    def run(self):
+        try:
+            wav, sample_rate, load_time, synth_time, loaded = self.pipeline.take(self.item_id)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.timings.emit(load_time, synth_time, loaded)
+        self.rendered.emit(wav, sample_rate)
+        try:
+            # Already normalized and compressed by the DSP chain
+            play_audio(wav, sample_rate, lead_seconds=QUEUE_HANDOFF_SECONDS, normalize=False)
+        except Exception as e:
+            self.play_error.emit(str(e))
+        self.played.emit()
+
 class HotkeyInputDialog(QDialog):
     """Dialog for capturing hotkey combinations."""
     
@@ -206,24 +397,42 @@ class HotkeyInputDialog(QDialog):
         return super().eventFilter(obj, event)
 
 class MainWindow(QMainWindow):
+    models_changed = pyqtSignal(object)  # Emitted from the model watcher thread with changed paths
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CocoSpeak TTS App")
         self.resize(1000, 700)
         self.hotkey = '/'  # Set default hotkey to '/'
-        self.sample_rate = 22050
+        self.sample_rate = 22050  # Output rate of the resident model
         self.current_audio = None
+        self.current_sample_rate = 22050  # Rate current_audio was synthesized at
         self.synth = None
+        self.synth_key = None  # (model_path, config_path, use_cuda) of the resident synthesizer
         self._speaking = False
         self._processing_audio = False  # Add flag for audio playback
         self._loading_model = False
+        self._autotuning = False  # Queue rendering and playback wait while threads are measured
+        self._backend_ready = False
+        self._scanning = False
+        self._rescanning = False
+        self._pending_model_changes = set()
+        self.model_watcher = None
+        self._speaker_threads = []  # Speaker lookups still running, newest last
+        self.metrics_dialog = None
         self.is_minimized = False
-        self.tts_queue = collections.deque()
+        self.tts_queue = collections.deque()  # Entries: {"id", "text", "speaker_id"}
+        self._queue_ids = itertools.count(1)
+        self._current_item_id = None  # Queue entry being synthesized/played
         self._hotkey_handler = None
         self.queue_lock = threading.Lock() # Add a lock for thread-safe queue access
+        # Renders upcoming queue entries while the current one is playing
+        self.pipeline = SynthesisPipeline(render_queue_item, get_default_lookahead())
         
         self.setup_ui()
+        self.start_backend_import()
         self.populate_models()
+        self.start_model_watcher()
         self.register_global_hotkey(self.hotkey)
         QTimer.singleShot(100, self.focus_text_entry)
 
@@ -261,23 +470,26 @@ class MainWindow(QMainWindow):
         cuda_layout.setSpacing(4)  # Lower margin between controls
         # CUDA checkbox
         self.cuda_checkbox = QCheckBox("Use CUDA (GPU)")
-        try:
-            import torch
-            cuda_available = torch.cuda.is_available()
-        except:
-            cuda_available = False
-        self.cuda_checkbox.setChecked(cuda_available)
+        # Enabled (and checked if a GPU is found) once the TTS backend is imported
+        self.cuda_checkbox.setEnabled(False)
         self.cuda_checkbox.toggled.connect(self.on_cuda_change)
         cuda_layout.addWidget(self.cuda_checkbox)
+        # Warm-up: a few throwaway sentences after loading so the first Speak is not slower
+        self.warmup_checkbox = QCheckBox("Warm up")
+        self.warmup_checkbox.setChecked(warmup_enabled())
+        self.warmup_checkbox.setToolTip("Synthesize a few test sentences after loading a model so the first request "
+                                        "runs at full speed (COCOSPEAK_WARMUP_SPEAKERS=all warms every speaker)")
+        cuda_layout.addWidget(self.warmup_checkbox)
         # Button width for all model loading buttons
         btn_width = 170
         # Load model button
         self.load_btn = QPushButton("Load Model")
         self.load_btn.setFixedWidth(btn_width)
         self.load_btn.clicked.connect(self.load_model)
+        self.load_btn.setEnabled(False)
         cuda_layout.addWidget(self.load_btn)
         # Status label (inline, not wide)
-        self.status_label = QLabel("Model not loaded")
+        self.status_label = QLabel("Loading TTS backend...")
         cuda_layout.addWidget(self.status_label)
         # Download online model button
         self.download_online_btn = QPushButton("Download Online Model")
@@ -294,7 +506,35 @@ class MainWindow(QMainWindow):
         self.hotkey_btn.setFixedWidth(170)
         self.hotkey_btn.clicked.connect(self.set_hotkeys)
         cuda_layout.addWidget(self.hotkey_btn)
-        cuda_group.setLayout(cuda_layout)
+        # Inference threads: torch intra-op threads used for synthesis
+        threads_layout = QHBoxLayout()
+        threads_layout.setSpacing(4)
+        threads_layout.addWidget(QLabel("Inference threads:"))
+        self.threads_spin = QSpinBox()
+        self.threads_spin.setRange(0, os.cpu_count() or 1)
+        self.threads_spin.setSpecialValueText("Default")
+        self.threads_spin.setValue(get_inference_threads() or 0)
+        if os.environ.get("COCOSPEAK_INFER_THREADS"):
+            self.threads_spin.setEnabled(False)
+            self.threads_spin.setToolTip("Set by COCOSPEAK_INFER_THREADS")
+        else:
+            self.threads_spin.setToolTip("Torch threads used for synthesis on this machine (Default = torch's choice)")
+        self.threads_spin.valueChanged.connect(self.on_threads_change)
+        threads_layout.addWidget(self.threads_spin)
+        self.autotune_btn = QPushButton("Auto-tune")
+        self.autotune_btn.setToolTip("Measure synthesis speed at several thread counts with the loaded model and keep the fastest")
+        self.autotune_btn.setEnabled(False)
+        self.autotune_btn.clicked.connect(self.autotune_threads)
+        threads_layout.addWidget(self.autotune_btn)
+        threads_layout.addStretch()
+        self.stats_btn = QPushButton("📊 Stats")
+        self.stats_btn.setToolTip("Per-stage latency percentiles (p50/p95/p99) and real-time factor")
+        self.stats_btn.clicked.connect(self.show_metrics)
+        threads_layout.addWidget(self.stats_btn)
+        loading_layout = QVBoxLayout()
+        loading_layout.addLayout(cuda_layout)
+        loading_layout.addLayout(threads_layout)
+        cuda_group.setLayout(loading_layout)
         layout.addWidget(cuda_group)
         
         # Speaker Selection Frame
@@ -363,6 +603,21 @@ class MainWindow(QMainWindow):
         self.save_btn.setEnabled(False)
         control_layout.addWidget(self.save_btn)
         
+        # Streaming: play each sentence as soon as it is synthesized
+        self.stream_checkbox = QCheckBox("Stream sentences")
+        self.stream_checkbox.setToolTip("Start playback after the first sentence instead of the whole text")
+        self.stream_checkbox.toggled.connect(lambda checked: self.resubmit_queue())
+        control_layout.addWidget(self.stream_checkbox)
+        
+        # Look-ahead: how many queued entries are synthesized ahead of playback
+        control_layout.addWidget(QLabel("Look-ahead:"))
+        self.lookahead_spin = QSpinBox()
+        self.lookahead_spin.setRange(0, 8)
+        self.lookahead_spin.setValue(self.pipeline.depth)
+        self.lookahead_spin.setToolTip("Queued entries synthesized ahead while the current one plays (0 = off)")
+        self.lookahead_spin.valueChanged.connect(self.pipeline.set_depth)
+        control_layout.addWidget(self.lookahead_spin)
+        
         # Phonemizer selection
         control_layout.addWidget(QLabel("Phonemizer:"))
         self.phonemizer_combo = QComboBox()
@@ -379,16 +634,164 @@ class MainWindow(QMainWindow):
         # Set phonemizer default to espeak
         self.phonemizer_combo.setCurrentText("espeak")
         
-    def populate_models(self):
-        """Populate the model dropdown with available models."""
-        models = get_available_models()
+    def start_backend_import(self):
+        """Import torch/TTS in the background so the window paints immediately."""
+        self.backend_thread = BackendImportThread()
+        self.backend_thread.ready.connect(self.on_backend_ready)
+        self.backend_thread.error.connect(self.on_backend_error)
+        self.backend_thread.start()
+
+    def on_backend_ready(self, info):
+        """Enable the model controls and load the selected model."""
+        self._backend_ready = True
+        self.cuda_checkbox.blockSignals(True)
+        self.cuda_checkbox.setChecked(info["cuda_available"])
+        self.cuda_checkbox.blockSignals(False)
+        self.cuda_checkbox.setEnabled(True)
+        self.load_btn.setEnabled(True)
+        self.status_label.setText("Model not loaded")
+        if self.model_combo.currentData():
+            self.load_model()
+
+    def on_backend_error(self, error_msg):
+        """Handle a failed torch/TTS import."""
+        self.status_label.setText("TTS backend unavailable")
+        QMessageBox.critical(self, "Error", f"Failed to import the TTS backend: {error_msg}")
+
+    def populate_models(self, show_summary=False):
+        """Populate the model dropdown, adding models as the background scan finds them."""
+        if self._scanning:
+            return
+        self._scanning = True
+        self._show_scan_summary = show_summary
         self.model_combo.clear()
+        self.desc_label.setText("Scanning for models...")
+        self.refresh_btn.setEnabled(False)
+        self.scan_thread = ModelScanThread()
+        self.scan_thread.model_found.connect(self.on_model_found)
+        self.scan_thread.scan_finished.connect(self.on_scan_finished)
+        self.scan_thread.error.connect(self.on_scan_error)
+        self.scan_thread.start()
+
+    def on_model_found(self, model):
+        """Add a model to the dropdown as soon as the scan finds it."""
+        self.model_combo.addItem(model["display_name"], model)
+
+    def on_scan_finished(self, models):
+        """Handle the end of a model scan."""
+        self._scanning = False
+        self.refresh_btn.setEnabled(True)
+        log.info("Refresh complete. Found %d models.", len(models))
         if not models:
             self.model_combo.addItem("No models found")
+            self.desc_label.setText("No models found")
+        if self._pending_model_changes:
+            self.on_models_changed(set())
+        if not self._show_scan_summary:
+            return
+        # Show results
+        if models:
+            QMessageBox.information(self, "Refresh Complete", f"Found {len(models)} model(s)")
         else:
-            for model in models:
+            from tts_module.model_manager import get_models_directory
+            models_dir = get_models_directory()
+            QMessageBox.information(self, "Refresh Complete", f"No models found.\n\nPlease add models to:\n{models_dir}")
+
+    def on_scan_error(self, error_msg):
+        """Handle a failed model scan."""
+        self._scanning = False
+        self.refresh_btn.setEnabled(True)
+        self.desc_label.setText("Model scan failed")
+        QMessageBox.critical(self, "Error", f"Failed to scan models: {error_msg}")
+                
+    def start_model_watcher(self):
+        """Watch the models directory so added, removed and modified models show up without Refresh."""
+        if not watcher_enabled():
+            return
+        self.models_changed.connect(self.on_models_changed)
+        self.model_watcher = ModelWatcher(get_models_directory(), self.models_changed.emit)
+        self.model_watcher.start()
+
+    def on_models_changed(self, paths):
+        """Rescan the folders touched by a batch of file system changes."""
+        self._pending_model_changes.update(paths)
+        # While threads are auto-tuned the model must not change; applied in on_autotune_done()
+        if self._scanning or self._rescanning or self._autotuning or not self._pending_model_changes:
+            return
+        paths, self._pending_model_changes = self._pending_model_changes, set()
+        self._rescanning = True
+        self.rescan_thread = ModelRescanThread(paths)
+        self.rescan_thread.finished.connect(self.apply_model_changes)
+        self.rescan_thread.error.connect(self.on_rescan_error)
+        self.rescan_thread.start()
+
+    def apply_model_changes(self, paths, models):
+        """Update the dropdown in place; untouched models keep their loaded synthesizer."""
+        self._rescanning = False
+        folders = get_changed_folders(paths)
+        changed_files = {os.path.abspath(p) for p in paths}
+        found = {model["model_path"]: model for model in models}
+        current = self.model_combo.currentData()
+        current_path = current["model_path"] if current else None
+        reload_current = False
+        added = removed = modified = 0
+        
+        # Drop the "No models found" placeholder before adding real entries
+        if found and self.model_combo.count() == 1 and not self.model_combo.itemData(0):
+            self.model_combo.removeItem(0)
+        
+        for i in reversed(range(self.model_combo.count())):
+            data = self.model_combo.itemData(i)
+            if not data or not any(is_path_under(data["model_path"], f) for f in folders):
+                continue
+            model_path = data["model_path"]
+            model = found.pop(model_path, None)
+            if model is None:
+                get_synthesizer_cache().evict_model(model_path)
+                self.model_combo.removeItem(i)
+                removed += 1
+            elif model != data or {model_path, data["config_path"], data.get("speakers_path")} & changed_files:
+                # Drop cached synthesizers built from the old files; a config edit
+                # only invalidates the entries built from that config
+                if data["config_path"] in changed_files and not {model_path, data.get("speakers_path")} & changed_files:
+                    get_synthesizer_cache().evict_config(data["config_path"])
+                else:
+                    get_synthesizer_cache().evict_model(model_path)
+                # The reload below is explicit; editing the current item must not trigger on_model_change
+                self.model_combo.blockSignals(True)
+                self.model_combo.setItemText(i, model["display_name"])
+                self.model_combo.setItemData(i, model)
+                self.model_combo.blockSignals(False)
+                reload_current = reload_current or model_path == current_path
+                modified += 1
+                
+        for model in models:
+            if model["model_path"] in found:
                 self.model_combo.addItem(model["display_name"], model)
+                added += 1
                 
+        if self.model_combo.count() == 0:
+            self.synth = None
+            self.synth_key = None
+            self.status_label.setText("Model not loaded")
+            self.speak_btn.setEnabled(False)
+            self.save_btn.setEnabled(False)
+            self.model_combo.addItem("No models found")
+            self.desc_label.setText("No models found")
+        elif reload_current and self.model_combo.currentData() and self.model_combo.currentData()["model_path"] == current_path:
+            # The selected model changed on disk, reload it
+            self.on_model_change(self.model_combo.currentText())
+            
+        if added or removed or modified:
+            log.info("Model folder changes: %d added, %d removed, %d modified", added, removed, modified)
+        if self._pending_model_changes:
+            self.on_models_changed(set())
+
+    def on_rescan_error(self, error_msg):
+        """Handle a failed incremental rescan."""
+        self._rescanning = False
+        log.error("Model rescan failed: %s", error_msg)
+        
     def on_model_change(self, text):
         """Handle model selection change."""
         if text == "No models found":
@@ -402,80 +805,78 @@ class MainWindow(QMainWindow):
         # Update description
         self.desc_label.setText(current_data.get("description", ""))
         
-        # Update speaker dropdown
-        speakers = current_data.get("speakers_list")
+        # Update speaker dropdown once the names are resolved in the background
         self.speaker_combo.clear()
-        if speakers:
-            self.speaker_combo.addItems(speakers)
-            self.speaker_group.setVisible(True)
-        else:
-            self.speaker_group.setVisible(False)
+        self.speaker_group.setVisible(False)
+        self._speaker_threads = [t for t in self._speaker_threads if t.isRunning()]
+        speakers_thread = SpeakersThread(current_data)
+        speakers_thread.finished.connect(self.on_speakers_resolved)
+        self._speaker_threads.append(speakers_thread)
+        speakers_thread.start()
             
-        # Reset model when changing selection
+        # Reset model when changing selection (the previous synthesizer stays
+        # in the process-wide cache, so switching back does not hit the disk)
         if self.synth is not None:
             self.synth = None
+            self.synth_key = None
             self.status_label.setText("Model not loaded")
             self.speak_btn.setEnabled(False)
             self.save_btn.setEnabled(False)
             
+        # Queued entries are re-rendered with the newly selected model
+        self.resubmit_queue()
         # Immediately load the model
         self.load_model()
         # Focus the text input after selecting model
         QTimer.singleShot(100, self.focus_text_entry)
         
+    def on_speakers_resolved(self, model, speakers):
+        """Fill the speaker dropdown, unless another model was selected meanwhile."""
+        current_data = self.model_combo.currentData()
+        if current_data != model:
+            return
+        self.speaker_combo.clear()
+        if speakers:
+            self.speaker_combo.addItems(speakers)
+            self.speaker_group.setVisible(True)
+        else:
+            self.speaker_group.setVisible(False)
+        
     def on_cuda_change(self):
         """Handle CUDA setting change."""
         # Reset model when CUDA setting changes
         if self.synth is not None:
             self.synth = None
+            self.synth_key = None
             self.status_label.setText("Model not loaded")
             self.speak_btn.setEnabled(False)
             self.save_btn.setEnabled(False)
+        self.resubmit_queue()
         # Immediately load the model
         self.load_model()
         
     def refresh_models(self):
         """Refresh the model list."""
-        print("Refreshing models...")
-        
-        # Clear current models first
-        self.model_combo.clear()
-        self.desc_label.setText("Scanning for models...")
-        
-        # Scan for models
-        models = get_available_models()
-        model_names = [model["display_name"] for model in models]
-        
-        print(f"Refresh complete. Found {len(model_names)} models.")
-        
-        # Update combobox
-        if model_names:
-            for model in models:
-                self.model_combo.addItem(model["display_name"], model)
-            self.desc_label.setText(models[0].get("description", ""))
-        else:
-            self.model_combo.addItem("No models found")
-            self.desc_label.setText("No models found")
+        log.info("Refreshing models...")
         
         # Reset model
         if self.synth is not None:
             self.synth = None
+            self.synth_key = None
             self.status_label.setText("Model not loaded")
             self.speak_btn.setEnabled(False)
             self.save_btn.setEnabled(False)
         
-        # Show results
-        if model_names:
-            QMessageBox.information(self, "Refresh Complete", f"Found {len(model_names)} model(s)")
-        else:
-            from tts_module.model_manager import get_models_directory
-            models_dir = get_models_directory()
-            QMessageBox.information(self, "Refresh Complete", f"No models found.\n\nPlease add models to:\n{models_dir}")
+        # Clear current models and rescan; results show up as they are found
+        self.populate_models(show_summary=True)
             
     def load_model(self):
         """Load the selected model."""
         if self._loading_model:
             return
+        if not self._backend_ready:
+            # on_backend_ready() loads the selected model
+            return
             
         current_data = self.model_combo.currentData()
         if not current_data:
@@ -489,21 +890,107 @@ class MainWindow(QMainWindow):
         self.load_thread = ModelLoadThread(
             current_data["model_path"],
             current_data["config_path"],
-            self.cuda_checkbox.isChecked()
+            self.cuda_checkbox.isChecked(),
+            warm=self.warmup_checkbox.isChecked()
         )
+        self.load_thread.warming_up.connect(lambda: self.status_label.setText("Warming up model..."))
         self.load_thread.finished.connect(self.on_model_loaded)
         self.load_thread.error.connect(self.on_model_load_error)
         self.load_thread.start()
         
-    def on_model_loaded(self, synth):
+    def on_model_loaded(self, synth, warmup_time=None):
         """Handle successful model loading."""
         self.synth = synth
-        self.status_label.setText("Model loaded successfully")
+        self.synth_key = self.load_thread.model_key
+        self.sample_rate = get_output_sample_rate(synth)
+        if warmup_time is not None:
+            self.status_label.setText(f"Model loaded successfully (warm-up {warmup_time:.2f}s)")
+        else:
+            self.status_label.setText("Model loaded successfully")
         self.speak_btn.setEnabled(True)
         self.save_btn.setEnabled(True)
         self.load_btn.setEnabled(True)
+        self.autotune_btn.setEnabled(self.threads_spin.isEnabled())
         self._loading_model = False
         
+    def on_threads_change(self, value):
+        """Save the inference thread count for this machine and apply it."""
+        save_threads(value or None)
+        if self._backend_ready:
+            try:
+                configure_torch_threads(value or None)
+            except Exception as e:
+                log.warning("Could not configure torch threads: %s", e)
+
+    def autotune_threads(self):
+        """Find the fastest thread count with the loaded model."""
+        if not self.synth:
+            return
+        # torch.set_num_threads() must not run under a synthesis in progress
+        with self.queue_lock:
+            queued = bool(self.tts_queue)
+        if queued or self._speaking or self._processing_audio or self.pipeline.is_busy():
+            QMessageBox.information(self, "Auto-tune", "Wait for the queue to finish before auto-tuning threads.")
+            return
+        speaker_id = None
+        if self.speaker_group.isVisible() and self.speaker_combo.currentText():
+            speaker_id = self.speaker_combo.currentText()
+        # Keep other synthesis off the cores while measuring; new queue entries wait
+        self._autotuning = True
+        self.autotune_btn.setEnabled(False)
+        self.speak_btn.setEnabled(False)
+        self.save_btn.setEnabled(False)
+        self.load_btn.setEnabled(False)
+        # Switching model, phonemizer, device or threads would reload the model mid-measurement
+        self.set_model_controls_enabled(False)
+        self.status_label.setText("Auto-tuning threads...")
+        self.autotune_thread = AutotuneThread(self.synth, speaker_id)
+        self.autotune_thread.finished.connect(self.on_autotune_finished)
+        self.autotune_thread.error.connect(self.on_autotune_error)
+        self.autotune_thread.start()
+
+    def on_autotune_finished(self, best, measurements):
+        self.threads_spin.blockSignals(True)
+        self.threads_spin.setValue(best)
+        self.threads_spin.blockSignals(False)
+        self.status_label.setText(f"Using {best} thread(s) (real-time factor {measurements[best]:.2f})")
+        self.on_autotune_done()
+
+    def on_autotune_error(self, error_msg):
+        self.status_label.setText("Auto-tune failed")
+        self.on_autotune_done()
+        QMessageBox.warning(self, "Auto-tune", f"Thread auto-tune failed: {error_msg}")
+
+    def on_autotune_done(self):
+        self._autotuning = False
+        self.autotune_btn.setEnabled(True)
+        self.speak_btn.setEnabled(self.synth is not None)
+        self.save_btn.setEnabled(self.synth is not None)
+        self.load_btn.setEnabled(True)
+        self.set_model_controls_enabled(True)
+        # Apply model folder changes that arrived while measuring
+        self.on_models_changed(set())
+        # Start entries that were queued (with Enter) while measuring
+        self.resubmit_queue()
+        QTimer.singleShot(0, self.process_queue)
+
+    def set_model_controls_enabled(self, enabled):
+        """Enable or disable the controls that change or reload the model."""
+        for widget in (self.model_combo, self.phonemizer_combo, self.download_online_btn, self.import_custom_btn):
+            widget.setEnabled(enabled)
+        self.cuda_checkbox.setEnabled(enabled and self._backend_ready)
+        self.refresh_btn.setEnabled(enabled and not self._scanning)
+        self.threads_spin.setEnabled(enabled and not os.environ.get("COCOSPEAK_INFER_THREADS"))
+
+    def show_metrics(self):
+        """Open (or raise) the live stats panel."""
+        if self.metrics_dialog is None or not self.metrics_dialog.isVisible():
+            self.metrics_dialog = MetricsDialog(self)
+            self.metrics_dialog.show()
+        else:
+            self.metrics_dialog.raise_()
+            self.metrics_dialog.activateWindow()
+
     def on_model_load_error(self, error_msg):
         """Handle model loading error."""
         self.status_label.setText("Model loading failed")
@@ -520,69 +1007,157 @@ class MainWindow(QMainWindow):
         if not self.synth:
             QMessageBox.warning(self, "Warning", "Please load a model first.")
             return
+        speaker_id = None
+        if self.speaker_group.isVisible() and self.speaker_combo.currentText():
+            speaker_id = self.speaker_combo.currentText()
+        item = {"id": next(self._queue_ids), "text": text, "speaker_id": speaker_id}
         with self.queue_lock:
-            self.tts_queue.append(text)
+            self.tts_queue.append(item)
+        if not self.stream_checkbox.isChecked() and not self._autotuning:
+            self.submit_to_pipeline(item)
         self.text_input.clear()
         QTimer.singleShot(0, self.update_queue_listbox)
         QTimer.singleShot(0, self.process_queue)
 
+    def submit_to_pipeline(self, item):
+        """Hand a queue entry to the look-ahead renderer with the current model."""
+        current_data = self.model_combo.currentData()
+        if not current_data:
+            return
+        self.pipeline.submit(
+            item["id"],
+            item["text"],
+            item["speaker_id"],
+            current_data["model_path"],
+            current_data["config_path"],
+            self.cuda_checkbox.isChecked()
+        )
+
+    def resubmit_queue(self):
+        """Re-render queued entries after the model, device or phonemizer changed.
+
+        Resubmitting supersedes renders made with the previous model; the entry
+        being played is left alone unless it is still waiting to be rendered.
+        """
+        if self.stream_checkbox.isChecked() or self._autotuning:
+            return
+        with self.queue_lock:
+            items = list(self.tts_queue)
+        for item in items:
+            if item["id"] != self._current_item_id or self.pipeline.contains(item["id"]):
+                self.submit_to_pipeline(item)
+
     def update_queue_listbox(self):
         """Update the queue listbox display, showing speaking status."""
         self.queue_listbox.clear()
         with self.queue_lock:
-            for i, text in enumerate(self.tts_queue):
-                if i == 0 and (self._speaking or self._processing_audio):
-                    display = f"{i+1}. {text[:50]}{'...' if len(text) > 50 else ''} (Speaking...)"
-                else:
-                    display = f"{i+1}. {text[:50]}{'...' if len(text) > 50 else ''}"
+            for i, item in enumerate(self.tts_queue):
+                text = item["text"]
+                display = f"{i+1}. {text[:50]}{'...' if len(text) > 50 else ''}"
+                if item["id"] == self._current_item_id and (self._speaking or self._processing_audio):
+                    display += " (Speaking...)"
+                elif self.pipeline.is_ready(item["id"]):
+                    display += " (Ready)"
                 self.queue_listbox.addItem(display)
 
     def process_queue(self):
-        """Process the TTS queue: always speak from the queue, only one at a time."""
-        if self._speaking or self._processing_audio:
+        """Process the TTS queue: play entries in order while later ones are pre-rendered."""
+        if self._speaking or self._processing_audio or self._autotuning:
             return
         with self.queue_lock:
             if not self.tts_queue:
                 return
-            text = self.tts_queue[0]  # Don't pop yet
-        QTimer.singleShot(0, self.update_queue_listbox)
-        speaker_id = None
-        if self.speaker_group.isVisible() and self.speaker_combo.currentText():
-            speaker_id = self.speaker_combo.currentText()
-        self.synthesis_thread = SynthesisThread(
-            self.model_combo.currentData()["model_path"],
-            self.model_combo.currentData()["config_path"],
-            text,
-            speaker_id,
-            self.cuda_checkbox.isChecked()
-        )
-        self.synthesis_thread.finished.connect(self.on_synthesis_finished)
-        self.synthesis_thread.error.connect(self.on_synthesis_error)
-        self.synthesis_thread.start()
+            item = self.tts_queue[0]  # Don't pop yet
+        current_data = self.model_combo.currentData()
+        if not current_data:
+            return
+        self._current_item_id = item["id"]
         self._speaking = True
+        if self.stream_checkbox.isChecked():
+            # Streaming plays while synthesizing, so bypass the look-ahead renderer
+            self.pipeline.discard(item["id"])
+            self.synthesis_thread = SynthesisThread(
+                current_data["model_path"],
+                current_data["config_path"],
+                item["text"],
+                item["speaker_id"],
+                self.cuda_checkbox.isChecked(),
+                synth=self.synth,
+                synth_key=self.synth_key,
+                stream=True
+            )
+            self.synthesis_thread.played.connect(self.on_stream_finished)
+            self.synthesis_thread.error.connect(self.on_synthesis_error)
+            self.synthesis_thread.model_loaded.connect(self.on_worker_model_loaded)
+            self.synthesis_thread.timings.connect(self.on_synthesis_timings)
+            self.synthesis_thread.start()
+        else:
+            if not self.pipeline.contains(item["id"]):
+                self.submit_to_pipeline(item)
+            self.playback_thread = QueuePlaybackThread(self.pipeline, item["id"])
+            self.playback_thread.rendered.connect(self.on_item_rendered)
+            self.playback_thread.played.connect(self.on_item_played)
+            self.playback_thread.error.connect(self.on_synthesis_error)
+            self.playback_thread.play_error.connect(self.on_playback_error)
+            self.playback_thread.timings.connect(self.on_synthesis_timings)
+            self.playback_thread.start()
         QTimer.singleShot(0, lambda: self.speak_btn.setEnabled(False))
         QTimer.singleShot(0, self.update_queue_listbox)
 
-    def on_synthesis_finished(self, wav):
+    def on_worker_model_loaded(self, synth, model_key):
+        """Keep a synthesizer the queue worker had to load so later items reuse it."""
+        current_data = self.model_combo.currentData()
+        if not current_data:
+            return
+        if model_key == (current_data["model_path"], current_data["config_path"], self.cuda_checkbox.isChecked()):
+            self.synth = synth
+            self.synth_key = model_key
+            self.sample_rate = get_output_sample_rate(synth)
+
+    def on_synthesis_timings(self, load_time, synth_time, loaded):
+        """Show load vs synthesis time of the last queue item."""
+        if loaded:
+            self.status_label.setText(f"Model reloaded in {load_time:.2f}s, synthesized in {synth_time:.2f}s")
+        else:
+            self.status_label.setText(f"Synthesized in {synth_time:.2f}s (resident model)")
+
+    def on_item_rendered(self, wav, sample_rate):
+        """The head of the queue is rendered and about to play."""
         self.current_audio = wav
+        self.current_sample_rate = sample_rate
         self._speaking = False
         self._processing_audio = True
         QTimer.singleShot(0, lambda: self.speak_btn.setEnabled(True))
         QTimer.singleShot(0, lambda: self.save_btn.setEnabled(True))
         QTimer.singleShot(0, self.update_queue_listbox)
-        def play():
-            try:
-                play_audio(wav)
-            except Exception as e:
-                QTimer.singleShot(0, lambda: QMessageBox.warning(self, "Warning", f"Failed to play audio: {e}"))
-            self._processing_audio = False
-            # Now remove the first item and process the next
-            with self.queue_lock:
-                if self.tts_queue:
-                    self.tts_queue.popleft()
-            QTimer.singleShot(0, self.update_queue_listbox)
-            QTimer.singleShot(0, self.process_queue)
-        threading.Thread(target=play, daemon=True).start()
+
+    def on_item_played(self):
+        """Playback of the head of the queue finished: drop it and start the next one."""
+        self._processing_audio = False
+        self.finish_queue_item()
+
+    def on_playback_error(self, error_msg):
+        QMessageBox.warning(self, "Warning", f"Failed to play audio: {error_msg}")
+
+    def on_stream_finished(self, wav, sample_rate):
+        """Handle an item that was already played while it was synthesized."""
+        self.current_audio = wav
+        self.current_sample_rate = sample_rate
+        self._speaking = False
+        QTimer.singleShot(0, lambda: self.speak_btn.setEnabled(True))
+        QTimer.singleShot(0, lambda: self.save_btn.setEnabled(True))
+        self.finish_queue_item()
+
+    def finish_queue_item(self):
+        """Remove the entry that was just spoken (or failed) and process the next one."""
+        with self.queue_lock:
+            self.tts_queue = collections.deque(
+                item for item in self.tts_queue if item["id"] != self._current_item_id
+            )
+        self.pipeline.discard(self._current_item_id)
+        self._current_item_id = None
+        QTimer.singleShot(0, self.update_queue_listbox)
+        QTimer.singleShot(0, self.process_queue)
 
     def on_synthesis_error(self, error_msg):
         self._speaking = False
@@ -604,12 +1179,8 @@ class MainWindow(QMainWindow):
         else:
             QTimer.singleShot(0, lambda: QMessageBox.critical(self, "Error", f"Synthesis failed: {error_msg}"))
         
-        # Remove the first item from the queue (failed) only now
-        with self.queue_lock:
-            if self.tts_queue:
-                self.tts_queue.popleft()
-        QTimer.singleShot(0, self.update_queue_listbox)
-        QTimer.singleShot(0, self.process_queue)
+        # Remove the failed item from the queue only now
+        self.finish_queue_item()
             
     def save_wav_file(self):
         """Save audio to WAV file."""
@@ -625,7 +1196,7 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                save_wav(self.current_audio, 22050, file_path)
+                save_wav(self.current_audio, self.current_sample_rate, file_path, normalize=False)
                 QMessageBox.information(self, "Success", f"Audio saved to: {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save audio: {e}")
@@ -633,17 +1204,30 @@ class MainWindow(QMainWindow):
     def remove_selected_from_queue(self):
         """Remove selected item from queue."""
         current_row = self.queue_listbox.currentRow()
-        if current_row >= 0 and current_row < len(self.tts_queue):
+        with self.queue_lock:
+            if current_row < 0 or current_row >= len(self.tts_queue):
+                return
+            item = self.tts_queue[current_row]
+            if item["id"] == self._current_item_id:
+                # The entry being spoken is removed when playback finishes
+                return
             # Convert to list, remove item, convert back to deque
             queue_list = list(self.tts_queue)
             queue_list.pop(current_row)
             self.tts_queue = collections.deque(queue_list)
-            self.update_queue_listbox()
+        self.pipeline.discard(item["id"])
+        self.update_queue_listbox()
             
     def clear_queue(self):
         """Clear the entire queue."""
         with self.queue_lock:
-            self.tts_queue.clear()
+            removed = [item for item in self.tts_queue if item["id"] != self._current_item_id]
+            # The entry being spoken is removed when playback finishes
+            self.tts_queue = collections.deque(
+                item for item in self.tts_queue if item["id"] == self._current_item_id
+            )
+        for item in removed:
+            self.pipeline.discard(item["id"])
         self.update_queue_listbox()
         
     def on_phonemizer_change(self, text):
@@ -651,7 +1235,7 @@ class MainWindow(QMainWindow):
         try:
             # Set environment variable
             os.environ["TTS_BACKEND"] = text
-            print(f"Phonemizer set to: {text}")
+            log.info("Phonemizer set to: %s", text)
             
             # Update config file if model is loaded
             current_data = self.model_combo.currentData()
@@ -668,19 +1252,24 @@ class MainWindow(QMainWindow):
                         # Write the updated config back
                         with open(config_path, 'w', encoding='utf-8') as f:
                             json.dump(config, f, indent=4, ensure_ascii=False)
+                        # Our own write must not come back as a model change (that would
+                        # evict the synthesizer and load it a second time)
+                        if self.model_watcher is not None:
+                            self.model_watcher.ignore_write(config_path)
                         
-                        print(f"✓ Updated config file {config_path} to use {text} phonemizer")
+                        log.info("Updated config file %s to use %s phonemizer", config_path, text)
+                        self.resubmit_queue()
                         
                         # Reload the model to apply the new phonemizer
                         if self.synth is not None:
-                            print("Reloading model to apply new phonemizer...")
+                            log.info("Reloading model to apply new phonemizer...")
                             self.load_model()
                             
                     except Exception as e:
-                        print(f"Warning: Could not update config file: {e}")
+                        log.warning("Could not update config file: %s", e)
                         
         except Exception as e:
-            print(f"Error changing phonemizer: {e}")
+            log.error("Error changing phonemizer: %s", e)
         
     def set_hotkeys(self):
         """Open hotkey configuration dialog for a single hotkey."""
@@ -718,7 +1307,7 @@ class MainWindow(QMainWindow):
             if args.get("use_speaker_embedding", False) or args.get("num_speakers", 1) > 1:
                 is_multi_speaker = True
         except Exception as e:
-            print(f"Warning: Could not parse config for multi-speaker check: {e}")
+            log.warning("Could not parse config for multi-speaker check: %s", e)
         # Optional: Speaker mapping file
         speaker_file_path, _ = QFileDialog.getOpenFileName(
             self, "(Optional) Select Speaker Mapping File (e.g., speakers.pth)",
@@ -737,7 +1326,7 @@ class MainWindow(QMainWindow):
         model_name = model_name.replace(" ", "_")
         models_dir = get_models_directory()
         dest_folder = os.path.join(models_dir, "custom", model_name)
-        print(f"Importing custom model to: {dest_folder}")
+        log.info("Importing custom model to: %s", dest_folder)
         os.makedirs(dest_folder, exist_ok=True)
         dest_model = os.path.join(dest_folder, os.path.basename(model_path))
         dest_config = os.path.join(dest_folder, os.path.basename(config_path))
@@ -746,9 +1335,9 @@ class MainWindow(QMainWindow):
         if speaker_file_path:
             dest_speaker = os.path.join(dest_folder, "speakers.pth")
             shutil.copy2(speaker_file_path, dest_speaker)
-            print(f"✓ Imported speaker mapping file as: {dest_speaker}")
+            log.info("Imported speaker mapping file as: %s", dest_speaker)
         QMessageBox.information(self, "Success", f"Custom model imported as '{model_name}'.")
-        self.refresh_models()
+        self.on_models_changed({dest_folder})
 
     def eventFilter(self, obj, event):
         if obj == self.text_input and isinstance(event, QKeyEvent):
@@ -759,6 +1348,15 @@ class MainWindow(QMainWindow):
                     return True
         return super().eventFilter(obj, event)
 
+    def closeEvent(self, event):
+        """Stop background workers when the window closes."""
+        if self.model_watcher is not None:
+            self.model_watcher.stop()
+            self.model_watcher = None
+        self.pipeline.close()
+        stop_audio()
+        super().closeEvent(event)
+
     def register_global_hotkey(self, hotkey):
         """Register a global hotkey using the keyboard library, crash-free."""
         import keyboard
@@ -816,7 +1414,7 @@ class MainWindow(QMainWindow):
                 self.showMinimized()
                 self.is_minimized = True
         except Exception as e:
-            print(f"Error toggling window: {e}")
+            log.error("Error toggling window: %s", e)
             
     def _hotkey_speak(self):
         """Hotkey action for speaking text."""
@@ -866,8 +1464,8 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             dialog = OnlineModelDialog(self)
             if dialog.exec() == QDialog.DialogCode.Accepted:
-                # Refresh models after successful download
-                self.refresh_models()
+                # Pick up the downloaded model without resetting the loaded one
+                self.on_models_changed({get_models_directory()})
         
     def _hotkey_speak(self):
         """Hotkey action for speaking text."""
@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    """Empty models directory the app is pointed at through COCOSPEAK_MODELS_DIR."""
+    path = tmp_path / "models"
+    path.mkdir()
+    monkeypatch.setenv("COCOSPEAK_MODELS_DIR", str(path))
+    return path
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Model files parsed by describe_model() (i.e. not taken from the index)."""
+    from tts_module import model_manager
+    calls = []
+    describe = model_manager.describe_model
+
+    def counting(root, file):
+        calls.append(os.path.join(root, file))
+        return describe(root, file)
+
+    monkeypatch.setattr(model_manager, "describe_model", counting)
+    return calls
+
+def touch(path, offset=10 ** 9):
+    """Move a file's mtime forward explicitly, independent of the file system's timestamp resolution."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + offset))
+
+def write_model(folder, name="model.pth", model="vits", **model_args):
+    """Create a checkpoint file with a config next to it; returns the checkpoint path."""
+    folder.mkdir(parents=True, exist_ok=True)
+    config = {"model": model}
+    if model_args:
+        config["model_args"] = model_args
+    (folder / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    checkpoint = folder / name
+    checkpoint.write_bytes(b"weights")
+    return checkpoint
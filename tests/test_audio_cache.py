@@ -0,0 +1,74 @@
+import types
+import numpy as np
+import pytest
+
+pytest.importorskip("soundfile")
+pytest.importorskip("scipy")
+
+from tts_module.audio_cache import AudioCache
+from tts_module.synthesis import get_audio_cache_key
+from conftest import write_model, touch
+
+@pytest.fixture
+def synth(models_dir):
+    checkpoint = write_model(models_dir / "vits")
+    return types.SimpleNamespace(tts_checkpoint=str(checkpoint), tts_config_path=str(models_dir / "vits" / "config.json"),
+                                 output_sample_rate=22050)
+
+@pytest.fixture
+def cache(tmp_path):
+    return AudioCache(str(tmp_path / "audio"), memory_mb=1, disk_mb=1)
+
+def test_key_depends_on_text_speaker_and_settings(cache, synth):
+    key = get_audio_cache_key(cache, synth, "Hello  there.")
+    assert key == get_audio_cache_key(cache, synth, " Hello there. ")
+    assert key != get_audio_cache_key(cache, synth, "Hello there!")
+    assert key != get_audio_cache_key(cache, synth, "Hello there.", speaker_id="p225")
+    assert key != get_audio_cache_key(cache, synth, "Hello there.", pad_seconds=0.0)
+    assert key != get_audio_cache_key(cache, synth, "Hello there.", dsp=False)
+
+def test_key_changes_with_the_model_files(cache, synth):
+    key = get_audio_cache_key(cache, synth, "Hello")
+    touch(synth.tts_checkpoint)
+    model_changed = get_audio_cache_key(cache, synth, "Hello")
+    assert model_changed != key
+    touch(synth.tts_config_path)
+    assert get_audio_cache_key(cache, synth, "Hello") != model_changed
+
+def test_no_key_without_model_files(cache, synth):
+    assert get_audio_cache_key(cache, types.SimpleNamespace(output_sample_rate=22050), "Hello") is None
+    synth.tts_checkpoint += ".missing"
+    assert get_audio_cache_key(cache, synth, "Hello") is None
+
+def test_entries_come_back_from_memory_and_disk(tmp_path):
+    wav = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+    cache = AudioCache(str(tmp_path / "audio"), memory_mb=1, disk_mb=1)
+    cache.put("ab12", wav, 22050)
+    got, sample_rate = cache.get("ab12")
+    np.testing.assert_array_equal(got, wav)
+    assert sample_rate == 22050
+    assert cache.stats()["hits"]["memory"] == 1
+    # A new process only has the disk tier
+    fresh = AudioCache(str(tmp_path / "audio"), memory_mb=1, disk_mb=1)
+    got, _ = fresh.get("ab12")
+    np.testing.assert_allclose(got, wav, atol=1e-4)
+    assert fresh.stats()["hits"]["disk"] == 1
+    assert fresh.get("cd34") is None
+    assert fresh.stats()["misses"] == 1
+
+def test_returned_audio_is_a_copy(cache):
+    cache.put("ab12", np.zeros(10, dtype=np.float32), 22050)
+    got, _ = cache.get("ab12")
+    got[:] = 1.0
+    assert not cache.get("ab12")[0].any()
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path / "audio"), memory_mb=1, disk_mb=0)
+    quarter = np.zeros(1024 * 1024 // 16, dtype=np.float32)
+    for key in ("a1", "b2", "c3", "d4"):
+        cache.put(key, quarter, 22050)
+    cache.get("a1")
+    cache.put("e5", quarter, 22050)
+    assert cache.get("b2") is None
+    assert cache.get("a1") is not None
+    assert cache.stats()["memory_entries"] == 4
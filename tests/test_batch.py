@@ -0,0 +1,102 @@
+import os
+import json
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+pytest.importorskip("soundfile")
+
+from tts_module.batch import read_manifest, plan_batch
+from tts_module.model_manager import get_available_models
+from conftest import write_model
+
+def test_read_csv_manifest(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("ID,Text,Speaker\nintro, Hello there. ,p225\n,Second line,\n", encoding="utf-8-sig")
+    jobs = read_manifest(str(path))
+    assert [(job["id"], job["text"], job["speaker"], job["model"]) for job in jobs] == [
+        ("intro", "Hello there.", "p225", None),
+        ("line3", "Second line", None, None),
+    ]
+    assert [job["line"] for job in jobs] == [2, 3]
+
+def test_read_jsonl_manifest(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text(json.dumps({"text": "One", "output": "a/one.wav"}) + "\n\n" + json.dumps({"id": 7, "text": "Two"}) + "\n",
+                    encoding="utf-8")
+    jobs = read_manifest(str(path))
+    assert [(job["id"], job["text"], job["output"]) for job in jobs] == [("line1", "One", "a/one.wav"), ("7", "Two", None)]
+
+def test_invalid_jsonl_reports_the_line(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('{"text": "ok"}\n{broken\n', encoding="utf-8")
+    with pytest.raises(Exception, match="jobs.jsonl:2"):
+        read_manifest(str(path))
+
+@pytest.fixture
+def models(models_dir):
+    write_model(models_dir / "vits")
+    write_model(models_dir / "tacotron", model="tacotron2")
+    return get_available_models(use_index=False)
+
+def job(id, text="Hello", model=None, output=None):
+    return {"id": id, "text": text, "model": model, "speaker": None, "output": output, "line": 1}
+
+def test_plan_groups_jobs_by_model_in_manifest_order(models, tmp_path):
+    jobs = [job("a"), job("b", model="tacotron/model.pth"), job("c")]
+    groups, invalid = plan_batch(jobs, models, str(tmp_path), default_model="vits/model.pth")
+    assert invalid == []
+    assert {model_id: [j["id"] for j in group_jobs] for model_id, (_, group_jobs) in groups.items()} == {
+        "vits/model.pth": ["a", "c"],
+        "tacotron/model.pth": ["b"],
+    }
+    assert jobs[0]["output"] == os.path.join(str(tmp_path), "a.wav")
+
+def test_plan_default_model(models, tmp_path):
+    groups, _ = plan_batch([job("a")], models, str(tmp_path), default_model="tacotron/model.pth")
+    assert list(groups) == ["tacotron/model.pth"]
+    with pytest.raises(Exception, match="Unknown model"):
+        plan_batch([job("a")], models, str(tmp_path), default_model="missing")
+
+def test_plan_rejects_bad_jobs(models, tmp_path):
+    jobs = [job("empty", text=None), job("unknown", model="nope"), job("first", output="same.wav"),
+            job("second", output="same.wav")]
+    groups, invalid = plan_batch(jobs, models, str(tmp_path))
+    reasons = {j["id"]: reason for j, reason in invalid}
+    assert reasons["empty"] == "empty text"
+    assert reasons["unknown"].startswith("unknown model nope")
+    assert reasons["second"].startswith("duplicate output")
+    assert [j["id"] for _, group_jobs in groups.values() for j in group_jobs] == ["first"]
+
+def test_plan_without_models(tmp_path):
+    groups, invalid = plan_batch([job("a")], [], str(tmp_path))
+    assert groups == {}
+    assert invalid[0][1] == "unknown model (none available)"
+
+def test_failed_batch_renders_each_row_once(monkeypatch, tmp_path):
+    from tts_module import batch, batched
+
+    def failing_batch(synth, sentences, speaker_id=None):
+        raise RuntimeError("out of memory")
+
+    rendered = []
+
+    def render_one(synth, text, speaker_id=None, pad_seconds=None):
+        rendered.append(text)
+        if text == "bad":
+            raise ValueError("bad row")
+        return np.zeros(100, dtype=np.float32)
+
+    monkeypatch.setattr(batched, "supports_batching", lambda synth: True)
+    monkeypatch.setattr(batched, "split_sentences", lambda synth, text: [text])
+    monkeypatch.setattr(batched, "infer_batch", failing_batch)
+    monkeypatch.setattr(batched, "tts_to_wav", render_one)
+    monkeypatch.setattr(batch, "supports_batching", lambda synth: True)
+    monkeypatch.setattr(batch, "tts_to_wav", render_one)
+    monkeypatch.setattr(batch, "write_output", lambda wav, sample_rate, path: None)
+    model = {"display_name": "vits", "multi_speaker": False}
+    jobs = [job(name, text=name, output=str(tmp_path / f"{name}.wav")) for name in ("one", "bad", "three")]
+    results = []
+    batch.render_jobs(model, (object(), 22050, None), jobs, lambda j, result: results.append((j["id"], result["ok"])))
+    assert rendered == ["one", "bad", "three"]
+    assert results == [("one", True), ("bad", False), ("three", True)]
@@ -0,0 +1,44 @@
+import json
+import pytest
+from benchmarks.compare import compare, main
+
+def results(**metrics):
+    return {
+        "meta": {"git_commit": "abc1234", "timestamp": "2026-01-01T00:00:00"},
+        "metrics": {name: {"value": value, "unit": "s", "better": better} for name, (value, better) in metrics.items()},
+    }
+
+def test_lower_is_better_regression():
+    rows = compare(results(load=(1.0, "lower")), results(load=(1.2, "lower")))
+    assert rows == [("load", 1.0, 1.2, pytest.approx(0.2), True)]
+
+def test_change_within_threshold_is_not_a_regression():
+    rows = compare(results(load=(1.0, "lower")), results(load=(1.05, "lower")))
+    assert rows[0][4] is False
+
+def test_higher_is_better_metrics():
+    old = results(throughput=(100.0, "higher"))
+    assert compare(old, results(throughput=(80.0, "higher")))[0][4] is True
+    assert compare(old, results(throughput=(150.0, "higher")))[0][4] is False
+
+def test_improvement_is_not_a_regression():
+    assert compare(results(load=(1.0, "lower")), results(load=(0.5, "lower")))[0][4] is False
+
+def test_threshold_is_configurable():
+    old, new = results(load=(1.0, "lower")), results(load=(1.05, "lower"))
+    assert compare(old, new, threshold=0.01)[0][4] is True
+
+def test_only_shared_nonzero_metrics_are_compared():
+    old = results(a=(1.0, "lower"), b=(0.0, "lower"), only_old=(1.0, "lower"))
+    new = results(a=(1.0, "lower"), b=(5.0, "lower"), only_new=(1.0, "lower"))
+    assert [row[0] for row in compare(old, new)] == ["a"]
+
+def test_main_exit_status(tmp_path, capsys):
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps(results(load=(1.0, "lower"), only_old=(1.0, "lower"))), encoding="utf-8")
+    new.write_text(json.dumps(results(load=(2.0, "lower"))), encoding="utf-8")
+    assert main([str(old), str(new)]) == 1
+    output = capsys.readouterr().out
+    assert "REGRESSION" in output
+    assert "only_old" in output and "only in old" in output
+    assert main([str(old), str(new), "--threshold", "1.5"]) == 0
@@ -0,0 +1,41 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("safetensors")
+
+from tts_module.checkpoint import convert_to_safetensors, load_checkpoint_file, get_safetensors_path
+
+def save_checkpoint(path):
+    weight = torch.randn(4, 3)
+    state = {"encoder.weight": weight, "decoder.weight": weight, "bias": torch.zeros(3), "steps": 5}
+    torch.save({"model": state, "r": 2, "config": {"model": "tacotron2"}, "optimizer": {"exp_avg": torch.zeros(3)}}, path)
+    return state
+
+def test_round_trip_keeps_weights_and_json_entries(tmp_path):
+    source = tmp_path / "model.pth"
+    state = save_checkpoint(source)
+    output = convert_to_safetensors(str(source))
+    assert output == get_safetensors_path(str(source))
+    checkpoint = load_checkpoint_file(output)
+    assert set(checkpoint["model"]) == {"encoder.weight", "decoder.weight", "bias"}
+    for key in checkpoint["model"]:
+        assert torch.equal(checkpoint["model"][key], state[key])
+    # Tied weights are stored as separate tensors
+    assert checkpoint["model"]["encoder.weight"].data_ptr() != checkpoint["model"]["decoder.weight"].data_ptr()
+    assert checkpoint["r"] == 2
+    assert checkpoint["config"] == {"model": "tacotron2"}
+    assert "optimizer" not in checkpoint
+
+def test_existing_output_is_not_overwritten(tmp_path):
+    source = tmp_path / "model.pth"
+    save_checkpoint(source)
+    output = convert_to_safetensors(str(source))
+    with pytest.raises(Exception, match="already exists"):
+        convert_to_safetensors(str(source))
+    assert convert_to_safetensors(str(source), overwrite=True) == output
+
+def test_checkpoint_without_tensors_is_rejected(tmp_path):
+    source = tmp_path / "empty.pth"
+    torch.save({"model": {"steps": 1}}, source)
+    with pytest.raises(Exception, match="no tensors"):
+        convert_to_safetensors(str(source))
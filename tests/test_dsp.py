@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from tts_module.dsp import DSPChain
+
+SAMPLE_RATE = 22050
+
+def speech_like(seconds=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    wav = 0.4 * np.sin(2 * np.pi * 220 * t) + 0.1 * rng.standard_normal(len(t))
+    # DC offset the high-pass has to remove
+    return (wav + 0.2).astype(np.float32)
+
+def stream_blocks(chain, wav, block=1000):
+    stream = chain.stream()
+    return np.concatenate([stream.process(wav[i:i + block]) for i in range(0, len(wav), block)])
+
+def test_streamed_filtering_matches_whole_clip_filtering():
+    chain = DSPChain(SAMPLE_RATE, normalize=False, compress_threshold=None)
+    wav = speech_like()
+    np.testing.assert_allclose(stream_blocks(chain, wav), chain.process(wav), atol=1e-5)
+
+def test_streamed_filtering_matches_with_dc_blocker():
+    chain = DSPChain(SAMPLE_RATE, highpass_hz=None, normalize=False, compress_threshold=None)
+    wav = speech_like()
+    np.testing.assert_allclose(stream_blocks(chain, wav, block=333), chain.process(wav), atol=1e-5)
+
+def test_streamed_normalization_matches_when_the_first_block_holds_the_peak():
+    chain = DSPChain(SAMPLE_RATE, compress_threshold=None)
+    wav = speech_like()
+    wav[10] = 3.0
+    np.testing.assert_allclose(stream_blocks(chain, wav), chain.process(wav), atol=1e-5)
+
+def test_streamed_gain_never_increases():
+    chain = DSPChain(SAMPLE_RATE, compress_threshold=None)
+    stream = chain.stream()
+    loud = stream.process(speech_like(0.5) * 2)
+    quiet = stream.process(speech_like(0.5, seed=1) * 0.1)
+    # The quiet block keeps the loud block's gain instead of being boosted to full level
+    assert np.abs(quiet).max() < 0.2 * np.abs(loud).max()
+
+def test_whole_clip_is_normalized_to_the_target_peak():
+    chain = DSPChain(SAMPLE_RATE, compress_threshold=None)
+    out = chain.process(speech_like() * 0.05)
+    assert np.abs(out).max() == pytest.approx(chain.target_peak, rel=1e-4)
+    assert out.dtype == np.float32
+
+def test_high_pass_removes_dc():
+    chain = DSPChain(SAMPLE_RATE, normalize=False, compress_threshold=None)
+    out = chain.process(np.full(SAMPLE_RATE, 0.5, dtype=np.float32))
+    assert abs(out[-1000:].mean()) < 1e-3
+
+def test_compression_limits_peaks():
+    chain = DSPChain(SAMPLE_RATE, highpass_hz=None, dc_block=False, normalize=False)
+    out = chain.process(np.array([0.5, 0.9, -0.9, 2.0], dtype=np.float32))
+    np.testing.assert_allclose(out, [0.5, 0.75, -0.75, 1.0], atol=1e-6)
+
+def test_nan_samples_are_zeroed():
+    chain = DSPChain(SAMPLE_RATE, normalize=False)
+    out = chain.process(np.array([0.1, np.nan, 0.1], dtype=np.float32))
+    assert np.isfinite(out).all()
+
+def test_settings_cover_every_parameter():
+    assert DSPChain(SAMPLE_RATE).settings() != DSPChain(SAMPLE_RATE, target_peak=0.5).settings()
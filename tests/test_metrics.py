@@ -0,0 +1,89 @@
+import re
+import pytest
+from tts_module.metrics import Metrics, Histogram, SECONDS_BUCKETS
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.delenv("COCOSPEAK_METRICS", raising=False)
+    return Metrics()
+
+def parse(text):
+    """Sample lines of a Prometheus exposition as {series: value}."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            samples[series] = float(value)
+    return samples
+
+def test_stage_histograms_share_one_metric_with_a_stage_label(metrics):
+    metrics.observe("synthesis.tts", 0.02)
+    metrics.observe("synthesis.tts", 0.3)
+    metrics.observe("playback.play", 7.0)
+    text = metrics.to_prometheus()
+    assert text.count("# TYPE cocospeak_stage_seconds histogram") == 1
+    samples = parse(text)
+    assert samples['cocospeak_stage_seconds_bucket{stage="synthesis.tts",le="0.025"}'] == 1
+    assert samples['cocospeak_stage_seconds_bucket{stage="synthesis.tts",le="0.5"}'] == 2
+    assert samples['cocospeak_stage_seconds_bucket{stage="synthesis.tts",le="+Inf"}'] == 2
+    assert samples['cocospeak_stage_seconds_count{stage="synthesis.tts"}'] == 2
+    assert samples['cocospeak_stage_seconds_sum{stage="synthesis.tts"}'] == pytest.approx(0.32)
+    assert samples['cocospeak_stage_seconds_bucket{stage="playback.play",le="5"}'] == 0
+    assert samples['cocospeak_stage_seconds_bucket{stage="playback.play",le="10"}'] == 1
+
+def test_buckets_are_cumulative(metrics):
+    for value in (0.001, 0.004, 0.2, 100.0):
+        metrics.observe("queue.render", value)
+    samples = parse(metrics.to_prometheus())
+    counts = [samples[f'cocospeak_stage_seconds_bucket{{stage="queue.render",le="{bound:g}"}}'] for bound in SECONDS_BUCKETS]
+    assert counts == sorted(counts)
+    assert counts[-1] == 3
+    assert samples['cocospeak_stage_seconds_bucket{stage="queue.render",le="+Inf"}'] == 4
+
+def test_ratio_histograms_counters_and_gauges(metrics):
+    metrics.observe("synthesis.rtf", 0.3, unit="ratio")
+    metrics.increment("audio_cache.hits", 3)
+    text = metrics.to_prometheus(gauges={"server.busy_workers": 2})
+    assert "# TYPE cocospeak_synthesis_rtf histogram" in text
+    assert "# HELP cocospeak_synthesis_rtf Real-time factor" in text
+    samples = parse(text)
+    assert samples['cocospeak_synthesis_rtf_bucket{le="0.5"}'] == 1
+    assert samples["cocospeak_synthesis_rtf_count"] == 1
+    assert samples["cocospeak_audio_cache_hits_total"] == 3
+    assert samples["cocospeak_server_busy_workers"] == 2
+    assert "# TYPE cocospeak_audio_cache_hits_total counter" in text
+
+def test_metric_names_are_valid(metrics):
+    metrics.observe("synthesis.rtf", 1.0, unit="ratio")
+    metrics.increment("weird-name/with.chars")
+    for line in metrics.to_prometheus().splitlines():
+        name = line.split()[2] if line.startswith("#") else re.split(r"[{ ]", line)[0]
+        assert re.fullmatch(r"[a-zA-Z_][a-zA-Z0-9_]*", name), line
+
+def test_empty_metrics_export_only_gauges(metrics):
+    assert metrics.to_prometheus() == "\n"
+    assert parse(metrics.to_prometheus(gauges={"up": 1})) == {"cocospeak_up": 1}
+
+def test_suppressed_observations_are_ignored(metrics):
+    with metrics.suppressed():
+        metrics.observe("model.warmup", 1.0)
+        metrics.increment("synthesis.characters", 10)
+    metrics.observe("synthesis.tts", 1.0)
+    snapshot = metrics.snapshot()
+    assert list(snapshot["histograms"]) == ["synthesis.tts"]
+    assert snapshot["counters"] == {}
+
+def test_disabled_metrics_record_nothing(metrics, monkeypatch):
+    monkeypatch.setenv("COCOSPEAK_METRICS", "0")
+    metrics.observe("synthesis.tts", 1.0)
+    assert metrics.snapshot()["histograms"] == {}
+
+def test_histogram_snapshot_percentiles():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.observe(value / 100)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["min"] == 0.01 and snapshot["max"] == 1.0
+    assert snapshot["p50"] == pytest.approx(0.51)
+    assert snapshot["p99"] == pytest.approx(1.0)
@@ -0,0 +1,82 @@
+import os
+import json
+from tts_module import model_manager
+from conftest import write_model, touch
+
+def scan():
+    return model_manager.get_available_models(max_workers=2)
+
+def test_unchanged_models_come_from_the_index(models_dir, parses):
+    write_model(models_dir / "a")
+    write_model(models_dir / "b", model="tacotron2")
+    assert len(scan()) == 2
+    assert len(parses) == 2
+    assert os.path.exists(model_manager.get_model_index_path(str(models_dir)))
+    parses.clear()
+    models = scan()
+    assert len(models) == 2
+    assert parses == []
+
+def test_modified_checkpoint_is_parsed_again(models_dir, parses):
+    checkpoint = write_model(models_dir / "a")
+    write_model(models_dir / "b")
+    scan()
+    parses.clear()
+    touch(checkpoint, 10 ** 9)
+    scan()
+    assert parses == [str(checkpoint)]
+
+def test_modified_config_is_parsed_again(models_dir, parses):
+    checkpoint = write_model(models_dir / "a")
+    scan()
+    parses.clear()
+    config = models_dir / "a" / "config.json"
+    config.write_text(json.dumps({"model": "vits", "model_args": {"num_speakers": 4}}), encoding="utf-8")
+    touch(config, 10 ** 9)
+    models = scan()
+    assert parses == [str(checkpoint)]
+    assert models[0]["multi_speaker"]
+
+def test_new_file_in_the_folder_invalidates_its_entries(models_dir, parses):
+    checkpoint = write_model(models_dir / "a")
+    scan()
+    parses.clear()
+    (models_dir / "a" / "speakers.json").write_text("{}", encoding="utf-8")
+    touch(models_dir / "a", 10 ** 9)
+    scan()
+    assert parses == [str(checkpoint)]
+
+def test_removed_model_is_dropped_from_the_index(models_dir, parses):
+    checkpoint = write_model(models_dir / "a")
+    write_model(models_dir / "b")
+    scan()
+    checkpoint.unlink()
+    models = scan()
+    assert [m["folder"] for m in models] == ["b"]
+    index = model_manager.load_model_index(str(models_dir))
+    assert str(checkpoint) not in index["entries"]
+
+def test_stale_index_version_is_ignored(models_dir, parses):
+    write_model(models_dir / "a")
+    index_path = model_manager.get_model_index_path(str(models_dir))
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"version": model_manager.INDEX_VERSION - 1, "entries": {}}, f)
+    assert model_manager.load_model_index(str(models_dir))["entries"] == {}
+    scan()
+    assert len(parses) == 1
+
+def test_non_tts_models_are_indexed_but_not_listed(models_dir, parses):
+    write_model(models_dir / "vocoder", model="hifigan")
+    assert scan() == []
+    parses.clear()
+    assert scan() == []
+    assert parses == []
+
+def test_models_at_the_root_come_from_the_index(models_dir, parses):
+    write_model(models_dir)
+    write_model(models_dir / "a")
+    assert len(scan()) == 2
+    parses.clear()
+    assert len(scan()) == 2
+    assert parses == []
@@ -0,0 +1,75 @@
+import os
+import types
+from tts_module import model_manager, model_watcher
+from tts_module.model_watcher import ModelWatcher, is_ignored_name
+from conftest import write_model, touch
+
+def run_script(monkeypatch, directory, events, debounce=1.5, watcher=None):
+    """Run the watcher loop over scripted polls of (seconds elapsed, changed paths); returns the reported batches."""
+    clock = [0.0]
+    monkeypatch.setattr(model_watcher, "time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+    batches = []
+    watcher = watcher or ModelWatcher(str(directory), batches.append, debounce=debounce)
+    watcher.on_change = batches.append
+    script = iter(events)
+
+    def poll(timeout):
+        try:
+            elapsed, changed = next(script)
+        except StopIteration:
+            watcher._stop.set()
+            return set()
+        clock[0] += elapsed
+        return set(changed)
+
+    watcher._poll = poll
+    watcher._run()
+    return batches
+
+def test_events_are_batched_until_the_folder_is_quiet(monkeypatch, tmp_path):
+    events = [(0, {"a"}), (0.5, {"b"}), (0.5, set()), (1.0, set())]
+    assert run_script(monkeypatch, tmp_path, events) == [{"a", "b"}]
+
+def test_separate_bursts_are_reported_separately(monkeypatch, tmp_path):
+    events = [(0, {"a"}), (2.0, set()), (0, {"b"}), (2.0, set())]
+    assert run_script(monkeypatch, tmp_path, events) == [{"a"}, {"b"}]
+
+def test_own_writes_are_not_reported(monkeypatch, tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text("{}", encoding="utf-8")
+    watcher = ModelWatcher(str(tmp_path), None)
+    watcher.ignore_write(str(config))
+    assert run_script(monkeypatch, tmp_path, [(0, {str(config)}), (2.0, set())], watcher=watcher) == []
+    # A later change by someone else is reported again
+    config.write_text('{"phonemizer": "gruut"}', encoding="utf-8")
+    touch(config)
+    watcher._stop.clear()
+    assert run_script(monkeypatch, tmp_path, [(0, {str(config)}), (2.0, set())], watcher=watcher) == [{str(config)}]
+
+def test_ignored_names():
+    assert is_ignored_name("model_index.json")
+    assert is_ignored_name("speakers_index.json")
+    assert is_ignored_name("config.json.tmp")
+    assert is_ignored_name(".cache")
+    assert not is_ignored_name("config.json")
+    assert not is_ignored_name("model.pth")
+
+def test_snapshot_skips_caches_and_temporary_files(tmp_path):
+    checkpoint = write_model(tmp_path / "a")
+    (tmp_path / "a" / "config.json.tmp").write_text("", encoding="utf-8")
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / ".cache" / "model_index.json").write_text("{}", encoding="utf-8")
+    snapshot = model_watcher._snapshot(str(tmp_path))
+    assert set(snapshot) == {str(tmp_path / "a"), str(tmp_path / "a" / "config.json"), str(checkpoint)}
+
+def test_rescan_only_parses_changed_folders(models_dir, parses):
+    write_model(models_dir / "a")
+    checkpoint = write_model(models_dir / "b")
+    model_manager.get_available_models(max_workers=2)
+    parses.clear()
+    touch(checkpoint, 10 ** 9)
+    folders = model_manager.get_changed_folders([str(checkpoint)])
+    assert folders == [str(models_dir / "b")]
+    models = model_manager.rescan_model_folders(folders)
+    assert [m["folder"] for m in models] == ["b"]
+    assert parses == [str(checkpoint)]
@@ -0,0 +1,81 @@
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+pytest.importorskip("soundfile")
+pytest.importorskip("scipy.signal")
+
+from tts_module import audio
+from tts_module.audio import AudioOutputEngine
+
+def make_engine(sample_rate=1000, buffer_seconds=1):
+    engine = AudioOutputEngine(sample_rate, buffer_seconds=buffer_seconds, blocksize=100)
+    engine._ensure_stream = lambda: None  # Drive the callback by hand instead of a device
+    return engine
+
+def pull(engine, frames):
+    out = np.ones((frames, 1), dtype=np.float32)
+    engine._callback(out, frames, None, None)
+    return out[:, 0]
+
+def test_clips_play_back_to_back_across_the_ring_end():
+    engine = make_engine()
+    first = np.arange(800, dtype=np.float32)
+    engine.enqueue(first)
+    np.testing.assert_array_equal(pull(engine, 700), first[:700])
+    second = np.arange(800, 1400, dtype=np.float32)
+    marker = engine.enqueue(second)
+    assert marker == 1400
+    np.testing.assert_array_equal(pull(engine, 700), np.concatenate([first[700:], second]))
+    # Nothing queued: the callback outputs silence
+    np.testing.assert_array_equal(pull(engine, 50), np.zeros(50))
+
+def test_flush_drops_queued_audio():
+    engine = make_engine()
+    engine.enqueue(np.ones(500, dtype=np.float32))
+    pull(engine, 100)
+    generation = engine._generation
+    engine.flush()
+    assert engine._generation == generation + 1
+    assert engine.pending_seconds() == 0
+    np.testing.assert_array_equal(pull(engine, 100), np.zeros(100))
+    # Audio enqueued after the flush plays normally
+    engine.enqueue(np.full(10, 0.5, dtype=np.float32))
+    np.testing.assert_array_equal(pull(engine, 10), np.full(10, 0.5))
+
+def test_flush_stops_a_producer_waiting_for_room():
+    engine = make_engine(buffer_seconds=1)
+    engine.enqueue(np.ones(1000, dtype=np.float32))
+    done = threading.Event()
+
+    def produce():
+        engine.enqueue(np.ones(500, dtype=np.float32))
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    assert not done.wait(0.2)  # Ring buffer is full
+    engine.flush()
+    thread.join(5)
+    assert done.is_set()
+    assert engine.pending_seconds() == 0
+
+def test_clips_at_another_rate_are_resampled():
+    engine = make_engine(sample_rate=2000)
+    marker = engine.enqueue(np.zeros(500, dtype=np.float32), 1000)
+    assert marker == 1000
+
+@pytest.fixture
+def no_engine(monkeypatch):
+    monkeypatch.setattr(audio, "_engine", None)
+    monkeypatch.delenv("COCOSPEAK_DEVICE_RATE", raising=False)
+
+def test_engine_keeps_its_rate(no_engine):
+    engine = audio.get_output_engine(22050)
+    assert audio.get_output_engine(24000) is engine
+    assert engine.sample_rate == 22050
+
+def test_engine_opens_at_the_device_rate(no_engine, monkeypatch):
+    monkeypatch.setenv("COCOSPEAK_DEVICE_RATE", "48000")
+    assert audio.get_output_engine(22050).sample_rate == 48000
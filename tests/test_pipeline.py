@@ -0,0 +1,106 @@
+import time
+import threading
+import pytest
+from tts_module.pipeline import SynthesisPipeline
+
+class GatedRender:
+    """Render function that blocks each call until the test releases it."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Semaphore(0)
+
+    def __call__(self, value):
+        self.calls.append(value)
+        self.started.release()
+        assert self.release.acquire(timeout=5)
+        return value
+
+@pytest.fixture
+def pipelines():
+    created = []
+    yield created
+    for pipeline in created:
+        pipeline.close()
+
+def test_items_are_rendered_and_taken(pipelines):
+    pipeline = SynthesisPipeline(lambda text: text.upper(), depth=2)
+    pipelines.append(pipeline)
+    pipeline.submit(1, "one")
+    pipeline.submit(2, "two")
+    assert pipeline.take(2, timeout=5) == "TWO"
+    assert pipeline.take(1, timeout=5) == "ONE"
+    assert not pipeline.contains(1)
+
+def test_resubmission_supersedes_an_in_flight_render(pipelines):
+    render = GatedRender()
+    pipeline = SynthesisPipeline(render, depth=2)
+    pipelines.append(pipeline)
+    pipeline.submit(1, "old model")
+    assert render.started.acquire(timeout=5)
+    # The first render is still running when the item is resubmitted
+    pipeline.submit(1, "new model")
+    render.release.release()
+    assert render.started.acquire(timeout=5)
+    render.release.release()
+    assert pipeline.take(1, timeout=5) == "new model"
+    assert render.calls == ["old model", "new model"]
+
+def test_discarded_item_result_is_dropped(pipelines):
+    render = GatedRender()
+    pipeline = SynthesisPipeline(render, depth=2)
+    pipelines.append(pipeline)
+    pipeline.submit(1, "a")
+    assert render.started.acquire(timeout=5)
+    pipeline.discard(1)
+    render.release.release()
+    deadline = time.monotonic() + 5
+    while pipeline.is_busy() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not pipeline.is_ready(1)
+    with pytest.raises(KeyError):
+        pipeline.take(1, timeout=1)
+
+def test_render_errors_are_raised_by_take(pipelines):
+    def render(value):
+        raise ValueError(value)
+
+    pipeline = SynthesisPipeline(render, depth=1)
+    pipelines.append(pipeline)
+    pipeline.submit(1, "broken")
+    with pytest.raises(ValueError, match="broken"):
+        pipeline.take(1, timeout=5)
+
+def test_depth_zero_renders_only_on_demand(pipelines):
+    calls = []
+    pipeline = SynthesisPipeline(lambda value: calls.append(value) or value, depth=0)
+    pipelines.append(pipeline)
+    pipeline.submit(1, "a")
+    pipeline.submit(2, "b")
+    time.sleep(0.1)
+    assert calls == []
+    assert pipeline.take(2, timeout=5) == "b"
+    assert calls == ["b"]
+
+def test_is_busy_while_rendering(pipelines):
+    render = GatedRender()
+    pipeline = SynthesisPipeline(render, depth=1)
+    pipelines.append(pipeline)
+    assert not pipeline.is_busy()
+    pipeline.submit(1, "a")
+    assert render.started.acquire(timeout=5)
+    assert pipeline.is_busy()
+    render.release.release()
+    assert pipeline.take(1, timeout=5) == "a"
+    assert not pipeline.is_busy()
+
+def test_close_wakes_waiting_consumers(pipelines):
+    render = GatedRender()
+    pipeline = SynthesisPipeline(render, depth=1)
+    pipeline.submit(1, "a")
+    assert render.started.acquire(timeout=5)
+    threading.Timer(0.1, pipeline.close).start()
+    with pytest.raises(Exception, match="removed"):
+        pipeline.take(1, timeout=5)
+    render.release.release()
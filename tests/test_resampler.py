@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+pytest.importorskip("soundfile")
+signal = pytest.importorskip("scipy.signal")
+
+from tts_module.audio import PolyphaseResampler, get_resampler
+
+def tone(rate, seconds=0.5, freq=440.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+@pytest.mark.parametrize("src, dst", [(22050, 48000), (24000, 44100), (48000, 16000)])
+def test_matches_resample_poly(src, dst):
+    wav = tone(src)
+    resampler = PolyphaseResampler(src, dst)
+    expected = signal.resample_poly(wav, resampler.up, resampler.down)
+    out = resampler(wav)
+    assert out.dtype == np.float32
+    assert len(out) == len(expected)
+    np.testing.assert_allclose(out, expected, atol=1e-5)
+
+def test_ratio_is_reduced():
+    resampler = PolyphaseResampler(22050, 44100)
+    assert (resampler.up, resampler.down) == (2, 1)
+
+def test_output_length_follows_the_rate_ratio():
+    out = PolyphaseResampler(22050, 48000)(tone(22050, seconds=1.0))
+    assert len(out) == 48000
+
+def test_tone_keeps_its_frequency():
+    out = PolyphaseResampler(22050, 48000)(tone(22050, seconds=1.0, freq=1000.0))
+    spectrum = np.abs(np.fft.rfft(out))
+    assert np.argmax(spectrum) == pytest.approx(1000, abs=1)
+
+def test_empty_input():
+    assert len(PolyphaseResampler(22050, 48000)(np.zeros(0, dtype=np.float32))) == 0
+
+def test_resamplers_are_shared_per_rate_pair():
+    assert get_resampler(22050, 48000) is get_resampler(22050.0, 48000)
+    assert get_resampler(22050, 48000) is not get_resampler(24000, 48000)
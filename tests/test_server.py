@@ -0,0 +1,120 @@
+import json
+import threading
+import http.client
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+pytest.importorskip("soundfile")
+
+from http.server import ThreadingHTTPServer
+from tts_module import server
+from tts_module.audio import to_pcm16
+from conftest import write_model
+
+SAMPLE_RATE = 22050
+
+class FakeSynth:
+    output_sample_rate = SAMPLE_RATE
+
+def sentences(*values, error=None):
+    def chunks(synth, text, speaker=None):
+        for value in values:
+            yield np.full(100, value, dtype=np.float32)
+        if error is not None:
+            raise error
+    return chunks
+
+@pytest.fixture
+def service(models_dir, monkeypatch):
+    write_model(models_dir / "vits")
+    monkeypatch.setattr(server, "get_cached_model", lambda *args: FakeSynth())
+    monkeypatch.setattr(server, "warmup_enabled", lambda: False)
+    monkeypatch.setattr(server, "cached_tts_to_wav", lambda synth, text, speaker=None: np.zeros(SAMPLE_RATE, dtype=np.float32))
+    service = server.SynthesisService(workers=1, max_queue=0)
+    yield service
+    service.close()
+
+@pytest.fixture
+def client(service):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.SynthesisRequestHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=10)
+    yield connection
+    connection.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+def get(client, path):
+    client.request("GET", path)
+    response = client.getresponse()
+    return response, response.read()
+
+def test_request_limits(service):
+    with pytest.raises(server.RequestError) as error:
+        service.prepare("   ")
+    assert error.value.status == 400
+    with pytest.raises(server.RequestError) as error:
+        service.prepare("a" * (server.MAX_TEXT_LENGTH + 1))
+    assert error.value.status == 413
+    with pytest.raises(server.RequestError) as error:
+        service.prepare("Hello", model="missing")
+    assert error.value.status == 404
+    model_id, _, text, speaker = service.prepare(" Hello ")
+    assert (model_id, text, speaker) == ("vits/model.pth", "Hello", None)
+
+def test_full_queue_is_rejected(service):
+    release = threading.Event()
+    running = service.run_job(lambda: release.wait(5))
+    with pytest.raises(server.ServerBusy):
+        service.run_job(lambda: None)
+    release.set()
+    running.result(5)
+    assert service.stats()["rejected"] == 1
+    # The slot is free again
+    assert service.run_job(lambda: 42).result(5) == 42
+
+def test_stream_sends_one_chunk_per_sentence(client, monkeypatch):
+    monkeypatch.setattr(server, "tts_to_chunks", sentences(0.25, -0.5))
+    client.request("GET", "/stream?text=One.%20Two.&format=pcm")
+    response = client.getresponse()
+    assert response.status == 200
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert response.getheader("X-Sample-Rate") == str(SAMPLE_RATE)
+    pcm = [to_pcm16(np.full(100, value, dtype=np.float32)) for value in (0.25, -0.5)]
+    expected = b"".join(b"%X\r\n%s\r\n" % (len(data), data) for data in pcm) + b"0\r\n\r\n"
+    # Compare the chunked framing as it is on the wire
+    assert response.fp.read(len(expected)) == expected
+
+def test_wav_stream_starts_with_a_header(client, monkeypatch):
+    monkeypatch.setattr(server, "tts_to_chunks", sentences(0.25))
+    response, body = get(client, "/stream?text=One.")
+    assert response.getheader("Content-Type") == "audio/wav"
+    assert body[:4] == b"RIFF" and body[8:12] == b"WAVE"
+    assert len(body) == 44 + 200
+
+def test_error_before_the_first_sentence_is_an_error_status(client, monkeypatch):
+    monkeypatch.setattr(server, "tts_to_chunks", sentences(error=RuntimeError("model exploded")))
+    response, body = get(client, "/stream?text=One.&format=pcm")
+    assert response.status == 500
+    assert json.loads(body)["error"] == "model exploded"
+
+def test_error_after_the_headers_ends_the_stream(client, monkeypatch):
+    monkeypatch.setattr(server, "tts_to_chunks", sentences(0.25, error=RuntimeError("model exploded")))
+    response, body = get(client, "/stream?text=One.%20Two.&format=pcm")
+    assert response.status == 200
+    # The sentences rendered before the failure, then a properly terminated body
+    assert body == to_pcm16(np.full(100, 0.25, dtype=np.float32))
+
+def test_synthesize_returns_pcm(client):
+    response, body = get(client, "/synthesize?text=Hello&format=pcm")
+    assert response.status == 200
+    assert response.getheader("X-Sample-Rate") == str(SAMPLE_RATE)
+    assert len(body) == 2 * SAMPLE_RATE
+
+def test_unknown_path(client):
+    response, body = get(client, "/nope")
+    assert response.status == 404
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("soundfile")
+
+from tts_module.synthesis import call_tts, detect_speaker_argument, POSITIONAL
+
+class SpeakerNameSynth:
+    def __init__(self):
+        self.calls = []
+
+    def tts(self, text, speaker_name=None, language_name=None):
+        self.calls.append(("speaker_name", speaker_name))
+        return [0.0]
+
+class SpeakerIdxSynth:
+    def tts(self, text, speaker_idx=None):
+        return [0.0]
+
+class PositionalSynth:
+    def tts(self, text, speaker, /):
+        return [0.0]
+
+class KwargsSynth:
+    """Only accepts the speaker as 'speaker'; the signature does not say so."""
+    def __init__(self):
+        self.calls = []
+
+    def tts(self, text, **kwargs):
+        self.calls.append(sorted(kwargs))
+        if set(kwargs) != {"speaker"}:
+            raise TypeError(f"unexpected arguments {sorted(kwargs)}")
+        return [0.0]
+
+def test_detects_the_keyword_from_the_signature():
+    assert detect_speaker_argument(SpeakerNameSynth()) == "speaker_name"
+    assert detect_speaker_argument(SpeakerIdxSynth()) == "speaker_idx"
+    assert detect_speaker_argument(PositionalSynth()) == POSITIONAL
+    assert detect_speaker_argument(KwargsSynth()) is None
+
+def test_speaker_name_is_passed_as_a_string():
+    synth = SpeakerNameSynth()
+    call_tts(synth, "Hello", 7)
+    assert synth.calls == [("speaker_name", "7")]
+
+def test_without_a_speaker_tts_gets_only_the_text():
+    synth = SpeakerNameSynth()
+    call_tts(synth, "Hello")
+    assert synth.calls == [("speaker_name", None)]
+
+def test_unknown_convention_is_found_once_and_remembered():
+    synth = KwargsSynth()
+    call_tts(synth, "Hello", "p225")
+    tries = len(synth.calls)
+    assert synth.calls[-1] == ["speaker"]
+    call_tts(synth, "Again", "p225")
+    # The second call goes straight to the convention that worked
+    assert len(synth.calls) == tries + 1
+
+def test_all_conventions_failing_reports_every_attempt():
+    class Broken:
+        def tts(self, *args, **kwargs):
+            raise RuntimeError("no speakers")
+
+    with pytest.raises(Exception, match="speaker_name: no speakers.*positional: no speakers"):
+        call_tts(Broken(), "Hello", "p225")
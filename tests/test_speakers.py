@@ -0,0 +1,42 @@
+import os
+import pytest
+from tts_module import model_manager
+from conftest import write_model
+
+def scan():
+    return model_manager.get_available_models(max_workers=2)
+
+def test_speaker_index_does_not_touch_model_folders(models_dir, parses, monkeypatch):
+    folder = models_dir / "vctk"
+    checkpoint = write_model(folder, num_speakers=2, speakers_file="speakers.pth")
+    (folder / "speakers.pth").write_bytes(b"pickle")
+    model = scan()[0]
+    folder_mtime = os.stat(folder).st_mtime_ns
+    monkeypatch.setattr(model_manager, "read_speakers_file", lambda path: ["p225", "p226"])
+    assert model_manager.get_speakers_list(model) == ["p225", "p226"]
+    assert os.stat(folder).st_mtime_ns == folder_mtime
+    assert os.path.exists(model_manager.get_speakers_index_path())
+    parses.clear()
+    scan()
+    assert parses == []
+    # A new session reads the names from the index instead of the speakers file
+    model_manager._speakers_cache.clear()
+    monkeypatch.setattr(model_manager, "read_speakers_file", lambda path: pytest.fail("speakers file was read"))
+    assert model_manager.get_speakers_list(model) == ["p225", "p226"]
+    assert str(checkpoint) == model["model_path"]
+
+def test_single_speaker_models_have_no_speaker_list(models_dir):
+    write_model(models_dir / "vits")
+    assert model_manager.get_speakers_list(scan()[0]) is None
+
+def test_unreadable_speakers_file_falls_back_to_numeric_ids(models_dir, monkeypatch):
+    folder = models_dir / "multi"
+    write_model(folder, num_speakers=3, speakers_file="speakers.pth")
+    (folder / "speakers.pth").write_bytes(b"not a pickle")
+
+    def broken(path):
+        raise ValueError("bad pickle")
+
+    monkeypatch.setattr(model_manager, "read_speakers_file", broken)
+    model_manager._speakers_cache.clear()
+    assert model_manager.get_speakers_list(scan()[0]) == ["0", "1", "2"]
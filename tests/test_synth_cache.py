@@ -0,0 +1,123 @@
+import threading
+from tts_module.synth_cache import SynthesizerCache, estimate_synth_bytes
+
+MB = 1024 * 1024
+
+class FakeTensor:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+class FakeModel:
+    def __init__(self, nbytes):
+        self._params = [FakeTensor(nbytes)]
+
+    def parameters(self):
+        return iter(self._params)
+
+    def buffers(self):
+        return iter([])
+
+class FakeSynth:
+    def __init__(self, size_mb):
+        self.tts_model = FakeModel(int(size_mb * MB))
+
+def key(name, device="cpu"):
+    return (f"/models/{name}.pth", f"/models/{name}.json", device, None)
+
+def test_estimate_counts_parameters_and_buffers():
+    synth = FakeSynth(2)
+    synth.vocoder_model = FakeModel(MB)
+    assert estimate_synth_bytes(synth) == 3 * MB
+    assert estimate_synth_bytes(object()) == 0
+
+def test_get_marks_entry_most_recently_used():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=2)
+    a, b, c = FakeSynth(1), FakeSynth(1), FakeSynth(1)
+    cache.put(key("a"), a)
+    cache.put(key("b"), b)
+    assert cache.get(key("a")) is a
+    cache.put(key("c"), c)
+    # b was the least recently used once a was read
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) is a
+    assert cache.get(key("c")) is c
+
+def test_evicts_oldest_entries_over_the_memory_budget():
+    cache = SynthesizerCache(ram_budget_mb=10, vram_budget_mb=10, max_entries=10)
+    for name in "abc":
+        cache.put(key(name), FakeSynth(4))
+    assert cache.get(key("a")) is None
+    assert cache.get(key("b")) is not None
+    assert cache.get(key("c")) is not None
+    assert cache.stats()["usage_mb"]["cpu"] == 8
+
+def test_newest_entry_is_kept_even_when_it_alone_exceeds_the_budget():
+    cache = SynthesizerCache(ram_budget_mb=10, vram_budget_mb=10, max_entries=10)
+    cache.put(key("small"), FakeSynth(1))
+    big = FakeSynth(50)
+    cache.put(key("big"), big)
+    assert cache.get(key("big")) is big
+    assert cache.get(key("small")) is None
+
+def test_budgets_are_per_device():
+    cache = SynthesizerCache(ram_budget_mb=10, vram_budget_mb=10, max_entries=10)
+    cache.put(key("cpu"), FakeSynth(6))
+    cache.put(key("gpu", "cuda"), FakeSynth(6))
+    assert cache.get(key("cpu")) is not None
+    assert cache.get(key("gpu", "cuda")) is not None
+
+def test_get_or_load_loads_once_per_key():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=4)
+    calls = []
+    started = threading.Barrier(4)
+
+    def loader():
+        calls.append(1)
+        return FakeSynth(1)
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(cache.get_or_load(key("a"), loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+def test_fetch_reports_whether_the_loader_ran():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=4)
+    synth, loaded = cache.fetch(key("a"), lambda: FakeSynth(1))
+    assert loaded
+    assert cache.fetch(key("a"), lambda: FakeSynth(1)) == (synth, False)
+
+def test_failed_load_is_not_cached():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=4)
+    assert cache.get_or_load(key("a"), lambda: None) is None
+    assert cache.get(key("a")) is None
+
+def test_evict_model_drops_every_device():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=4)
+    cache.put(key("a"), FakeSynth(1))
+    cache.put(key("a", "cuda"), FakeSynth(1))
+    cache.put(key("b"), FakeSynth(1))
+    cache.evict_model("/models/a.pth")
+    assert [entry["model_path"] for entry in cache.stats()["entries"]] == [key("b")[0]]
+
+def test_evict_config_keeps_other_configs():
+    cache = SynthesizerCache(ram_budget_mb=100, vram_budget_mb=100, max_entries=4)
+    cache.put(key("a"), FakeSynth(1))
+    cache.put(("/models/a.pth", "/models/a.json", "cpu", "gruut"), FakeSynth(1))
+    cache.put(key("b"), FakeSynth(1))
+    cache.evict_config("/models/a.json")
+    assert [entry["model_path"] for entry in cache.stats()["entries"]] == [key("b")[0]]
@@ -0,0 +1,49 @@
+import threading
+import pytest
+
+pytest.importorskip("soundfile")
+
+from tts_module import synthesis
+
+class BlockingSynth:
+    """Synthesizer whose tts() waits until released."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = 0
+
+    def tts(self, text):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return [0.0] * 10
+
+def test_warm_up_holds_the_synthesizer_lock():
+    synth = BlockingSynth()
+    thread = threading.Thread(target=synthesis.warm_up, args=(synth,), kwargs={"speakers": [None]})
+    thread.start()
+    assert synth.started.wait(5)
+    lock = synthesis.get_synth_lock(synth)
+    assert not lock.acquire(blocking=False)
+    synth.release.set()
+    thread.join(5)
+    assert lock.acquire(blocking=False)
+    lock.release()
+    assert synthesis.is_warmed_up(synth)
+
+def test_concurrent_warm_ups_run_once():
+    synth = BlockingSynth()
+    threads = [threading.Thread(target=synthesis.warm_up, args=(synth,), kwargs={"speakers": [None], "texts": ("Hi.",)})
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert synth.started.wait(5)
+    synth.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert synth.calls == 1
+
+def test_each_synthesizer_has_its_own_lock():
+    a, b = BlockingSynth(), BlockingSynth()
+    assert synthesis.get_synth_lock(a) is synthesis.get_synth_lock(a)
+    assert synthesis.get_synth_lock(a) is not synthesis.get_synth_lock(b)
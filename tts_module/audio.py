@@ -2,50 +2,324 @@ import sounddevice as sd
 import soundfile as sf
 import numpy as np
 import os
+import math
+import struct
+import time
+import threading
+from tts_module.metrics import get_metrics
+from utils.log import get_logger
 
-def play_audio(wav, sample_rate=22050):
-    """Play audio using sounddevice."""
+log = get_logger(__name__)
+
+def get_device_rate():
+    """Fixed output device rate from COCOSPEAK_DEVICE_RATE, or None to open the device at the first clip's rate."""
     try:
-        # Ensure audio is in the correct format
-        if wav.dtype != np.float32:
-            wav = wav.astype(np.float32)
-        
-        # Normalize audio to prevent clipping
-        max_val = np.max(np.abs(wav))
-        if max_val > 0:
-            wav = wav / max_val * 0.8
+        rate = int(os.environ.get("COCOSPEAK_DEVICE_RATE", 0))
+    except ValueError:
+        return None
+    return rate if rate > 0 else None
+
+class PolyphaseResampler:
+    """Polyphase resampler between two fixed rates; the anti-aliasing filter is designed once."""
+
+    def __init__(self, src_rate, dst_rate):
+        from scipy import signal
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        g = math.gcd(src_rate, dst_rate)
+        self.up = dst_rate // g
+        self.down = src_rate // g
+        # Same design resample_poly() uses by default, computed only once per rate pair
+        max_rate = max(self.up, self.down)
+        self.taps = signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+
+    def __call__(self, wav):
+        from scipy import signal
+        wav = np.asarray(wav, dtype=np.float32)
+        if len(wav) == 0:
+            return wav
+        return signal.resample_poly(wav, self.up, self.down, window=self.taps).astype(np.float32, copy=False)
+
+_resamplers = {}
+_resamplers_lock = threading.Lock()
+
+def get_resampler(src_rate, dst_rate):
+    """Return the cached resampler for a (src, dst) rate pair."""
+    key = (int(src_rate), int(dst_rate))
+    with _resamplers_lock:
+        resampler = _resamplers.get(key)
+        if resampler is None:
+            resampler = _resamplers[key] = PolyphaseResampler(*key)
+        return resampler
+
+# Ring buffer length and callback block size of the output engine
+OUTPUT_BUFFER_SECONDS = 10
+OUTPUT_BLOCKSIZE = 512
+
+class AudioOutputEngine:
+    """Long-lived output stream fed from a ring buffer.
+
+    One sounddevice OutputStream stays open and its callback copies samples
+    out of a single-producer/single-consumer ring buffer, so clips enqueued
+    back to back play without gaps and the device is not reopened per clip.
+    The callback takes no locks: the producer only advances the write index
+    and the callback only advances the read index. flush() and stop() take
+    effect at the next callback, i.e. within one block. The stream keeps the
+    rate it was opened at; clips at other rates are resampled into it.
+    """
+
+    def __init__(self, sample_rate=22050, buffer_seconds=OUTPUT_BUFFER_SECONDS, blocksize=OUTPUT_BLOCKSIZE):
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self._capacity = int(sample_rate * buffer_seconds)
+        self._buffer = np.zeros(self._capacity, dtype=np.float32)
+        self._write = 0  # Total samples enqueued (advanced by the producer only)
+        self._read = 0  # Total samples played (advanced by the callback only)
+        self._skip_to = 0  # Set by flush(); the callback jumps its read index here
+        self._generation = 0
+        self._producer_lock = threading.Lock()
+        self._stream = None
+
+    def _ensure_stream(self):
+        if self._stream is None:
+            self._stream = sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype='float32',
+                                           blocksize=self.blocksize, callback=self._callback)
+            self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        read = max(self._read, self._skip_to)
+        n = min(frames, self._write - read)
+        if n > 0:
+            start = read % self._capacity
+            first = min(n, self._capacity - start)
+            outdata[:first, 0] = self._buffer[start:start + first]
+            if n > first:
+                outdata[first:n, 0] = self._buffer[:n - first]
+        else:
+            n = 0
+        outdata[n:, 0] = 0.0
+        self._read = read + n
+
+    def _block_seconds(self):
+        return self.blocksize / self.sample_rate
+
+    def resample(self, wav, sample_rate):
+        """Convert a clip at sample_rate to the engine's rate."""
+        wav = np.asarray(wav, dtype=np.float32).reshape(-1)
+        if sample_rate is None or int(sample_rate) == self.sample_rate:
+            return wav
+        return get_resampler(sample_rate, self.sample_rate)(wav)
+
+    def enqueue(self, wav, sample_rate=None):
+        """Append a clip after the audio already queued and return its end marker.
+
+        sample_rate is the clip's rate when it differs from the engine's.
+        Blocks while the ring buffer is full. Pass the marker to wait().
+        """
+        wav = self.resample(wav, sample_rate)
+        with self._producer_lock:
+            self._ensure_stream()
+            generation = self._generation
+            pos = 0
+            while pos < len(wav):
+                if self._generation != generation:
+                    break  # Flushed or stopped meanwhile, drop the rest of the clip
+                free = self._capacity - (self._write - max(self._read, self._skip_to))
+                if free <= 0:
+                    time.sleep(self._block_seconds())
+                    continue
+                n = min(free, len(wav) - pos)
+                start = self._write % self._capacity
+                first = min(n, self._capacity - start)
+                self._buffer[start:start + first] = wav[pos:pos + first]
+                if n > first:
+                    self._buffer[:n - first] = wav[pos + first:pos + n]
+                if self._generation != generation:
+                    break
+                # Publish the samples only after they are in the buffer
+                self._write += n
+                pos += n
+            return self._write
+
+    def wait(self, marker, timeout=None):
+        """Block until everything up to marker has been played (or flushed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while max(self._read, self._skip_to) < marker or self._read < self._skip_to:
+            if self._stream is None or not self._stream.active:
+                return False
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(self._block_seconds() / 2)
+        return True
+
+    def play(self, wav, lead_seconds=0.0, sample_rate=None):
+        """Enqueue a clip and wait until it has played.
+
+        With lead_seconds, return that long before the clip ends so the
+        caller can enqueue the next clip without a gap.
+        """
+        marker = self.enqueue(wav, sample_rate)
+        return self.wait(marker - int(lead_seconds * self.sample_rate))
+
+    def pending_seconds(self):
+        return max(0, self._write - max(self._read, self._skip_to)) / self.sample_rate
+
+    def flush(self):
+        """Drop queued audio that has not been played yet."""
+        self._generation += 1
+        self._skip_to = self._write
+
+    def stop(self):
+        """Silence output at the next block; the stream stays open for the next clip."""
+        self.flush()
+
+    def close(self):
+        self.flush()
+        with self._producer_lock:
+            if self._stream is not None:
+                try:
+                    self._stream.stop()
+                    self._stream.close()
+                except Exception as e:
+                    log.warning("Error closing output stream: %s", e)
+                self._stream = None
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_output_engine(sample_rate=22050):
+    """Return the process-wide output engine.
+
+    It is opened at COCOSPEAK_DEVICE_RATE, or else at sample_rate, and keeps
+    that rate: reopening it for a clip at another rate would cut off the
+    audio still queued (e.g. the tail of the previous clip), so such clips
+    are resampled to the engine's rate instead.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioOutputEngine(get_device_rate() or int(sample_rate))
+        return _engine
+
+def stop_audio():
+    """Stop whatever the output engine is playing."""
+    with _engine_lock:
+        if _engine is not None:
+            _engine.stop()
+
+def play_audio(wav, sample_rate=22050, lead_seconds=0.0, normalize=True):
+    """Play audio through the shared output engine and wait until it has played.
+
+    lead_seconds returns early by that much so a queued follow-up clip can be
+    enqueued while this one is still playing. Pass normalize=False for audio
+    that already went through the DSP chain.
+    """
+    metrics = get_metrics()
+    try:
+        with metrics.span("playback.prepare"):
+            # Ensure audio is in the correct format
+            wav = np.asarray(wav, dtype=np.float32)
+            
+            # Normalize audio to prevent clipping
+            if normalize:
+                max_val = np.max(np.abs(wav))
+                if max_val > 0:
+                    wav = wav / max_val * 0.8
+            
+            # Resample once if the device runs at another rate
+            engine = get_output_engine(sample_rate)
+            wav = engine.resample(wav, sample_rate)
         
         # Play the audio
-        sd.play(wav, sample_rate)
-        sd.wait()  # Wait for playback to finish
+        with metrics.span("playback.play"):
+            engine.play(wav, lead_seconds)
         
-        print("Audio playback completed")
+        log.debug("Audio playback completed")
         
     except Exception as e:
-        print(f"Audio playback failed: {e}")
+        log.error("Audio playback failed: %s", e)
         raise Exception(f"Audio playback failed: {e}")
 
-def save_wav(wav, sample_rate, file_path):
-    """Save audio to WAV file."""
+def play_stream(chunks, sample_rate=22050):
+    """Play audio chunks as they are produced, without gaps between them.
+
+    Enqueuing returns immediately while the ring buffer has room, so the
+    next chunk is synthesized while the previous one is playing. Returns the
+    concatenated audio that was played, at sample_rate.
+    """
+    engine = get_output_engine(sample_rate)
+    played = []
+    marker = None
+    start = time.perf_counter()
+    try:
+        for chunk in chunks:
+            chunk = np.clip(np.asarray(chunk, dtype=np.float32), -1.0, 1.0)
+            if not played:
+                first_audio = time.perf_counter() - start
+                get_metrics().observe("playback.first_audio", first_audio)
+                log.debug("Time to first audio: %.3fs", first_audio)
+            marker = engine.enqueue(chunk, sample_rate)
+            played.append(chunk)
+        if marker is not None:
+            engine.wait(marker)
+        log.debug("Streamed audio playback completed")
+    except Exception as e:
+        log.error("Streamed audio playback failed: %s", e)
+        raise Exception(f"Streamed audio playback failed: {e}")
+    if not played:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(played)
+
+def save_wav(wav, sample_rate, file_path, normalize=True, subtype=None):
+    """Save audio to WAV file (normalize=False for audio already post-processed).
+
+    file_path may also be a writable file-like object such as io.BytesIO.
+    """
     try:
         # Ensure audio is in the correct format
-        if wav.dtype != np.float32:
-            wav = wav.astype(np.float32)
+        wav = np.asarray(wav, dtype=np.float32)
         
         # Normalize audio to prevent clipping
-        max_val = np.max(np.abs(wav))
-        if max_val > 0:
-            wav = wav / max_val * 0.95
+        if normalize:
+            max_val = np.max(np.abs(wav))
+            if max_val > 0:
+                wav = wav / max_val * 0.95
         
         # Save the audio
-        sf.write(file_path, wav, sample_rate)
-        
-        print(f"Audio saved to: {file_path}")
+        if isinstance(file_path, (str, os.PathLike)):
+            sf.write(file_path, wav, sample_rate, subtype=subtype)
+            log.info("Audio saved to: %s", file_path)
+        else:
+            sf.write(file_path, wav, sample_rate, format='WAV', subtype=subtype or 'PCM_16')
         
     except Exception as e:
-        print(f"Failed to save audio: {e}")
+        log.error("Failed to save audio: %s", e)
         raise Exception(f"Failed to save audio: {e}")
 
+# Size written into the RIFF and data chunk headers of a stream whose length is not known yet
+WAV_STREAM_SIZE = 0xFFFFFFFF
+
+def wav_header(sample_rate, channels=1, bits_per_sample=16, data_size=None):
+    """RIFF/WAVE header for integer PCM audio.
+
+    With data_size None the chunk sizes are set to the maximum so the header
+    can be sent ahead of a stream of unknown length; players read the PCM
+    frames that follow until the stream ends.
+    """
+    block_align = channels * bits_per_sample // 8
+    if data_size is None:
+        riff_size = data_size = WAV_STREAM_SIZE
+    else:
+        riff_size = min(36 + data_size, WAV_STREAM_SIZE)
+    return (struct.pack('<4sI4s', b'RIFF', riff_size, b'WAVE') +
+            struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, channels, sample_rate,
+                        sample_rate * block_align, block_align, bits_per_sample) +
+            struct.pack('<4sI', b'data', data_size))
+
+def to_pcm16(wav):
+    """Convert float audio to raw little-endian 16-bit PCM bytes."""
+    return (np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
 def get_default_output_path():
     """Get default output path for saved audio files."""
     import datetime
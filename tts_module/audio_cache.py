@@ -0,0 +1,213 @@
+import os
+import json
+import hashlib
+import threading
+import collections
+import unicodedata
+import numpy as np
+import soundfile as sf
+from tts_module.model_manager import get_models_directory
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Memory tier and disk tier size caps (MB). Override with COCOSPEAK_AUDIO_CACHE_MB
+# and COCOSPEAK_AUDIO_CACHE_DISK_MB; COCOSPEAK_AUDIO_CACHE=0 disables the cache.
+DEFAULT_MEMORY_MB = 64
+DEFAULT_DISK_MB = 512
+# Bump when post-processing changes so previously cached audio is not reused
+POSTPROCESS_VERSION = 2
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def audio_cache_enabled():
+    return os.environ.get("COCOSPEAK_AUDIO_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+def get_audio_cache_directory():
+    # Hidden folder, so the model scan and the model watcher skip it
+    return os.path.join(get_models_directory(), ".cache", "audio")
+
+def normalize_text(text):
+    """Normalize text for cache lookups (Unicode form and whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def get_file_signature(path):
+    """Identify a file version by (absolute path, mtime_ns, size), or None if it is missing.
+
+    Cheap enough to call per synthesis, unlike hashing a checkpoint of
+    hundreds of MB; the model index uses the same signature.
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, st.st_mtime_ns, st.st_size]
+
+class AudioCache:
+    """Content-addressed cache of synthesized audio.
+
+    Keys are hashes of everything that determines the output (normalized
+    text, speaker, model and config file signatures, phonemizer,
+    post-processing settings). Recent entries live in an in-memory LRU; every entry is also
+    written as FLAC under ``directory``, and the least recently used files
+    are deleted once the folder exceeds its size cap.
+    """
+
+    def __init__(self, directory=None, memory_mb=None, disk_mb=None):
+        self.directory = directory or get_audio_cache_directory()
+        if memory_mb is None:
+            memory_mb = _env_int("COCOSPEAK_AUDIO_CACHE_MB", DEFAULT_MEMORY_MB)
+        if disk_mb is None:
+            disk_mb = _env_int("COCOSPEAK_AUDIO_CACHE_DISK_MB", DEFAULT_DISK_MB)
+        self.memory_budget = memory_mb * 1024 * 1024
+        self.disk_budget = disk_mb * 1024 * 1024
+        self._memory = collections.OrderedDict()  # key -> (wav, sample_rate)
+        self._memory_bytes = 0
+        self._disk_usage = None  # Scanned on first disk access
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, speaker_id, model_signature, phonemizer, settings):
+        payload = {
+            "text": normalize_text(text),
+            "speaker": None if speaker_id is None else str(speaker_id),
+            "model": model_signature,
+            "phonemizer": phonemizer,
+            "settings": settings,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".flac")
+
+    def get(self, key):
+        """Return (wav, sample_rate) for key or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry[0].copy(), entry[1]
+        path = self._path(key)
+        try:
+            wav, sample_rate = sf.read(path, dtype='float32')
+            # Mark as recently used for disk eviction
+            os.utime(path)
+        except Exception:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits["disk"] += 1
+            self._remember(key, wav, sample_rate)
+        return wav.copy(), sample_rate
+
+    def put(self, key, wav, sample_rate):
+        wav = np.asarray(wav, dtype=np.float32)
+        with self._lock:
+            self._remember(key, wav.copy(), sample_rate)
+        if self.disk_budget <= 0:
+            return
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sf.write(tmp_path, np.clip(wav, -1.0, 1.0), sample_rate, format='FLAC', subtype='PCM_24')
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            log.warning("Could not write audio cache entry %s: %s", path, e)
+            return
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = self._scan_disk_usage()
+            else:
+                self._disk_usage += size
+            if self._disk_usage > self.disk_budget:
+                self._trim_disk()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path, _, _ in self._disk_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_usage = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_mb": self._memory_bytes / (1024 * 1024),
+                "disk_mb": (self._disk_usage or 0) / (1024 * 1024),
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
+
+    def _remember(self, key, wav, sample_rate):
+        if wav.nbytes > self.memory_budget:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[0].nbytes
+        self._memory[key] = (wav, sample_rate)
+        self._memory_bytes += wav.nbytes
+        while self._memory_bytes > self.memory_budget and self._memory:
+            _, (old_wav, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= old_wav.nbytes
+
+    def _disk_files(self):
+        files = []
+        if not os.path.isdir(self.directory):
+            return files
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".flac"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((path, st.st_mtime, st.st_size))
+        return files
+
+    def _scan_disk_usage(self):
+        return sum(size for _, _, size in self._disk_files())
+
+    def _trim_disk(self):
+        # Delete least recently used files until 90% of the cap is left
+        target = self.disk_budget * 0.9
+        removed = 0
+        for path, _, size in sorted(self._disk_files(), key=lambda f: f[1]):
+            if self._disk_usage <= target:
+                break
+            try:
+                os.remove(path)
+                self._disk_usage -= size
+                removed += 1
+            except OSError:
+                pass
+        log.info("Audio cache trimmed: removed %d file(s), %.1f MB left", removed, self._disk_usage / (1024 * 1024))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_audio_cache():
+    """Return the process-wide audio cache, or None when it is disabled."""
+    global _cache
+    if not audio_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache()
+        return _cache
@@ -0,0 +1,32 @@
+import time
+import threading
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def import_backend():
+    """Import torch and the Coqui TTS synthesizer, the slow part of startup.
+
+    Meant to run on a background thread once the window is visible. Later
+    calls return the result of the first import.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            start = time.perf_counter()
+            import torch
+            from TTS.utils.synthesizer import Synthesizer
+            try:
+                cuda_available = torch.cuda.is_available()
+            except Exception as e:
+                log.warning("CUDA detection failed: %s", e)
+                cuda_available = False
+            _backend = {"cuda_available": cuda_available, "seconds": time.perf_counter() - start}
+            log.info("TTS backend imported in %.2fs (CUDA available: %s)", _backend["seconds"], cuda_available)
+        return _backend
+
+def backend_ready():
+    return _backend is not None
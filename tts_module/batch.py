@@ -0,0 +1,357 @@
+import os
+import csv
+import json
+import time
+from tts_module.model_manager import get_available_models, get_speakers_list, get_model_id, find_model
+from tts_module.synthesis import load_model, tts_to_wav, get_output_sample_rate
+from tts_module.audio import save_wav
+from tts_module.threads import configure_torch_threads
+from tts_module.batched import batched_tts_to_wavs, supports_batching, get_batch_size
+from utils.log import get_logger, setup_logging
+
+log = get_logger(__name__)
+
+MANIFEST_FIELDS = ("id", "text", "model", "speaker", "output")
+# A WAV file larger than its header has been written completely (outputs are renamed into place)
+WAV_HEADER_BYTES = 44
+# Failures listed individually at the end of a run
+MAX_LISTED_FAILURES = 20
+# Shared-pool runs a shard gets when worker crashes break the pool, before it is rendered alone
+MAX_SHARED_ATTEMPTS = 2
+
+def read_manifest(path):
+    """Read a CSV (with a header row) or JSONL manifest into a list of job dicts.
+
+    Each job has id, text, model, speaker and output; only text is required.
+    """
+    jobs = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = []
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append((line_number, json.loads(line)))
+                except ValueError as e:
+                    raise Exception(f"{path}:{line_number}: invalid JSON: {e}")
+        else:
+            reader = csv.DictReader(f)
+            rows = [(reader.line_num, row) for row in reader]
+    for line_number, row in rows:
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        job = {field: (str(row[field]).strip() if row.get(field) not in (None, "") else None) for field in MANIFEST_FIELDS}
+        job["line"] = line_number
+        if job["id"] is None:
+            job["id"] = f"line{line_number}"
+        jobs.append(job)
+    return jobs
+
+def is_finished(path):
+    try:
+        return os.path.getsize(path) > WAV_HEADER_BYTES
+    except OSError:
+        return False
+
+def plan_batch(jobs, models, output_dir, default_model=None):
+    """Resolve models and output paths; returns (groups, invalid).
+
+    groups maps model id -> (model entry, jobs) in manifest order, so each
+    model is loaded once. invalid lists (job, reason) for jobs that cannot run.
+    """
+    groups = {}
+    invalid = []
+    outputs = set()
+    fallback = find_model(default_model, models) if default_model else (models[0] if models else None)
+    if default_model and fallback is None:
+        raise Exception(f"Unknown model: {default_model}")
+    for job in jobs:
+        if not job["text"]:
+            invalid.append((job, "empty text"))
+            continue
+        model = find_model(job["model"], models) if job["model"] else fallback
+        if model is None:
+            invalid.append((job, f"unknown model {job['model'] or '(none available)'}"))
+            continue
+        output = job["output"] or f"{job['id']}.wav"
+        job["output"] = os.path.abspath(os.path.join(output_dir, output))
+        if job["output"] in outputs:
+            invalid.append((job, f"duplicate output {job['output']}"))
+            continue
+        outputs.add(job["output"])
+        model_id = get_model_id(model)
+        groups.setdefault(model_id, (model, []))[1].append(job)
+    return groups, invalid
+
+def write_output(wav, sample_rate, path):
+    """Write a 16-bit WAV atomically so an interrupted run never leaves a file that looks finished."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".part"
+    try:
+        with open(tmp_path, 'wb') as f:
+            save_wav(wav, sample_rate, f, normalize=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_group_model(model, use_cuda=False):
+    """Load a model for rendering; returns (synth, sample rate, default speaker) or None."""
+    load_start = time.perf_counter()
+    synth = load_model(model["model_path"], model["config_path"], use_cuda)
+    if synth is None:
+        return None
+    log.info("Loaded %s in %.2fs", model["display_name"], time.perf_counter() - load_start)
+    default_speaker = None
+    if model["multi_speaker"]:
+        speakers = get_speakers_list(model) or []
+        default_speaker = speakers[0] if speakers else None
+    return synth, get_output_sample_rate(synth), default_speaker
+
+def render_jobs(model, loaded, jobs, on_result):
+    """Render jobs with a model from load_group_model(); on_result(job, result) is called per job.
+
+    result has ok, chars, audio_seconds, seconds and error.
+    """
+    if loaded is None:
+        for job in jobs:
+            on_result(job, {"ok": False, "chars": 0, "audio_seconds": 0.0, "seconds": 0.0,
+                            "error": f"failed to load model {model['display_name']}"})
+        return
+    synth, sample_rate, default_speaker = loaded
+    batch_size = get_batch_size() if supports_batching(synth) else 1
+    # Consecutive rows with the same speaker are synthesized together
+    chunks = []
+    for job in jobs:
+        speaker = (job["speaker"] or default_speaker) if model["multi_speaker"] else None
+        if chunks and chunks[-1][0] == speaker and len(chunks[-1][1]) < batch_size:
+            chunks[-1][1].append(job)
+        else:
+            chunks.append((speaker, [job]))
+    for speaker, chunk in chunks:
+        wavs = None
+        start = time.perf_counter()
+        if len(chunk) > 1:
+            try:
+                wavs = batched_tts_to_wavs(synth, [job["text"] for job in chunk], speaker, batch_size=batch_size)
+            except Exception as e:
+                # Render one row at a time so a single bad row does not fail the others
+                log.warning("Batch of %d failed, rendering rows one at a time: %s", len(chunk), e)
+        share = (time.perf_counter() - start) / len(chunk) if wavs is not None else 0.0
+        for i, job in enumerate(chunk):
+            start = time.perf_counter()
+            try:
+                wav = wavs[i] if wavs is not None else tts_to_wav(synth, job["text"], speaker)
+                write_output(wav, sample_rate, job["output"])
+                result = {"ok": True, "chars": len(job["text"]), "audio_seconds": len(wav) / sample_rate, "error": None}
+            except Exception as e:
+                result = {"ok": False, "chars": 0, "audio_seconds": 0.0, "error": str(e)}
+            result["seconds"] = share + time.perf_counter() - start
+            on_result(job, result)
+
+def render_group(model, jobs, use_cuda=False, on_result=None):
+    """Load one model and render all of its jobs in this process."""
+    render_jobs(model, load_group_model(model, use_cuda), jobs, on_result)
+
+# Per-process state of a pool worker: the model it currently holds
+_worker_model = {"path": None, "loaded": None}
+
+def _init_worker(threads):
+    """Pool initializer: start logging and limit torch to this worker's share of the cores."""
+    setup_logging()
+    # Read by OpenMP/MKL when torch is first imported, and by load_model() in this process
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "COCOSPEAK_INFER_THREADS"):
+        os.environ[name] = str(threads)
+    try:
+        configure_torch_threads(threads)
+    except Exception as e:
+        log.warning("Could not set torch threads in worker: %s", e)
+
+def _render_shard(model, jobs, use_cuda):
+    """Pool task: render one shard, loading the model only when the worker does not hold it yet."""
+    if _worker_model["path"] != model["model_path"]:
+        # Drop the previous model first so a worker never holds two
+        _worker_model["path"] = _worker_model["loaded"] = None
+        _worker_model["loaded"] = load_group_model(model, use_cuda)
+        _worker_model["path"] = model["model_path"]
+    results = []
+    render_jobs(model, _worker_model["loaded"], jobs, lambda job, result: results.append((job, result)))
+    return results
+
+def get_default_threads(workers):
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+def make_shards(pending, workers, shard_size=None):
+    """Split each model's jobs into shards, keeping shards of one model together."""
+    shards = []
+    for model, todo in pending.values():
+        size = shard_size or max(1, min(32, -(-len(todo) // (workers * 4))))
+        shards.extend((model, todo[i:i + size]) for i in range(0, len(todo), size))
+    return shards
+
+def _failed_results(jobs, error):
+    return [(job, {"ok": False, "chars": 0, "audio_seconds": 0.0, "seconds": 0.0, "error": error}) for job in jobs]
+
+def _run_shards(pool, shards, indices, progress, use_cuda):
+    """Render shards[i] for i in indices on pool; returns the indices lost to a broken pool."""
+    from concurrent.futures import as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    futures = {}
+    broken = []
+    for i in indices:
+        model, jobs = shards[i]
+        try:
+            futures[pool.submit(_render_shard, model, jobs, use_cuda)] = i
+        except BrokenProcessPool:
+            broken.append(i)
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            results = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory) and took the pool down; this shard may not be the cause
+            broken.append(i)
+            continue
+        except Exception as e:
+            results = _failed_results(shards[i][1], f"worker failed: {e}")
+        for job, result in results:
+            progress.add(job, result)
+    return sorted(broken)
+
+def render_pool(pending, progress, workers, threads=None, use_cuda=False, shard_size=None):
+    """Render pending groups on a pool of worker processes, feeding results into progress.
+
+    When a worker process dies the whole pool breaks, so the unfinished shards
+    are resubmitted to a new pool. A shard caught in a broken pool twice is
+    rendered alone in its own process, where a crash can only be its own, and
+    only then marked as failed.
+    """
+    import multiprocessing
+    import concurrent.futures
+    threads = threads or get_default_threads(workers)
+    shards = make_shards(pending, workers, shard_size)
+    print(f"Rendering {len(shards)} shard(s) on {workers} worker process(es), {threads} torch thread(s) each")
+    # spawn: workers start clean (no forked torch state) and behave the same on every platform
+    context = multiprocessing.get_context("spawn")
+
+    def new_pool(size):
+        return concurrent.futures.ProcessPoolExecutor(max_workers=size, mp_context=context,
+                                                      initializer=_init_worker, initargs=(threads,))
+
+    breaks = [0] * len(shards)
+    todo = list(range(len(shards)))
+    pool = None
+    try:
+        while todo:
+            shared = [i for i in todo if breaks[i] < MAX_SHARED_ATTEMPTS]
+            isolated = [i for i in todo if breaks[i] >= MAX_SHARED_ATTEMPTS]
+            todo = []
+            if shared:
+                pool = new_pool(workers)
+                broken = _run_shards(pool, shards, shared, progress, use_cuda)
+                pool.shutdown()
+                pool = None
+                if broken:
+                    print(f"A worker process died, retrying {len(broken)} unfinished shard(s)")
+                for i in broken:
+                    breaks[i] += 1
+                todo.extend(broken)
+            for i in isolated:
+                pool = new_pool(1)
+                if _run_shards(pool, shards, [i], progress, use_cuda):
+                    for job, result in _failed_results(shards[i][1], "worker process crashed"):
+                        progress.add(job, result)
+                pool.shutdown()
+                pool = None
+    except KeyboardInterrupt:
+        print("Interrupted, stopping workers (finished outputs are kept)...")
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+class BatchProgress:
+    """Running totals and throughput for a batch run."""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.chars = 0
+        self.audio_seconds = 0.0
+        self.failures = []
+        self.start = time.perf_counter()
+
+    def add(self, job, result):
+        self.done += 1
+        if result["ok"]:
+            self.chars += result["chars"]
+            self.audio_seconds += result["audio_seconds"]
+            print(f"[{self.done}/{self.total}] {job['id']}: {result['audio_seconds']:.2f}s audio in {result['seconds']:.2f}s")
+        else:
+            self.failures.append((job, result["error"]))
+            print(f"[{self.done}/{self.total}] {job['id']}: FAILED: {result['error']}")
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.start
+        return {
+            "rendered": self.done - len(self.failures),
+            "failed": len(self.failures),
+            "seconds": elapsed,
+            "chars_per_second": self.chars / elapsed if elapsed > 0 else 0.0,
+            "audio_seconds_per_second": self.audio_seconds / elapsed if elapsed > 0 else 0.0,
+        }
+
+def run_batch(manifest_path, output_dir=None, default_model=None, use_cuda=False, overwrite=False,
+              workers=1, threads=None, shard_size=None):
+    """Render every job in a manifest, skipping outputs that already exist.
+
+    With workers > 1 the jobs are split into shards and rendered by that many
+    processes, each loading its model once and using ``threads`` torch
+    threads (default: the cores divided by the workers).
+
+    Relative output paths are resolved against output_dir (default: a
+    "<manifest name>_audio" folder next to the manifest). Returns a summary
+    dict; failures are listed in it as (id, error) pairs.
+    """
+    jobs = read_manifest(manifest_path)
+    if output_dir is None:
+        stem = os.path.splitext(os.path.basename(manifest_path))[0]
+        output_dir = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), f"{stem}_audio")
+    models = get_available_models()
+    groups, invalid = plan_batch(jobs, models, output_dir, default_model)
+    for job, reason in invalid:
+        print(f"Skipping {job['id']} (line {job['line']}): {reason}")
+
+    skipped = 0
+    pending = {}
+    for model_id, (model, group_jobs) in groups.items():
+        todo = [job for job in group_jobs if overwrite or not is_finished(job["output"])]
+        skipped += len(group_jobs) - len(todo)
+        if todo:
+            pending[model_id] = (model, todo)
+    total = sum(len(todo) for _, todo in pending.values())
+    print(f"Batch: {len(jobs)} item(s), {total} to render with {len(pending)} model(s), {skipped} already done")
+
+    progress = BatchProgress(total)
+    if workers > 1 and total > 1:
+        render_pool(pending, progress, workers, threads, use_cuda, shard_size)
+    else:
+        if threads:
+            _init_worker(threads)
+        for model_id, (model, todo) in pending.items():
+            render_group(model, todo, use_cuda, progress.add)
+
+    summary = progress.summary()
+    summary["skipped"] = skipped
+    summary["invalid"] = len(invalid)
+    summary["failures"] = [(job["id"], error) for job, error in progress.failures]
+    print(f"Batch finished: {summary['rendered']} rendered, {summary['failed']} failed, {skipped} skipped "
+          f"in {summary['seconds']:.1f}s ({summary['chars_per_second']:.1f} chars/s, "
+          f"{summary['audio_seconds_per_second']:.2f} audio-s/s)")
+    if progress.failures:
+        print("Failed items:")
+        for job, error in progress.failures[:MAX_LISTED_FAILURES]:
+            print(f"  {job['id']} (line {job['line']}): {error}")
+        if len(progress.failures) > MAX_LISTED_FAILURES:
+            print(f"  ... and {len(progress.failures) - MAX_LISTED_FAILURES} more")
+    return summary
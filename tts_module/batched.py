@@ -0,0 +1,119 @@
+import os
+import numpy as np
+from tts_module.synthesis import (split_sentences, tts_to_wav, postprocess_wav, get_output_sample_rate,
+                                  TAIL_SILENCE_SECONDS)
+
+# Sentences per forward pass; override with COCOSPEAK_BATCH_SIZE (1 disables batching)
+DEFAULT_BATCH_SIZE = 8
+# Silence Synthesizer.tts() appends after every sentence, kept so batched output matches it
+SENTENCE_GAP_SAMPLES = 10000
+
+class BatchingUnsupported(Exception):
+    """The model or request cannot go through the batched path."""
+
+def get_batch_size():
+    try:
+        return max(1, int(os.environ.get("COCOSPEAK_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+    except ValueError:
+        return DEFAULT_BATCH_SIZE
+
+def supports_batching(synth):
+    """True for end-to-end VITS models without a separate vocoder.
+
+    Mel-spectrogram models (GlowTTS, FastPitch, Tacotron) need a vocoder or
+    Griffin-Lim pass per item after the acoustic model, so they stay on the
+    one-text-at-a-time path.
+    """
+    model = getattr(synth, "tts_model", None)
+    if model is None or getattr(synth, "vocoder_model", None) is not None:
+        return False
+    return type(model).__name__ == "Vits" and hasattr(model, "tokenizer") and hasattr(model, "inference")
+
+def _speaker_ids(synth, speaker_id, batch_size, device):
+    """speaker_ids tensor for a batch, or None for single-speaker models."""
+    import torch
+    model = synth.tts_model
+    args = getattr(model, "args", None)
+    if getattr(args, "use_language_embedding", False) or getattr(args, "use_d_vector_file", False):
+        raise BatchingUnsupported("multilingual and d-vector models are not batched")
+    if getattr(model, "num_speakers", 0) <= 1 or not getattr(args, "use_speaker_embedding", False):
+        return None
+    if speaker_id is None:
+        raise BatchingUnsupported("multi-speaker model without a speaker")
+    name_to_id = getattr(getattr(model, "speaker_manager", None), "name_to_id", None) or {}
+    if speaker_id in name_to_id:
+        index = name_to_id[speaker_id]
+    elif str(speaker_id).isdigit():
+        index = int(speaker_id)
+    else:
+        raise BatchingUnsupported(f"unknown speaker {speaker_id}")
+    return torch.full((batch_size,), index, dtype=torch.long, device=device)
+
+def _trim_silence(synth, wav):
+    # Same trailing-silence trim Synthesizer.tts() applies when the config asks for it
+    audio = getattr(synth, "tts_config", None) and synth.tts_config.audio
+    try:
+        if audio and audio["do_trim_silence"]:
+            return wav[:synth.tts_model.ap.find_endpoint(wav)]
+    except Exception:
+        pass
+    return wav
+
+def infer_batch(synth, sentences, speaker_id=None):
+    """Run one padded VITS forward pass over sentences and return raw audio per sentence.
+
+    Each output is cut to the frame count the duration predictor gave that
+    sentence (y_mask), times the hop length.
+    """
+    import torch
+    model = synth.tts_model
+    ids = [np.asarray(model.tokenizer.text_to_ids(sentence), dtype=np.int64) for sentence in sentences]
+    if any(len(seq) == 0 for seq in ids):
+        raise BatchingUnsupported("a sentence has no symbols the model knows")
+    device = next(model.parameters()).device
+    x = torch.zeros((len(ids), max(len(seq) for seq in ids)), dtype=torch.long)
+    for i, seq in enumerate(ids):
+        x[i, :len(seq)] = torch.from_numpy(seq)
+    aux_input = {
+        "x_lengths": torch.tensor([len(seq) for seq in ids], dtype=torch.long, device=device),
+        "speaker_ids": _speaker_ids(synth, speaker_id, len(ids), device),
+        "d_vectors": None,
+        "language_ids": None,
+        "durations": None,
+    }
+    with torch.no_grad():
+        outputs = model.inference(x.to(device), aux_input=aux_input)
+    hop_length = synth.tts_config.audio["hop_length"]
+    frames = outputs["y_mask"].sum(dim=(1, 2)).long().tolist()
+    audio = outputs["model_outputs"].squeeze(1).float().cpu().numpy()
+    return [_trim_silence(synth, audio[i, :frames[i] * hop_length]) for i in range(len(ids))]
+
+def batched_tts_to_wavs(synth, texts, speaker_id=None, pad_seconds=TAIL_SILENCE_SECONDS, batch_size=None):
+    """tts_to_wav() for several texts, synthesizing their sentences in padded batches.
+
+    Sentences of all texts are sorted by length so each batch wastes little
+    padding, rendered batch_size at a time, then reassembled per text with
+    the usual sentence gaps and post-processing. Models that cannot be
+    batched go through tts_to_wav() per text. A batch that fails raises;
+    the caller decides how to render the texts instead (render_jobs() falls
+    back to one row at a time), so no text is synthesized twice here.
+    """
+    batch_size = batch_size or get_batch_size()
+    if batch_size <= 1 or not supports_batching(synth):
+        return [tts_to_wav(synth, text, speaker_id, pad_seconds) for text in texts]
+    sentences = []  # (text index, sentence)
+    for index, text in enumerate(texts):
+        sentences.extend((index, sentence) for sentence in split_sentences(synth, text))
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i][1]))
+    raw = [None] * len(sentences)
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        for i, wav in zip(chunk, infer_batch(synth, [sentences[i][1] for i in chunk], speaker_id)):
+            raw[i] = wav
+    gap = np.zeros(SENTENCE_GAP_SAMPLES, dtype=np.float32)
+    pieces = [[] for _ in texts]
+    for (index, _), wav in zip(sentences, raw):
+        pieces[index].extend((wav, gap))
+    sample_rate = get_output_sample_rate(synth)
+    return [postprocess_wav(np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32), sample_rate, pad_seconds)
+            for parts in pieces]
@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import importlib
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+SAFETENSORS_EXTENSION = ".safetensors"
+# Checkpoint formats convert_to_safetensors() reads
+CONVERTIBLE_EXTENSIONS = (".pth", ".pt", ".ckpt")
+# Metadata key holding the checkpoint's other JSON-serializable entries (e.g. Tacotron's "r", "config")
+EXTRAS_METADATA_KEY = "cocospeak.checkpoint"
+
+_original_load_fsspec = None
+
+def fast_loading_enabled():
+    """Memory-mapped checkpoint loading is on unless COCOSPEAK_FAST_LOAD=0."""
+    return os.environ.get("COCOSPEAK_FAST_LOAD", "1").lower() not in ("0", "false", "no", "off")
+
+def _import_safetensors(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise Exception("safetensors models need the safetensors package (pip install safetensors)")
+
+def load_safetensors_checkpoint(path):
+    """Read a .safetensors file into the {"model": state_dict} layout Coqui models expect.
+
+    The file is memory-mapped and each tensor is read straight from the mapping,
+    without first reading the whole file into a buffer. Entries other than the
+    weights that convert_to_safetensors() kept are restored alongside "model".
+    """
+    safetensors = _import_safetensors("safetensors")
+    with safetensors.safe_open(path, framework="pt", device="cpu") as f:
+        state = {key: f.get_tensor(key) for key in f.keys()}
+        metadata = f.metadata() or {}
+    checkpoint = json.loads(metadata[EXTRAS_METADATA_KEY]) if EXTRAS_METADATA_KEY in metadata else {}
+    checkpoint["model"] = state
+    return checkpoint
+
+def load_checkpoint_file(path, map_location="cpu", **kwargs):
+    """Load a checkpoint without copying the whole file into memory first.
+
+    .safetensors files are memory-mapped; other files go through
+    torch.load(mmap=True), so storages are paged in only when used (an
+    optimizer state that is never touched is never read). Falls back to a
+    plain torch.load() for torch < 2.1 and legacy (non-zip) checkpoints.
+    """
+    path = os.fspath(path)
+    if path.lower().endswith(SAFETENSORS_EXTENSION):
+        return load_safetensors_checkpoint(path)
+    import torch
+    try:
+        return torch.load(path, map_location=map_location, mmap=True, **kwargs)
+    except (TypeError, RuntimeError) as e:
+        log.debug("Memory-mapped load of %s not possible, reading it whole: %s", path, e)
+        return torch.load(path, map_location=map_location, **kwargs)
+
+def _fast_load_fsspec(path, map_location=None, cache=True, **kwargs):
+    # Same signature as TTS.utils.io.load_fsspec; remote (fsspec URL) paths keep the original
+    if isinstance(path, (str, os.PathLike)) and "://" not in os.fspath(path) and os.path.isfile(path):
+        return load_checkpoint_file(path, map_location, **kwargs)
+    return _original_load_fsspec(path, map_location=map_location, cache=cache, **kwargs)
+
+def _import_model_module(config_path):
+    # setup_model() imports the model class lazily; import it now so its load_fsspec gets patched
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            model_name = json.load(f).get("model")
+    except Exception:
+        return
+    if model_name:
+        try:
+            importlib.import_module(f"TTS.tts.models.{str(model_name).lower()}")
+        except ImportError:
+            pass
+
+def install_fast_loading(config_path=None):
+    """Route Coqui's checkpoint loading through load_checkpoint_file().
+
+    Coqui modules do `from TTS.utils.io import load_fsspec`, so every loaded
+    TTS module that still holds the original is patched; pass the model's
+    config so its model module is imported (and patched) first. Safe to call
+    before every load. Returns False when disabled.
+    """
+    global _original_load_fsspec
+    if not fast_loading_enabled():
+        return False
+    import TTS.utils.io as tts_io
+    if _original_load_fsspec is None:
+        _original_load_fsspec = tts_io.load_fsspec
+    if config_path:
+        _import_model_module(config_path)
+    for module in list(sys.modules.values()):
+        name = getattr(module, "__name__", None) or ""
+        if (name == "TTS" or name.startswith("TTS.")) and getattr(module, "load_fsspec", None) is _original_load_fsspec:
+            module.load_fsspec = _fast_load_fsspec
+    return True
+
+def get_safetensors_path(model_path):
+    return os.path.splitext(model_path)[0] + SAFETENSORS_EXTENSION
+
+def convert_to_safetensors(model_path, output_path=None, overwrite=False):
+    """Write the model weights of a .pth/.pt/.ckpt checkpoint as .safetensors; returns the output path.
+
+    The output goes next to the checkpoint with the same base name by default,
+    so it finds the same config. Other checkpoint entries that some models
+    read back when loading (Tacotron's reduction factor "r", "config", "step")
+    are kept as JSON in the file's metadata; optimizer and scaler state, which
+    are not JSON-serializable, are dropped.
+    """
+    import torch
+    safetensors_torch = _import_safetensors("safetensors.torch")
+    output_path = output_path or get_safetensors_path(model_path)
+    if os.path.exists(output_path) and not overwrite:
+        raise Exception(f"{output_path} already exists")
+    checkpoint = load_checkpoint_file(model_path)
+    state = checkpoint.get("model", checkpoint) if isinstance(checkpoint, dict) else None
+    if not isinstance(state, dict):
+        raise Exception(f"{model_path} does not contain a model state dict")
+    tensors = {}
+    skipped = []
+    storages = set()
+    for key, value in state.items():
+        if not isinstance(value, torch.Tensor):
+            skipped.append(key)
+            continue
+        value = value.detach().cpu().contiguous()
+        # safetensors refuses tensors that share memory (e.g. tied weights)
+        storage = value.untyped_storage().data_ptr()
+        if storage in storages:
+            value = value.clone()
+        storages.add(storage)
+        tensors[key] = value
+    if not tensors:
+        raise Exception(f"{model_path} has no tensors to convert")
+    if skipped:
+        log.info("Skipping %d non-tensor weight entries: %s", len(skipped), ", ".join(skipped[:5]))
+    extras = {}
+    dropped = []
+    if isinstance(checkpoint, dict) and "model" in checkpoint:
+        for key, value in checkpoint.items():
+            if key == "model":
+                continue
+            try:
+                json.dumps(value)
+                extras[key] = value
+            except (TypeError, ValueError):
+                dropped.append(key)
+    if dropped:
+        log.info("Dropping checkpoint entries not needed for inference: %s", ", ".join(dropped))
+    metadata = {"format": "pt", "source": os.path.basename(model_path), EXTRAS_METADATA_KEY: json.dumps(extras)}
+    tmp_path = output_path + ".part"
+    try:
+        safetensors_torch.save_file(tensors, tmp_path, metadata=metadata)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    log.info("Converted %s (%.1f MB) -> %s (%.1f MB)", model_path, os.path.getsize(model_path) / (1024 * 1024),
+             output_path, os.path.getsize(output_path) / (1024 * 1024))
+    return output_path
@@ -0,0 +1,150 @@
+import threading
+import numpy as np
+
+# Post-processing applied to every synthesized clip
+DEFAULT_HIGHPASS_HZ = 60.0
+DEFAULT_COMPRESS_THRESHOLD = 0.7
+DEFAULT_COMPRESS_RATIO = 4.0
+DEFAULT_TARGET_PEAK = 0.95
+# Pole of the one-pole DC blocker used when the high-pass is disabled
+DC_BLOCKER_POLE = 0.995
+
+class DSPChain:
+    """Fused post-processing: DC removal / high-pass, peak normalization, compression.
+
+    The filters are a single second-order-section cascade run in one
+    sosfilt pass; gain, compression and clipping then work in place on that
+    output, with one reused scratch buffer, and the clip's peak is computed
+    once and used to skip passes that would not change it. process() handles
+    a whole clip; stream() returns a DSPStream that processes consecutive
+    blocks with continuous filter state.
+    """
+
+    def __init__(self, sample_rate=22050, highpass_hz=DEFAULT_HIGHPASS_HZ, dc_block=True,
+                 compress_threshold=DEFAULT_COMPRESS_THRESHOLD, compress_ratio=DEFAULT_COMPRESS_RATIO,
+                 target_peak=DEFAULT_TARGET_PEAK, normalize=True):
+        self.sample_rate = sample_rate
+        self.highpass_hz = highpass_hz
+        self.dc_block = dc_block
+        self.compress_threshold = compress_threshold
+        self.compress_ratio = compress_ratio
+        self.target_peak = target_peak
+        self.normalize = normalize
+        self.sos = self._design_filter()
+        self._scratch = np.zeros(0, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def _design_filter(self):
+        from scipy import signal
+        sections = []
+        if self.highpass_hz:
+            # A high-pass also removes DC, no separate blocker needed
+            sections.append(signal.butter(2, self.highpass_hz, btype='highpass', fs=self.sample_rate, output='sos'))
+        elif self.dc_block:
+            sections.append(np.array([[1.0, -1.0, 0.0, 1.0, -DC_BLOCKER_POLE, 0.0]]))
+        if not sections:
+            return None
+        return np.vstack(sections).astype(np.float32)
+
+    def settings(self):
+        """Parameters that determine the output (used in audio cache keys)."""
+        return {
+            "sample_rate": self.sample_rate,
+            "highpass_hz": self.highpass_hz,
+            "dc_block": self.dc_block,
+            "compress_threshold": self.compress_threshold,
+            "compress_ratio": self.compress_ratio,
+            "target_peak": self.target_peak,
+            "normalize": self.normalize,
+        }
+
+    def _filter(self, wav, zi=None):
+        """Filter into a new float32 buffer (the only allocation per call); returns (buffer, zi)."""
+        from scipy import signal
+        if self.sos is None:
+            return np.array(wav, dtype=np.float32), zi
+        if zi is None:
+            return signal.sosfilt(self.sos, wav), None
+        return signal.sosfilt(self.sos, wav, zi=zi)
+
+    @staticmethod
+    def _peak(buf):
+        """max(|buf|), zeroing NaN/Inf samples first when there are any."""
+        if len(buf) == 0:
+            return 0.0
+        peak = float(max(buf.max(), -buf.min()))
+        if not np.isfinite(peak):
+            np.nan_to_num(buf, copy=False)
+            peak = float(max(buf.max(), -buf.min()))
+        return peak
+
+    def _shape(self, buf, gain, peak):
+        """Apply gain, compression and clipping to buf in place; peak is max(|buf|) before the gain.
+
+        Passes the peak shows to be no-ops (compression below the threshold,
+        clipping below full scale) are skipped.
+        """
+        peak *= gain
+        ratio = self.compress_ratio
+        threshold = self.compress_threshold
+        if threshold is not None and ratio and ratio > 1.0 and peak > threshold:
+            # With y = gain * x, the compressor output is y/r + clip(y - y/r, -c, c),
+            # c = threshold * (1 - 1/r): y below the threshold, threshold + (|y| - threshold) / r above it
+            if len(self._scratch) < len(buf):
+                self._scratch = np.empty(len(buf), dtype=np.float32)
+            scaled = self._scratch[:len(buf)]
+            np.multiply(buf, gain / ratio, out=scaled)
+            buf *= gain * (1.0 - 1.0 / ratio)
+            limit = threshold * (1.0 - 1.0 / ratio)
+            np.clip(buf, -limit, limit, out=buf)
+            buf += scaled
+            peak = threshold + (peak - threshold) / ratio
+        elif gain != 1.0:
+            buf *= gain
+        if peak > 1.0:
+            np.clip(buf, -1.0, 1.0, out=buf)
+        return buf
+
+    def process(self, wav):
+        """Process a complete clip and return a new float32 array."""
+        wav = np.asarray(wav, dtype=np.float32).reshape(-1)
+        buf, _ = self._filter(wav)
+        peak = self._peak(buf)
+        gain = self.target_peak / peak if self.normalize and peak > 0 else 1.0
+        with self._lock:
+            return self._shape(buf, gain, peak)
+
+    def stream(self):
+        return DSPStream(self)
+
+class DSPStream:
+    """Block-wise processing with filter state and a running peak carried across blocks."""
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.zi = np.zeros((len(chain.sos), 2), dtype=np.float32) if chain.sos is not None else None
+        self.peak = 0.0
+
+    def process(self, block):
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        buf, self.zi = self.chain._filter(block, self.zi)
+        peak = self.chain._peak(buf)
+        gain = 1.0
+        if self.chain.normalize:
+            # The gain only ever decreases, so earlier blocks stay consistent
+            self.peak = max(self.peak, peak)
+            if self.peak > 0:
+                gain = self.chain.target_peak / self.peak
+        with self.chain._lock:
+            return self.chain._shape(buf, gain, peak)
+
+_chains = {}
+_chains_lock = threading.Lock()
+
+def get_dsp_chain(sample_rate=22050):
+    """Return the shared default post-processing chain for a sample rate."""
+    with _chains_lock:
+        chain = _chains.get(sample_rate)
+        if chain is None:
+            chain = _chains[sample_rate] = DSPChain(sample_rate)
+        return chain
@@ -0,0 +1,237 @@
+import os
+import re
+import json
+import time
+import bisect
+import functools
+import threading
+import contextlib
+import collections
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Bucket upper bounds for stage durations (seconds) and for unitless ratios like the real-time factor
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RATIO_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0, 10.0)
+# Recent observations kept per histogram for percentiles
+SAMPLE_WINDOW = 2000
+
+# What each stage covers, shown in the stats panel and as Prometheus help text
+STAGES = {
+    "text.split": "Sentence segmentation inside the synthesizer",
+    "text.clean": "Text cleaners (numbers, abbreviations, symbols)",
+    "text.phonemize": "Phonemizer (gruut/espeak)",
+    "model.inference": "Acoustic model forward pass (includes the vocoder for VITS)",
+    "model.vocoder": "Separate vocoder model",
+    "synthesis.tts": "Whole Synthesizer.tts() call",
+    "synthesis.total": "tts_to_wav(): synthesis, padding and post-processing",
+    "synthesis.rtf": "Real-time factor (synthesis seconds per second of speech)",
+    "postprocess": "DSP chain (high-pass, normalization, compression)",
+    "playback.prepare": "Normalization and resampling before playback",
+    "playback.play": "Time spent in play_audio() waiting for the device",
+    "playback.first_audio": "Streamed playback: time until the first sentence was queued",
+    "queue.wait": "Queue item waiting before its render started",
+    "queue.render": "Rendering one queue item (model lookup and synthesis)",
+    "queue.take_wait": "Playback waiting for a queue item to finish rendering",
+    "model.warmup": "Throwaway syntheses run right after a model is loaded",
+    "gui.model_load": "Model load inside a Speak request",
+    "gui.synthesis": "Speak request: synthesis (and playback when streaming)",
+    "server.queue_wait": "HTTP request waiting for a synthesis worker",
+    "server.request": "HTTP synthesis request, end to end",
+}
+
+def metrics_enabled():
+    """Stage timing can be turned off with COCOSPEAK_METRICS=0."""
+    return os.environ.get("COCOSPEAK_METRICS", "1").lower() not in ("0", "false", "no", "off")
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent values for percentiles."""
+
+    def __init__(self, unit="seconds"):
+        self.unit = unit
+        self.buckets = SECONDS_BUCKETS if unit == "seconds" else RATIO_BUCKETS
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.samples = collections.deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.samples.append(value)
+
+    def snapshot(self):
+        ordered = sorted(self.samples)
+
+        def percentile(q):
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+class Metrics:
+    """Process-wide timing histograms and counters."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = collections.defaultdict(float)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.time()
+
+    def recording(self):
+        return metrics_enabled() and not getattr(self._local, "suppressed", False)
+
+    @contextlib.contextmanager
+    def suppressed(self):
+        """Ignore observations made on this thread inside the block (e.g. warm-up runs)."""
+        previous = getattr(self._local, "suppressed", False)
+        self._local.suppressed = True
+        try:
+            yield
+        finally:
+            self._local.suppressed = previous
+
+    def observe(self, name, value, unit="seconds"):
+        if not self.recording():
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(unit)
+            histogram.observe(float(value))
+
+    def increment(self, name, amount=1):
+        if not self.recording():
+            return
+        with self._lock:
+            self._counters[name] += amount
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time the enclosed block as one observation of stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name, fn):
+        """Wrap fn so every call is observed as stage name."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "uptime_seconds": time.time() - self.started,
+                "histograms": {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def dump(self, path):
+        """Write snapshot() as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        log.info("Metrics written to %s", path)
+
+    def to_prometheus(self, gauges=None):
+        """Prometheus text exposition (format 0.0.4) of all metrics, plus optional extra gauges."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        stages = [(name, h) for name, h in histograms if h.unit == "seconds"]
+        if stages:
+            lines += ["# HELP cocospeak_stage_seconds Duration of each synthesis and playback stage.",
+                      "# TYPE cocospeak_stage_seconds histogram"]
+            for name, histogram in stages:
+                lines += _histogram_lines("cocospeak_stage_seconds", histogram, f'stage="{name}"')
+        for name, histogram in histograms:
+            if histogram.unit == "seconds":
+                continue
+            metric = "cocospeak_" + _metric_name(name)
+            lines += [f"# HELP {metric} {STAGES.get(name, name)}", f"# TYPE {metric} histogram"]
+            lines += _histogram_lines(metric, histogram)
+        for name, value in counters:
+            metric = f"cocospeak_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        for name, value in sorted((gauges or {}).items()):
+            metric = "cocospeak_" + _metric_name(name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+def _histogram_lines(metric, histogram, labels=""):
+    prefix = labels + "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {histogram.sum:g}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+    return lines
+
+_metrics = Metrics()
+
+def get_metrics():
+    return _metrics
+
+def span(name):
+    return _metrics.span(name)
+
+def observe(name, value, unit="seconds"):
+    _metrics.observe(name, value, unit)
+
+def instrument_synthesizer(synth):
+    """Time the stages inside Synthesizer.tts() by wrapping the objects it calls.
+
+    Sentence splitting, text cleaning, phonemization, the model forward pass
+    and a separate vocoder (when there is one) each get their own stage.
+    """
+    if synth is None or not metrics_enabled() or getattr(synth, "_metrics_instrumented", False):
+        return synth
+
+    def wrap(obj, attr, stage):
+        fn = getattr(obj, attr, None) if obj is not None else None
+        if callable(fn):
+            setattr(obj, attr, _metrics.timed(stage, fn))
+
+    model = getattr(synth, "tts_model", None)
+    tokenizer = getattr(model, "tokenizer", None)
+    wrap(synth, "split_into_sentences", "text.split")
+    wrap(tokenizer, "text_cleaner", "text.clean")
+    wrap(getattr(tokenizer, "phonemizer", None), "phonemize", "text.phonemize")
+    wrap(model, "inference", "model.inference")
+    wrap(getattr(synth, "vocoder_model", None), "inference", "model.vocoder")
+    synth._metrics_instrumented = True
+    return synth
@@ -1,9 +1,16 @@
-from TTS.utils.manage import ModelManager
 import os
 import sys
 import json
+import time
+import concurrent.futures
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 def get_models_directory():
+    # COCOSPEAK_MODELS_DIR points the app (or a benchmark) at another models folder
+    if os.environ.get("COCOSPEAK_MODELS_DIR"):
+        return os.path.abspath(os.environ["COCOSPEAK_MODELS_DIR"])
     if getattr(sys, 'frozen', False):
         exe_dir = os.path.dirname(sys.executable)
         models_dir = os.path.join(exe_dir, 'models')
@@ -36,6 +43,12 @@ def get_model_type_from_config(config_path):
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
+        return get_model_type_from_config_data(config, config_path)
+    except Exception:
+        return 'Unknown'
+
+def get_model_type_from_config_data(config, config_path):
+    try:
         if 'model' in config:
             model_name = config['model'].lower()
             if 'vits' in model_name:
@@ -88,78 +101,364 @@ def is_tts_model_type(model_type):
         return False
     return any(t in model_type for t in tts_types)
 
-def get_available_models():
-    """Return a list of available TTS models with metadata."""
-    models = []
-    models_dir = get_models_directory()
-    if not os.path.exists(models_dir):
-        return models
-    model_file_patterns = [
-        '_model.pth', '_model.pt', '_model.ckpt', '_model.safetensors',
-        '.pth', '.pt', '.ckpt', '.safetensors'
-    ]
-    non_model_filenames = [
-        'speakers.pth', 'config.json', 'speakers.json', 'speakers.pkl',
-        'language_ids.json', 'language_ids.pth', 'd_vector_file.pth', 'd_vector_file.json'
-    ]
+# Persistent scan index stored in models/.cache. Entries are reused as long as
+# the model file, its folder and the files it was parsed from keep the same
+# mtime and size. Writing it into the models folder itself would change that
+# folder's mtime and invalidate the entries of models placed at its root.
+INDEX_FILENAME = "model_index.json"
+INDEX_VERSION = 2
+
+MODEL_FILE_PATTERNS = [
+    '_model.pth', '_model.pt', '_model.ckpt', '_model.safetensors',
+    '.pth', '.pt', '.ckpt', '.safetensors'
+]
+NON_MODEL_FILENAMES = [
+    'speakers.pth', 'config.json', 'speakers.json', 'speakers.pkl',
+    'language_ids.json', 'language_ids.pth', 'd_vector_file.pth', 'd_vector_file.json'
+]
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+def get_model_index_path(models_dir):
+    return os.path.join(models_dir, ".cache", INDEX_FILENAME)
+
+def load_model_index(models_dir):
+    """Load the on-disk scan index, returning an empty index if missing or stale."""
+    index_path = get_model_index_path(models_dir)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION and isinstance(index.get("entries"), dict):
+            return index
+    except Exception:
+        pass
+    return {"version": INDEX_VERSION, "entries": {}}
+
+def save_model_index(models_dir, index):
+    """Atomically write the scan index to models/.cache."""
+    index_path = get_model_index_path(models_dir)
+    tmp_path = index_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    except Exception as e:
+        log.warning("Could not write model index %s: %s", index_path, e)
+
+def is_model_candidate(file):
+    if file.lower() in NON_MODEL_FILENAMES:
+        return False
+    return any(file.endswith(pattern) for pattern in MODEL_FILE_PATTERNS)
+
+def iter_model_candidates(models_dir):
+    """Yield (folder, filename) for every file that looks like a model checkpoint."""
     for root, dirs, files in os.walk(models_dir):
+        # Skip hidden folders (caches, indexes)
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
         for file in files:
-            if file.lower() in non_model_filenames:
-                continue
-            if not any(file.endswith(pattern) for pattern in model_file_patterns):
-                continue
-            folder_path = root
-            model_name = file
-            base_name = model_name.replace("_model.pth", "").replace("_model.pt", "").replace("_model.ckpt", "").replace("_model.safetensors", "").replace(".pth", "").replace(".pt", "").replace(".ckpt", "").replace(".safetensors", "")
-            config_file = find_config_file(folder_path, base_name)
-            if config_file:
-                fix_phonemizer_config(config_file)
-                model_type = get_model_type_from_config(config_file)
-                if not is_tts_model_type(model_type):
-                    continue
-                folder = os.path.basename(folder_path)
-                parent_folder = os.path.basename(os.path.dirname(folder_path))
-                if folder.lower() == "vctk":
-                    display_name = f"VITS (VCTK) - Multi-Speaker"
-                elif folder.lower() == "vits":
-                    display_name = f"VITS (LJSpeech) - Single Speaker"
-                elif folder.lower() == "custom":
-                    display_name = f"Custom Model - {model_name}"
-                elif parent_folder.lower() == "custom":
-                    display_name = f"Custom Model - {folder} [{model_name}]"
-                else:
-                    display_name = f"{model_type} - {folder} [{model_name}]"
-                size_mb = get_model_size_mb(os.path.join(root, file))
-                size_str = f" [{size_mb:.1f} MB]" if size_mb else ""
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                args = config_data.get('model_args', {})
-                use_speaker_embedding = args.get('use_speaker_embedding', False)
-                num_speakers = args.get('num_speakers', 1)
-                speakers_file = args.get('speakers_file', None)
-                speakers_list = []
-                if speakers_file:
-                    speakers_path = os.path.join(os.path.dirname(config_file), speakers_file)
-                    if os.path.exists(speakers_path):
-                        try:
-                            import torch
-                            speakers_dict = torch.load(speakers_path, map_location='cpu')
-                            if isinstance(speakers_dict, dict):
-                                speakers_list = list(speakers_dict.keys())
-                            elif isinstance(speakers_dict, list):
-                                speakers_list = [str(i) for i in range(len(speakers_dict))]
-                        except Exception:
-                            pass
-                if not speakers_list and (use_speaker_embedding or num_speakers > 1):
-                    speakers_list = [str(i) for i in range(num_speakers)]
-                model_speakers = speakers_list if (use_speaker_embedding or num_speakers > 1) else None
-                models.append({
-                    "display_name": display_name + size_str,
-                    "model_path": os.path.join(root, file),
-                    "config_path": config_file,
-                    "model_type": model_type,
-                    "folder": folder,
-                    "description": f"{model_type} model in {folder_path} [{model_name}]{size_str}",
-                    "speakers_list": model_speakers
-                })
-    return models 
\ No newline at end of file
+            if is_model_candidate(file):
+                yield root, file
+
+def describe_model(root, file):
+    """Parse one candidate model file.
+
+    Returns (model entry or None if it is not a usable TTS model, list of
+    files the entry was derived from).
+    """
+    folder_path = root
+    model_name = file
+    base_name = model_name.replace("_model.pth", "").replace("_model.pt", "").replace("_model.ckpt", "").replace("_model.safetensors", "").replace(".pth", "").replace(".pt", "").replace(".ckpt", "").replace(".safetensors", "")
+    config_file = find_config_file(folder_path, base_name)
+    if not config_file:
+        return None, []
+    deps = [config_file]
+    fix_phonemizer_config(config_file)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config_data = json.load(f)
+    except Exception:
+        return None, deps
+    model_type = get_model_type_from_config_data(config_data, config_file)
+    if not is_tts_model_type(model_type):
+        return None, deps
+    folder = os.path.basename(folder_path)
+    parent_folder = os.path.basename(os.path.dirname(folder_path))
+    if folder.lower() == "vctk":
+        display_name = f"VITS (VCTK) - Multi-Speaker"
+    elif folder.lower() == "vits":
+        display_name = f"VITS (LJSpeech) - Single Speaker"
+    elif folder.lower() == "custom":
+        display_name = f"Custom Model - {model_name}"
+    elif parent_folder.lower() == "custom":
+        display_name = f"Custom Model - {folder} [{model_name}]"
+    else:
+        display_name = f"{model_type} - {folder} [{model_name}]"
+    size_mb = get_model_size_mb(os.path.join(root, file))
+    size_str = f" [{size_mb:.1f} MB]" if size_mb else ""
+    args = config_data.get('model_args', {})
+    use_speaker_embedding = args.get('use_speaker_embedding', False)
+    num_speakers = args.get('num_speakers', 1)
+    speakers_file = args.get('speakers_file', None)
+    speakers_path = os.path.join(os.path.dirname(config_file), speakers_file) if speakers_file else None
+    # Speaker names are resolved lazily by get_speakers_list() when the model is selected
+    return {
+        "display_name": display_name + size_str,
+        "model_path": os.path.join(root, file),
+        "config_path": config_file,
+        "model_type": model_type,
+        "folder": folder,
+        "description": f"{model_type} model in {folder_path} [{model_name}]{size_str}",
+        "multi_speaker": bool(use_speaker_embedding or num_speakers > 1),
+        "num_speakers": num_speakers,
+        "speakers_path": speakers_path
+    }, deps
+
+def get_model_signature(model_path, deps=(), dir_signatures=None):
+    """Signature used to decide whether an indexed entry is still valid."""
+    folder = os.path.dirname(model_path)
+    if dir_signatures is not None and folder in dir_signatures:
+        dir_sig = dir_signatures[folder]
+    else:
+        # Folder mtime changes when files are added or removed (e.g. a new config)
+        dir_sig = _stat_signature(folder)
+        if dir_signatures is not None:
+            dir_signatures[folder] = dir_sig
+    return {
+        "model": _stat_signature(model_path),
+        "dir": dir_sig[0] if dir_sig else None,
+        "deps": {dep: _stat_signature(dep) for dep in deps}
+    }
+
+def _index_entry_valid(indexed, model_path, dir_signatures):
+    if not isinstance(indexed, dict) or "signature" not in indexed:
+        return False
+    cached_sig = indexed["signature"]
+    current = get_model_signature(model_path, list(cached_sig.get("deps", {})), dir_signatures)
+    return current == cached_sig
+
+DEFAULT_SCAN_WORKERS = 8
+
+def get_scan_workers():
+    try:
+        return max(1, int(os.environ.get("COCOSPEAK_SCAN_WORKERS", DEFAULT_SCAN_WORKERS)))
+    except ValueError:
+        return DEFAULT_SCAN_WORKERS
+
+def _scan_candidate(root, file, dir_signatures):
+    entry, deps = describe_model(root, file)
+    return {
+        "signature": get_model_signature(os.path.join(root, file), deps, dir_signatures),
+        "model": entry
+    }
+
+def get_available_models(use_index=True, on_model=None, max_workers=None):
+    """Return a list of available TTS models with metadata.
+
+    With use_index, unchanged models are taken from the on-disk index in
+    models/.cache and only new or modified files are parsed again. Parsing
+    runs on a bounded thread pool; on_model(entry) is called from the calling
+    thread as each model is found, so callers can show results incrementally.
+    """
+    models_dir = get_models_directory()
+    if not os.path.exists(models_dir):
+        return []
+    start = time.perf_counter()
+    if use_index:
+        # Create models/.cache before folder signatures are taken, so that
+        # saving the index for the first time does not invalidate it
+        try:
+            os.makedirs(os.path.dirname(get_model_index_path(models_dir)), exist_ok=True)
+        except OSError:
+            pass
+    index = load_model_index(models_dir) if use_index else {"version": INDEX_VERSION, "entries": {}}
+    old_entries = index["entries"]
+    new_entries = {}
+    dir_signatures = {}
+    ordered_paths = []
+    futures = {}
+    parsed = 0
+
+    def record(model_path, indexed):
+        new_entries[model_path] = indexed
+        if indexed["model"] is not None and on_model is not None:
+            on_model(indexed["model"])
+
+    def drain(done):
+        for future in done:
+            record(futures.pop(future), future.result())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or get_scan_workers()) as pool:
+        for root, file in iter_model_candidates(models_dir):
+            model_path = os.path.join(root, file)
+            ordered_paths.append(model_path)
+            indexed = old_entries.get(model_path)
+            if use_index and _index_entry_valid(indexed, model_path, dir_signatures):
+                record(model_path, indexed)
+            else:
+                parsed += 1
+                futures[pool.submit(_scan_candidate, root, file, dir_signatures)] = model_path
+            # Report finished parses while the walk continues
+            if futures:
+                done, _ = concurrent.futures.wait(list(futures), timeout=0)
+                drain(done)
+        for future in concurrent.futures.as_completed(list(futures)):
+            drain([future])
+
+    models = [new_entries[path]["model"] for path in ordered_paths if new_entries[path]["model"] is not None]
+    if use_index and (parsed or set(new_entries) != set(old_entries)):
+        index["entries"] = new_entries
+        save_model_index(models_dir, index)
+    log.info("Model scan: %d models, %d parsed, %d from index in %.3fs",
+             len(models), parsed, len(new_entries) - parsed, time.perf_counter() - start)
+    return models
+
+def get_model_id(model, models_dir=None):
+    """Stable id for a model: its path relative to the models directory."""
+    models_dir = models_dir or get_models_directory()
+    return os.path.relpath(model["model_path"], models_dir).replace(os.sep, "/")
+
+def find_model(name, models):
+    """Find a model by id, display name or file path; None when there is no match."""
+    models_dir = get_models_directory()
+    path = os.path.abspath(name)
+    for model in models:
+        if name == get_model_id(model, models_dir) or name == model["display_name"] or path == os.path.abspath(model["model_path"]):
+            return model
+    return None
+
+def is_path_under(path, folder):
+    return path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
+
+def get_changed_folders(paths):
+    """Reduce changed file/folder paths to the minimal set of folders to rescan."""
+    models_dir = get_models_directory()
+    folders = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        # Deleted folders cannot be told apart from files, rescanning the parent covers both
+        folder = path if os.path.isdir(path) else os.path.dirname(path)
+        if is_path_under(folder, models_dir):
+            folders.add(folder)
+    return sorted(f for f in folders if not any(f != other and is_path_under(f, other) for other in folders))
+
+def rescan_model_folders(folders, use_index=True):
+    """Rescan only the given folders (recursively) and return the models found in them.
+
+    Index entries of those folders are refreshed; models elsewhere are left
+    untouched. Used to apply watcher events without a full scan.
+    """
+    models_dir = get_models_directory()
+    start = time.perf_counter()
+    index = load_model_index(models_dir) if use_index else {"version": INDEX_VERSION, "entries": {}}
+    entries = index["entries"]
+    dir_signatures = {}
+    models = []
+    found = set()
+    parsed = 0
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        for root, file in iter_model_candidates(folder):
+            model_path = os.path.join(root, file)
+            found.add(model_path)
+            indexed = entries.get(model_path)
+            if not (use_index and _index_entry_valid(indexed, model_path, dir_signatures)):
+                parsed += 1
+                indexed = _scan_candidate(root, file, dir_signatures)
+                entries[model_path] = indexed
+            if indexed["model"] is not None:
+                models.append(indexed["model"])
+    removed = [path for path in entries if path not in found and any(is_path_under(path, folder) for folder in folders)]
+    for path in removed:
+        del entries[path]
+    if use_index and (parsed or removed):
+        save_model_index(models_dir, index)
+    log.info("Model rescan of %d folder(s): %d models, %d parsed in %.3fs",
+             len(folders), len(models), parsed, time.perf_counter() - start)
+    return models
+
+# Index of speaker names per speakers file, so later sessions can list them
+# without unpickling the embedding table. It lives in models/.cache rather than
+# next to the speakers file: writing into a model folder would change the
+# folder signature and invalidate that folder's model index entries.
+SPEAKERS_INDEX_FILENAME = "speakers_index.json"
+
+_speakers_cache = {}
+
+def read_speakers_file(speakers_path):
+    """Unpickle a speakers file and return its speaker names."""
+    import torch
+    speakers_dict = torch.load(speakers_path, map_location='cpu')
+    if isinstance(speakers_dict, dict):
+        return [str(name) for name in speakers_dict.keys()]
+    if isinstance(speakers_dict, list):
+        return [str(i) for i in range(len(speakers_dict))]
+    return []
+
+def get_speakers_index_path():
+    return os.path.join(get_models_directory(), ".cache", SPEAKERS_INDEX_FILENAME)
+
+def _read_speakers_sidecar(speakers_path, signature):
+    sidecar_path = get_speakers_index_path()
+    try:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        entry = sidecar.get(os.path.abspath(speakers_path))
+        if entry and entry.get("signature") == signature:
+            return entry.get("speakers")
+    except Exception:
+        pass
+    return None
+
+def _write_speakers_sidecar(speakers_path, signature, speakers):
+    sidecar_path = get_speakers_index_path()
+    try:
+        sidecar = {}
+        if os.path.exists(sidecar_path):
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+        else:
+            os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+        sidecar[os.path.abspath(speakers_path)] = {"signature": signature, "speakers": speakers}
+        tmp_path = sidecar_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, sidecar_path)
+    except Exception as e:
+        log.warning("Could not write speakers index %s: %s", sidecar_path, e)
+
+def get_speakers_list(model):
+    """Return speaker names for a model entry, or None for single-speaker models.
+
+    Names come from the in-process cache, then from models/.cache/speakers_index.json,
+    and only then from unpickling the speakers file (which updates the
+    index); that can take seconds, so call it off the GUI thread. Models
+    without a readable speakers file fall back to numeric IDs.
+    """
+    if not model or not model.get("multi_speaker"):
+        return None
+    speakers_path = model.get("speakers_path")
+    signature = _stat_signature(speakers_path) if speakers_path else None
+    cache_key = (speakers_path or model.get("config_path"), tuple(signature) if signature else None)
+    if cache_key in _speakers_cache:
+        return list(_speakers_cache[cache_key])
+    speakers = []
+    if signature is not None:
+        speakers = _read_speakers_sidecar(speakers_path, signature)
+        if speakers is None:
+            try:
+                speakers = read_speakers_file(speakers_path)
+                _write_speakers_sidecar(speakers_path, signature, speakers)
+            except Exception as e:
+                log.warning("Failed to read speakers file %s: %s", speakers_path, e)
+                speakers = []
+    if not speakers:
+        speakers = [str(i) for i in range(model.get("num_speakers", 1))]
+    _speakers_cache[cache_key] = speakers
+    return list(speakers)
@@ -0,0 +1,258 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Seconds without further events before a batch of changes is reported, so a
+# model that is still being copied is only rescanned once (COCOSPEAK_WATCH_DEBOUNCE)
+DEFAULT_DEBOUNCE = 1.5
+# Seconds between directory snapshots when inotify is not available
+DEFAULT_POLL_INTERVAL = 3.0
+
+# Files written by the app itself; changes to them never affect the model list
+IGNORED_FILENAMES = {"model_index.json", "speakers_index.json"}
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def watcher_enabled():
+    """Model folder watching can be turned off with COCOSPEAK_WATCH_MODELS=0."""
+    return os.environ.get("COCOSPEAK_WATCH_MODELS", "1").lower() not in ("0", "false", "no", "off")
+
+def is_ignored_name(name):
+    return name in IGNORED_FILENAMES or name.endswith(".tmp") or name.startswith(".")
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+class _Inotify:
+    """Minimal recursive inotify wrapper (Linux only)."""
+
+    def __init__(self, root):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}  # watch descriptor -> directory
+        self.add_tree(root)
+
+    def add_tree(self, path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            self._add(root)
+
+    def _add(self, path):
+        import ctypes
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached")
+            return
+        self._paths[wd] = path
+
+    def read(self, timeout):
+        """Return changed paths, blocking up to timeout seconds."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; report every watched folder
+                changed.update(self._paths.values())
+                continue
+            folder = self._paths.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(folder)
+                continue
+            if not name or is_ignored_name(name):
+                continue
+            path = os.path.join(folder, name)
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Watch new folders (e.g. a dropped model folder) and pick up
+                # files that landed before the watch was added
+                self.add_tree(path)
+        return changed
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+def _snapshot(root):
+    """Map every relevant file and folder under root to (mtime_ns, size)."""
+    snapshot = {}
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in dirs + files:
+            if is_ignored_name(name):
+                continue
+            path = os.path.join(folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size if name in files else -1)
+    return snapshot
+
+class ModelWatcher:
+    """Watches the models directory and reports changed paths in batches.
+
+    Uses inotify on Linux and falls back to periodic snapshots elsewhere (or
+    when inotify is unavailable, or with COCOSPEAK_WATCH_BACKEND=poll).
+    on_change(paths) is called from the watcher thread with the set of files
+    and folders that were created, written, moved or deleted, once no further
+    events arrived for ``debounce`` seconds.
+    """
+
+    def __init__(self, directory, on_change, debounce=None, poll_interval=None):
+        self.directory = os.path.abspath(directory)
+        self.on_change = on_change
+        self.debounce = debounce if debounce is not None else _env_float("COCOSPEAK_WATCH_DEBOUNCE", DEFAULT_DEBOUNCE)
+        self.poll_interval = poll_interval if poll_interval is not None else DEFAULT_POLL_INTERVAL
+        self.backend = None
+        self._inotify = None
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._own_writes = {}  # path -> signature right after the app wrote it
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._open_backend()
+        self._thread = threading.Thread(target=self._run, name="ModelWatcher", daemon=True)
+        self._thread.start()
+        log.info("Watching %s for model changes (%s)", self.directory, self.backend)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def ignore_write(self, path):
+        """Do not report the app's own write to path; later changes to it are reported again.
+
+        Call after the file was written and closed.
+        """
+        path = os.path.abspath(path)
+        signature = _file_signature(path)
+        if signature is None:
+            return
+        with self._lock:
+            self._own_writes[path] = signature
+
+    def _drop_own_writes(self, paths):
+        with self._lock:
+            if not self._own_writes:
+                return paths
+            kept = set()
+            for path in paths:
+                signature = self._own_writes.get(path)
+                if signature is not None and _file_signature(path) == signature:
+                    continue
+                self._own_writes.pop(path, None)
+                kept.add(path)
+            return kept
+
+    def _open_backend(self):
+        forced = os.environ.get("COCOSPEAK_WATCH_BACKEND", "").lower()
+        if forced != "poll" and sys.platform.startswith("linux") and os.path.isdir(self.directory):
+            try:
+                self._inotify = _Inotify(self.directory)
+                self.backend = "inotify"
+                return
+            except Exception as e:
+                log.info("inotify unavailable, polling model folder instead: %s", e)
+        self._snapshot = _snapshot(self.directory) if os.path.isdir(self.directory) else {}
+        self.backend = "poll"
+
+    def _poll(self, timeout):
+        if self._inotify is not None:
+            return self._inotify.read(timeout)
+        if self._stop.wait(timeout):
+            return set()
+        current = _snapshot(self.directory) if os.path.isdir(self.directory) else {}
+        previous = self._snapshot
+        self._snapshot = current
+        return {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+
+    def _run(self):
+        pending = set()
+        last_event = 0.0
+        while not self._stop.is_set():
+            if pending:
+                timeout = max(0.05, last_event + self.debounce - time.monotonic())
+            else:
+                timeout = self.poll_interval if self._inotify is None else 1.0
+            try:
+                changed = self._poll(timeout)
+            except Exception as e:
+                log.error("Model watcher error: %s", e)
+                changed = set()
+                self._stop.wait(self.poll_interval)
+            if changed:
+                pending.update(changed)
+                last_event = time.monotonic()
+            elif pending and time.monotonic() - last_event >= self.debounce:
+                batch, pending = self._drop_own_writes(pending), set()
+                if not batch:
+                    continue
+                try:
+                    self.on_change(batch)
+                except Exception as e:
+                    log.error("Model watcher callback failed: %s", e)
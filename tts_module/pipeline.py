@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+import collections
+from tts_module.metrics import get_metrics
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Number of upcoming queue items rendered ahead of playback (COCOSPEAK_LOOKAHEAD)
+DEFAULT_LOOKAHEAD = 2
+
+def get_default_lookahead():
+    try:
+        return max(0, int(os.environ.get("COCOSPEAK_LOOKAHEAD", DEFAULT_LOOKAHEAD)))
+    except ValueError:
+        return DEFAULT_LOOKAHEAD
+
+class SynthesisPipeline:
+    """Pre-renders upcoming queue items on a background worker.
+
+    Items are rendered in submission order into a bounded buffer: at most
+    ``depth`` finished waveforms wait for playback at any time. An item that
+    a consumer is waiting for in take() is always rendered next, so a depth
+    of 0 degrades to rendering on demand.
+    """
+
+    def __init__(self, render, depth=DEFAULT_LOOKAHEAD):
+        self.render = render
+        self.depth = max(0, depth)
+        self._pending = collections.OrderedDict()  # item_id -> (token, args, submit time)
+        self._ready = {}  # item_id -> (ok, result)
+        self._tokens = {}  # item_id -> token of its latest submission
+        self._next_token = 0
+        self._wanted = set()
+        self._rendering = None  # item_id the worker is rendering right now
+        self._closed = False
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, item_id, *args):
+        """Queue an item for rendering; args are passed to the render function.
+
+        Resubmitting an item (e.g. after a model change) supersedes any render
+        of it that is still in flight.
+        """
+        with self._cond:
+            self._next_token += 1
+            self._tokens[item_id] = self._next_token
+            self._ready.pop(item_id, None)
+            self._pending[item_id] = (self._next_token, args, time.perf_counter())
+            self._cond.notify_all()
+
+    def contains(self, item_id):
+        with self._cond:
+            return item_id in self._tokens
+
+    def is_ready(self, item_id):
+        with self._cond:
+            return item_id in self._ready
+
+    def is_busy(self):
+        """True while items are waiting to be rendered or one is being rendered."""
+        with self._cond:
+            return bool(self._pending) or self._rendering is not None
+
+    def set_depth(self, depth):
+        with self._cond:
+            self.depth = max(0, depth)
+            self._cond.notify_all()
+
+    def take(self, item_id, timeout=None):
+        """Block until item_id is rendered and return its waveform (re-raising render errors)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = time.perf_counter()
+        with self._cond:
+            if item_id not in self._tokens:
+                raise KeyError(f"Item {item_id} was not submitted to the pipeline")
+            self._wanted.add(item_id)
+            self._cond.notify_all()
+            try:
+                while item_id not in self._ready:
+                    if self._closed or item_id not in self._tokens:
+                        raise Exception("Queue item was removed before it was rendered")
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"Timed out waiting for queue item {item_id}")
+                    self._cond.wait(remaining)
+                ok, result = self._ready.pop(item_id)
+                del self._tokens[item_id]
+                get_metrics().observe("queue.take_wait", time.perf_counter() - waited)
+                # A buffer slot was freed, let the worker render further ahead
+                self._cond.notify_all()
+            finally:
+                self._wanted.discard(item_id)
+        if not ok:
+            raise result
+        return result
+
+    def discard(self, item_id):
+        """Forget an item whether it is pending, rendering or already rendered."""
+        with self._cond:
+            self._tokens.pop(item_id, None)
+            self._pending.pop(item_id, None)
+            self._ready.pop(item_id, None)
+            self._cond.notify_all()
+
+    def clear(self):
+        """Drop every pending and rendered item (e.g. after a model change)."""
+        with self._cond:
+            self._tokens.clear()
+            self._pending.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._tokens.clear()
+            self._pending.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+
+    def _next_item(self):
+        for item_id in self._pending:
+            if item_id in self._wanted:
+                return item_id
+        if self._pending and len(self._ready) < self.depth:
+            return next(iter(self._pending))
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                item_id = self._next_item()
+                while item_id is None and not self._closed:
+                    self._cond.wait()
+                    item_id = self._next_item()
+                if self._closed:
+                    return
+                token, args, submitted = self._pending.pop(item_id)
+                self._rendering = item_id
+            metrics = get_metrics()
+            start = time.perf_counter()
+            metrics.observe("queue.wait", start - submitted)
+            try:
+                result = (True, self.render(*args))
+                log.debug("Pre-rendered queue item %s in %.3fs", item_id, time.perf_counter() - start)
+            except Exception as e:
+                result = (False, e)
+            metrics.observe("queue.render", time.perf_counter() - start)
+            with self._cond:
+                self._rendering = None
+                # Drop results of items that were removed or resubmitted meanwhile
+                if self._tokens.get(item_id) == token:
+                    self._ready[item_id] = result
+                self._cond.notify_all()
@@ -0,0 +1,453 @@
+import io
+import json
+import queue
+import time
+import threading
+import collections
+import concurrent.futures
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from tts_module.model_manager import get_available_models, get_models_directory, get_speakers_list, get_model_id, find_model
+from tts_module.synthesis import (get_cached_model, cached_tts_to_wav, tts_to_chunks, get_output_sample_rate,
+                                  warm_up, warmup_enabled, DEFAULT_SAMPLE_RATE)
+from tts_module.synth_cache import get_synthesizer_cache
+from tts_module.audio import save_wav, wav_header, to_pcm16
+from tts_module.metrics import get_metrics
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5002
+# Synthesis workers, and requests allowed to wait for one before the server answers 503
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 32
+MAX_TEXT_LENGTH = 5000
+# Number of recent requests the latency figures are computed over
+LATENCY_WINDOW = 500
+
+class RequestError(Exception):
+    """A client error, reported with an HTTP status code."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class ServerBusy(RequestError):
+    def __init__(self):
+        super().__init__("Server is busy, try again later", 503)
+
+def encode_wav(wav, sample_rate):
+    """Encode post-processed audio as a 16-bit WAV file in memory."""
+    buffer = io.BytesIO()
+    save_wav(wav, sample_rate, buffer, normalize=False)
+    return buffer.getvalue()
+
+class SynthesisService:
+    """Resident models plus a bounded worker pool shared by all HTTP clients.
+
+    At most ``workers`` requests synthesize at once and at most ``max_queue``
+    more wait for a worker; anything beyond that is rejected with ServerBusy
+    instead of piling up. Requests for the same model are serialized, requests
+    for different models run in parallel.
+    """
+
+    def __init__(self, use_cuda=False, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE):
+        self.use_cuda = use_cuda
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.models = collections.OrderedDict()  # model id -> model entry
+        self.refresh_models()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="synthesis")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._model_locks = {}
+        self._waiting = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)  # (queue wait, total) seconds
+        self._first_audio = collections.deque(maxlen=LATENCY_WINDOW)  # streamed requests, seconds
+        self.started = time.time()
+
+    def refresh_models(self):
+        """Rescan the models directory; model ids are paths relative to it."""
+        models_dir = get_models_directory()
+        models = collections.OrderedDict()
+        for entry in get_available_models():
+            models[get_model_id(entry, models_dir)] = entry
+        self.models = models
+        return models
+
+    def list_models(self):
+        return [{
+            "id": model_id,
+            "name": entry["display_name"],
+            "type": entry["model_type"],
+            "multi_speaker": entry["multi_speaker"],
+        } for model_id, entry in self.models.items()]
+
+    def resolve_model(self, name=None):
+        """Find a model by id or display name (the first model when name is empty)."""
+        if not self.models:
+            raise RequestError("No models available", 404)
+        if not name:
+            return next(iter(self.models.items()))
+        entry = self.models.get(name) or find_model(name, self.models.values())
+        if entry is not None:
+            return get_model_id(entry), entry
+        raise RequestError(f"Unknown model: {name}", 404)
+
+    def get_speakers(self, name=None):
+        _, entry = self.resolve_model(name)
+        return get_speakers_list(entry) or []
+
+    def prepare(self, text, model=None, speaker=None):
+        """Validate a request; returns (model id, model entry, text, speaker)."""
+        text = (text or "").strip()
+        if not text:
+            raise RequestError("Missing text")
+        if len(text) > MAX_TEXT_LENGTH:
+            raise RequestError(f"Text is longer than {MAX_TEXT_LENGTH} characters", 413)
+        model_id, entry = self.resolve_model(model)
+        if entry["multi_speaker"]:
+            speakers = get_speakers_list(entry) or []
+            if speaker in (None, ""):
+                speaker = speakers[0] if speakers else None
+            elif speakers and speaker not in speakers:
+                raise RequestError(f"Unknown speaker for {model_id}: {speaker}", 404)
+        else:
+            speaker = None
+        return model_id, entry, text, speaker
+
+    def load(self, entry):
+        """Resident synthesizer for a model, loaded and warmed up on first use."""
+        synth = get_cached_model(entry["model_path"], entry["config_path"], self.use_cuda)
+        if synth is None:
+            raise Exception(f"Failed to load model {entry['display_name']}")
+        if warmup_enabled():
+            with self.model_lock(get_model_id(entry)):
+                warm_up(synth)
+        return synth
+
+    def model_lock(self, model_id):
+        with self._lock:
+            return self._model_locks.setdefault(model_id, threading.Lock())
+
+    def run_job(self, job):
+        """Run job() on the worker pool; raises ServerBusy when the queue is full.
+
+        Returns a Future. Used for plain synthesis and for streamed responses.
+        """
+        metrics = get_metrics()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            metrics.increment("server.requests_rejected")
+            raise ServerBusy()
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+
+        def run():
+            started = time.perf_counter()
+            with self._lock:
+                self._waiting -= 1
+                self._active += 1
+            metrics.observe("server.queue_wait", started - enqueued)
+            try:
+                result = job()
+                finished = time.perf_counter()
+                with self._lock:
+                    self._completed += 1
+                    self._latencies.append((started - enqueued, finished - enqueued))
+                metrics.observe("server.request", finished - enqueued)
+                metrics.increment("server.requests_completed")
+                return result
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                metrics.increment("server.requests_failed")
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                self._slots.release()
+
+        return self._pool.submit(run)
+
+    def synthesize(self, text, model=None, speaker=None):
+        """Synthesize text on the worker pool and return (wav, sample rate)."""
+        model_id, entry, text, speaker = self.prepare(text, model, speaker)
+
+        def job():
+            synth = self.load(entry)
+            with self.model_lock(model_id):
+                wav = cached_tts_to_wav(synth, text, speaker)
+            return wav, get_output_sample_rate(synth)
+
+        return self.run_job(job).result()
+
+    def stream(self, text, model=None, speaker=None):
+        """Synthesize text sentence by sentence on the worker pool.
+
+        Returns (chunks, cancel): chunks is a queue that receives
+        (wav, sample_rate) per sentence, then None when done, or the exception
+        that stopped synthesis. Set cancel to stop a job whose client went away.
+
+        The job renders at synthesis speed, not at the client's playback
+        speed: chunks are buffered without limit (text length is capped by
+        MAX_TEXT_LENGTH) and the model lock is held for one sentence at a
+        time, so other requests for the model interleave with a stream.
+        """
+        model_id, entry, text, speaker = self.prepare(text, model, speaker)
+        chunks = queue.Queue()
+        cancel = threading.Event()
+        requested = time.perf_counter()
+
+        def job():
+            try:
+                synth = self.load(entry)
+                sample_rate = get_output_sample_rate(synth)
+                sentences = tts_to_chunks(synth, text, speaker)
+                first = True
+                while not cancel.is_set():
+                    with self.model_lock(model_id):
+                        wav = next(sentences, None)
+                    if wav is None:
+                        break
+                    if first:
+                        with self._lock:
+                            self._first_audio.append(time.perf_counter() - requested)
+                        first = False
+                    chunks.put((wav, sample_rate))
+                chunks.put(None)
+            except Exception as e:
+                chunks.put(e)
+                raise
+
+        self.run_job(job)
+        return chunks, cancel
+
+    def stats(self):
+        with self._lock:
+            latencies = list(self._latencies)
+            first_audio = sorted(self._first_audio)
+            stats = {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._waiting,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+        if latencies:
+            waits = sorted(w for w, _ in latencies)
+            totals = sorted(t for _, t in latencies)
+            stats["latency_ms"] = {
+                "avg": round(sum(totals) / len(totals) * 1000, 1),
+                "p50": round(totals[len(totals) // 2] * 1000, 1),
+                "p95": round(totals[min(len(totals) - 1, int(len(totals) * 0.95))] * 1000, 1),
+                "max": round(totals[-1] * 1000, 1),
+            }
+            stats["queue_wait_ms"] = {
+                "avg": round(sum(waits) / len(waits) * 1000, 1),
+                "max": round(waits[-1] * 1000, 1),
+            }
+        if first_audio:
+            stats["stream_first_audio_ms"] = {
+                "avg": round(sum(first_audio) / len(first_audio) * 1000, 1),
+                "p50": round(first_audio[len(first_audio) // 2] * 1000, 1),
+                "max": round(first_audio[-1] * 1000, 1),
+            }
+        stats["resident_models"] = get_synthesizer_cache().stats()
+        return stats
+
+    def prometheus_metrics(self):
+        """Stage histograms and counters in Prometheus text format, with the server's gauges."""
+        with self._lock:
+            gauges = {
+                "server.workers": self.workers,
+                "server.max_queue": self.max_queue,
+                "server.queue_depth": self._waiting,
+                "server.active": self._active,
+                "server.uptime_seconds": time.time() - self.started,
+            }
+        resident = get_synthesizer_cache().stats()
+        gauges["server.resident_models"] = len(resident["entries"])
+        for device, megabytes in resident["usage_mb"].items():
+            gauges[f"server.resident_{device}_mb"] = megabytes
+        return get_metrics().to_prometheus(gauges)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+class SynthesisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for SynthesisService.
+
+    GET  /health, /models, /speakers?model=ID, /stats
+    GET  /metrics (Prometheus text format)
+    GET  /synthesize?text=...&model=ID&speaker=NAME&format=wav|pcm
+    GET  /stream?text=...&model=ID&speaker=NAME&format=wav|pcm
+    POST /synthesize and /stream with a JSON body using the same fields
+
+    /stream sends audio with chunked transfer encoding as each sentence is
+    synthesized: a WAV header with unknown length followed by PCM frames, or
+    raw PCM. A media player can play the URL while it is being generated.
+    """
+    server_version = "CocoSpeak/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.dispatch(url.path, params)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            params = json.loads(body.decode("utf-8")) if body else {}
+            if not isinstance(params, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            self.send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        self.dispatch(url.path, params)
+
+    def dispatch(self, path, params):
+        try:
+            if path == "/health":
+                self.send_json(200, {"status": "ok"})
+            elif path == "/models":
+                self.send_json(200, {"models": self.service.list_models()})
+            elif path == "/speakers":
+                self.send_json(200, {"speakers": self.service.get_speakers(params.get("model"))})
+            elif path == "/stats":
+                self.send_json(200, self.service.stats())
+            elif path == "/metrics":
+                self.send_text(200, self.service.prometheus_metrics(), "text/plain; version=0.0.4; charset=utf-8")
+            elif path == "/synthesize":
+                self.handle_synthesize(params)
+            elif path == "/stream":
+                self.handle_stream(params)
+            else:
+                self.send_json(404, {"error": f"Not found: {path}"})
+        except RequestError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+
+    @staticmethod
+    def get_format(params):
+        audio_format = (params.get("format") or "wav").lower()
+        if audio_format not in ("wav", "pcm"):
+            raise RequestError(f"Unsupported format: {audio_format}")
+        return audio_format
+
+    def handle_synthesize(self, params):
+        audio_format = self.get_format(params)
+        start = time.perf_counter()
+        wav, sample_rate = self.service.synthesize(params.get("text"), params.get("model"), params.get("speaker"))
+        if audio_format == "wav":
+            body, content_type = encode_wav(wav, sample_rate), "audio/wav"
+        else:
+            body, content_type = to_pcm16(wav), f"audio/L16; rate={sample_rate}; channels=1"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Sample-Rate", str(sample_rate))
+        self.send_header("X-Audio-Seconds", f"{len(wav) / sample_rate:.3f}")
+        self.send_header("X-Synthesis-Ms", f"{(time.perf_counter() - start) * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_stream(self, params):
+        audio_format = self.get_format(params)
+        chunks, cancel = self.service.stream(params.get("text"), params.get("model"), params.get("speaker"))
+        headers_sent = False
+        try:
+            # Wait for the first sentence so a failure can still be reported as an error status
+            item = chunks.get()
+            if isinstance(item, Exception):
+                raise item
+            sample_rate = item[1] if item is not None else DEFAULT_SAMPLE_RATE
+            self.send_response(200)
+            if audio_format == "wav":
+                self.send_header("Content-Type", "audio/wav")
+            else:
+                self.send_header("Content-Type", f"audio/L16; rate={sample_rate}; channels=1")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Sample-Rate", str(sample_rate))
+            self.end_headers()
+            headers_sent = True
+            if audio_format == "wav":
+                self.write_chunk(wav_header(sample_rate))
+            while item is not None:
+                if isinstance(item, Exception):
+                    # Too late for an error status; end the stream early
+                    log.error("Streaming synthesis failed: %s", item)
+                    break
+                self.write_chunk(to_pcm16(item[0]))
+                item = chunks.get()
+            self.wfile.write(b"0\r\n\r\n")
+        except ConnectionError:
+            log.info("%s - client closed the stream", self.address_string())
+            self.close_connection = True
+        except Exception as e:
+            if not headers_sent:
+                raise
+            # The chunked body has started, so no error response can follow; drop the connection
+            log.error("%s - streaming response failed: %s", self.address_string(), e)
+            self.close_connection = True
+        finally:
+            cancel.set()
+
+    def write_chunk(self, data):
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def send_json(self, status, payload):
+        self.send_text(status, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8")
+
+    def send_text(self, status, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.info("%s - " + format, self.address_string(), *args)
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE,
+               use_cuda=False, preload=None):
+    """Serve the synthesis API until interrupted."""
+    service = SynthesisService(use_cuda=use_cuda, workers=workers, max_queue=max_queue)
+    log.info("Serving %d model(s) with %d worker(s), queue limit %d", len(service.models), service.workers, service.max_queue)
+    if preload is not None:
+        # Load the default (or named) model up front so the first request does not pay for it
+        model_id, entry = service.resolve_model(preload or None)
+        start = time.perf_counter()
+        service.load(entry)
+        log.info("Preloaded %s in %.2fs", model_id, time.perf_counter() - start)
+    httpd = ThreadingHTTPServer((host, port), SynthesisRequestHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    log.info("CocoSpeak server listening on http://%s:%s", host, port)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Shutting down server...")
+    finally:
+        httpd.server_close()
+        service.close()
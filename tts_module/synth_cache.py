@@ -0,0 +1,184 @@
+import os
+import threading
+import collections
+import itertools
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Memory budgets (MB) per device and maximum number of resident synthesizers.
+# Override with COCOSPEAK_SYNTH_CACHE_MB, COCOSPEAK_SYNTH_CACHE_VRAM_MB and
+# COCOSPEAK_SYNTH_CACHE_ENTRIES.
+DEFAULT_RAM_BUDGET_MB = 4096
+DEFAULT_VRAM_BUDGET_MB = 3072
+DEFAULT_MAX_ENTRIES = 4
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def estimate_synth_bytes(synth):
+    """Estimate the memory held by a synthesizer's model weights and buffers."""
+    total = 0
+    for attr in ("tts_model", "vocoder_model", "encoder"):
+        model = getattr(synth, attr, None)
+        if model is None or not hasattr(model, "parameters"):
+            continue
+        try:
+            for tensor in itertools.chain(model.parameters(), model.buffers()):
+                total += tensor.numel() * tensor.element_size()
+        except Exception:
+            pass
+    return total
+
+class SynthesizerCache:
+    """LRU cache of loaded synthesizers keyed by (model_path, config_path, device, phonemizer).
+
+    Entries are evicted least-recently-used first once the estimated weight
+    size on a device exceeds that device's budget, or once more than
+    ``max_entries`` synthesizers are resident. The most recently used entry
+    is never evicted, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, ram_budget_mb=None, vram_budget_mb=None, max_entries=None):
+        if ram_budget_mb is None:
+            ram_budget_mb = _env_int("COCOSPEAK_SYNTH_CACHE_MB", DEFAULT_RAM_BUDGET_MB)
+        if vram_budget_mb is None:
+            vram_budget_mb = _env_int("COCOSPEAK_SYNTH_CACHE_VRAM_MB", DEFAULT_VRAM_BUDGET_MB)
+        if max_entries is None:
+            max_entries = _env_int("COCOSPEAK_SYNTH_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES)
+        self.budgets = {
+            "cpu": ram_budget_mb * 1024 * 1024,
+            "cuda": vram_budget_mb * 1024 * 1024,
+        }
+        self.max_entries = max(1, max_entries)
+        self._entries = collections.OrderedDict()  # key -> (synth, size_bytes)
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    @staticmethod
+    def make_key(model_path, config_path, use_cuda=False, phonemizer=None):
+        device = "cuda" if use_cuda else "cpu"
+        return (os.path.abspath(model_path), os.path.abspath(config_path), device, phonemizer)
+
+    def get(self, key):
+        """Return the cached synthesizer for key (marking it most recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, synth):
+        """Insert a synthesizer and evict older entries that no longer fit the budget."""
+        size = estimate_synth_bytes(synth)
+        with self._lock:
+            self._entries[key] = (synth, size)
+            self._entries.move_to_end(key)
+            self._enforce_budget(key)
+
+    def get_or_load(self, key, loader):
+        """Return the cached synthesizer for key, calling loader() on a miss.
+
+        Concurrent misses for the same key wait for a single load.
+        """
+        return self.fetch(key, loader)[0]
+
+    def fetch(self, key, loader):
+        """Like get_or_load(), but return (synth, loaded), loaded being True when loader() ran for this call."""
+        synth = self.get(key)
+        if synth is not None:
+            log.debug("Synthesizer cache hit: %s (%s)", os.path.basename(key[0]), key[2])
+            return synth, False
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            synth = self.get(key)
+            if synth is not None:
+                return synth, False
+            synth = loader()
+            if synth is not None:
+                self.put(key, synth)
+            return synth, True
+
+    def evict(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._release(key, entry)
+
+    def evict_model(self, model_path):
+        """Evict every entry (any device or phonemizer) loaded from model_path."""
+        model_path = os.path.abspath(model_path)
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == model_path]
+        for key in keys:
+            self.evict(key)
+
+    def evict_config(self, config_path):
+        """Evict every entry built from config_path; entries of other configs stay resident."""
+        config_path = os.path.abspath(config_path)
+        with self._lock:
+            keys = [key for key in self._entries if key[1] == config_path]
+        for key in keys:
+            self.evict(key)
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        for key, entry in entries:
+            self._release(key, entry)
+
+    def stats(self):
+        """Return a snapshot of resident entries and per-device usage."""
+        with self._lock:
+            usage = {"cpu": 0, "cuda": 0}
+            entries = []
+            for key, (synth, size) in self._entries.items():
+                usage[key[2]] = usage.get(key[2], 0) + size
+                entries.append({"model_path": key[0], "device": key[2], "phonemizer": key[3], "size_mb": size / (1024 * 1024)})
+            return {"entries": entries, "usage_mb": {d: b / (1024 * 1024) for d, b in usage.items()}}
+
+    def _enforce_budget(self, keep_key):
+        device = keep_key[2]
+        budget = self.budgets.get(device)
+        evicted = []
+        while len(self._entries) > 1:
+            usage = sum(size for k, (_, size) in self._entries.items() if k[2] == device)
+            over_budget = budget is not None and usage > budget
+            if not over_budget and len(self._entries) <= self.max_entries:
+                break
+            # Oldest entry on the same device when over budget, oldest overall when over the count
+            candidates = [k for k in self._entries if k != keep_key and (not over_budget or k[2] == device)]
+            if not candidates:
+                break
+            victim = candidates[0]
+            evicted.append((victim, self._entries.pop(victim)))
+        for key, entry in evicted:
+            self._release(key, entry)
+
+    def _release(self, key, entry):
+        log.info("Synthesizer cache evicted: %s (%s, %.1f MB)", os.path.basename(key[0]), key[2], entry[1] / (1024 * 1024))
+        with self._lock:
+            self._key_locks.pop(key, None)
+        if key[2] == "cuda":
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_synthesizer_cache():
+    """Return the process-wide synthesizer cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SynthesizerCache()
+        return _cache
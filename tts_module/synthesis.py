@@ -1,138 +1,411 @@
-from TTS.utils.synthesizer import Synthesizer
 import os
+import re
 import sys
+import json
+import time
+import inspect
+import logging
+import threading
+import weakref
 import numpy as np
-import torch
+from tts_module.synth_cache import get_synthesizer_cache
+from tts_module.audio_cache import get_audio_cache, get_file_signature, POSTPROCESS_VERSION
+from tts_module.dsp import get_dsp_chain
+from tts_module.threads import configure_torch_threads
+from tts_module.checkpoint import install_fast_loading
+from tts_module.metrics import get_metrics, instrument_synthesizer
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+def _preview(text, length=50):
+    return text[:length] + "..." if len(text) > length else text
+
+# Loads change the process-wide working directory, so only one runs at a time
+_load_lock = threading.Lock()
 
 def load_model(model_path, config_path, use_cuda=False):
     """Load a TTS model from the given paths."""
     try:
-        # Temporarily change working directory to model folder for speakers.pth
-        original_cwd = os.getcwd()
-        model_dir = os.path.dirname(config_path)
-        os.chdir(model_dir)
+        # Imported here so that importing this module does not pull in torch/TTS
+        from TTS.utils.synthesizer import Synthesizer
+        try:
+            configure_torch_threads()
+        except Exception as e:
+            log.warning("Could not configure torch threads: %s", e)
+        try:
+            # Memory-mapped .pth loading, and .safetensors support
+            install_fast_loading(config_path)
+        except Exception as e:
+            log.warning("Fast checkpoint loading unavailable: %s", e)
         
-        # Load the synthesizer
-        synth = Synthesizer(
-            model_path,
-            config_path,
-            None,  # vocoder_path
-            None,  # vocoder_config_path
-            None,  # encoder_path
-            None,  # encoder_config_path
-            use_cuda=use_cuda
-        )
-        
-        # Restore original working directory
-        os.chdir(original_cwd)
+        with _load_lock:
+            # Temporarily change working directory to model folder for speakers.pth
+            original_cwd = os.getcwd()
+            os.chdir(os.path.dirname(os.path.abspath(config_path)))
+            try:
+                # Load the synthesizer
+                synth = Synthesizer(
+                    os.path.abspath(model_path),
+                    os.path.abspath(config_path),
+                    None,  # vocoder_path
+                    None,  # vocoder_config_path
+                    None,  # encoder_path
+                    None,  # encoder_config_path
+                    use_cuda=use_cuda
+                )
+            finally:
+                # Restore original working directory, also when loading failed
+                os.chdir(original_cwd)
         
-        return synth
+        return instrument_synthesizer(synth)
     except Exception as e:
-        print(f"Failed to load model: {e}")
+        log.error("Failed to load model: %s", e)
+        return None
+
+# Throwaway sentences synthesized right after a load, so the first real request
+# does not pay for allocator growth, phonemizer start-up and first-call overhead
+WARMUP_TEXTS = ("Hello.", "This is a warm-up sentence, with a pause and the number 42.")
+
+_warmed_up = weakref.WeakSet()  # synthesizers that already ran warm_up()
+
+def warmup_enabled():
+    """Warm-up is on unless COCOSPEAK_WARMUP=0."""
+    return os.environ.get("COCOSPEAK_WARMUP", "1").lower() not in ("0", "false", "no", "off")
+
+def get_model_speakers(synth):
+    """Speaker names a multi-speaker synthesizer knows, or None."""
+    model = getattr(synth, "tts_model", None)
+    if getattr(model, "num_speakers", 0) <= 1:
+        return None
+    names = list(getattr(getattr(model, "speaker_manager", None), "name_to_id", None) or [])
+    return names or None
+
+def get_warmup_speakers(synth):
+    """Speakers to warm up: the first one, or all with COCOSPEAK_WARMUP_SPEAKERS=all."""
+    speakers = get_model_speakers(synth)
+    if not speakers:
+        return [None]
+    if os.environ.get("COCOSPEAK_WARMUP_SPEAKERS", "first").lower() == "all":
+        return speakers
+    return speakers[:1]
+
+def is_warmed_up(synth):
+    try:
+        return synth in _warmed_up
+    except TypeError:
+        return False
+
+_synth_locks = weakref.WeakKeyDictionary()  # synthesizer -> lock held while it synthesizes
+_synth_locks_guard = threading.Lock()
+_shared_synth_lock = threading.RLock()  # for synthesizers that are not weak-referenceable
+
+def get_synth_lock(synth):
+    """Lock serializing work on one synthesizer, so e.g. a warm-up and queue renders do not run at once."""
+    with _synth_locks_guard:
+        try:
+            lock = _synth_locks.get(synth)
+            if lock is None:
+                lock = _synth_locks[synth] = threading.RLock()
+            return lock
+        except TypeError:
+            return _shared_synth_lock
+
+def warm_up(synth, speakers=None, texts=WARMUP_TEXTS):
+    """Synthesize a few throwaway sentences and return the seconds it took.
+
+    Returns None without doing anything when this synthesizer was already
+    warmed up. The runs go straight to the model (not through the audio cache)
+    and are kept out of the stage metrics; only the total is recorded. Holds
+    get_synth_lock(synth), so renders on the same synthesizer wait for it.
+    """
+    if synth is None or is_warmed_up(synth):
+        return None
+    with get_synth_lock(synth):
+        # Another thread may have finished warming it up while we waited
+        if is_warmed_up(synth):
+            return None
+        return _run_warm_up(synth, speakers, texts)
+
+def _run_warm_up(synth, speakers, texts):
+    speakers = speakers or get_warmup_speakers(synth)
+    metrics = get_metrics()
+    start = time.perf_counter()
+    with metrics.suppressed():
+        for speaker in speakers:
+            for text in texts:
+                try:
+                    call_tts(synth, text, speaker)
+                except Exception as e:
+                    log.warning("Warm-up synthesis failed (speaker %s): %s", speaker, e)
+                    break
+    elapsed = time.perf_counter() - start
+    try:
+        _warmed_up.add(synth)
+    except TypeError:
+        pass  # Not weak-referenceable, warmed up again next time
+    metrics.observe("model.warmup", elapsed)
+    log.info("Warm-up: %d sentence(s) for %d speaker(s) in %.2fs", len(texts), len(speakers), elapsed)
+    return elapsed
+
+def get_config_phonemizer(config_path):
+    """Return the phonemizer a model config asks for (falls back to TTS_BACKEND)."""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if config.get("phonemizer"):
+            return config["phonemizer"]
+    except Exception:
+        pass
+    return os.environ.get("TTS_BACKEND")
+
+def get_cached_model(model_path, config_path, use_cuda=False):
+    """Return a resident synthesizer from the process-wide cache, loading it on a miss."""
+    return fetch_cached_model(model_path, config_path, use_cuda)[0]
+
+def fetch_cached_model(model_path, config_path, use_cuda=False):
+    """Like get_cached_model(), but return (synth, loaded): loaded is True on a cache miss."""
+    cache = get_synthesizer_cache()
+    key = cache.make_key(model_path, config_path, use_cuda, get_config_phonemizer(config_path))
+    return cache.fetch(key, lambda: load_model(model_path, config_path, use_cuda))
+
+# Used when a synthesizer does not report its output rate
+DEFAULT_SAMPLE_RATE = 22050
+
+def get_output_sample_rate(synth):
+    """Sample rate of the audio a synthesizer produces (the vocoder's rate if it has one)."""
+    rate = getattr(synth, "output_sample_rate", None)
+    if not rate:
+        try:
+            rate = synth.tts_config.audio["sample_rate"]
+        except Exception:
+            rate = None
+    return int(rate) if rate else DEFAULT_SAMPLE_RATE
+
+# Silence appended after each sentence when streaming, and after a full utterance
+SENTENCE_PAUSE_SECONDS = 0.25
+TAIL_SILENCE_SECONDS = 0.5
+
+def split_sentences(synth, text):
+    """Split text into sentences, using the synthesizer's segmenter when it has one."""
+    sentences = None
+    if synth is not None and hasattr(synth, "split_into_sentences"):
+        try:
+            sentences = synth.split_into_sentences(text)
+        except Exception as e:
+            log.warning("Sentence segmenter failed, using punctuation split: %s", e)
+    if sentences is None:
+        sentences = re.split(r'(?<=[.!?;])\s+', text)
+    return [s.strip() for s in sentences if s and s.strip()]
+
+def tts_to_chunks(synth, text, speaker_id=None, synthesize=None):
+    """Yield post-processed audio one sentence at a time for streaming playback.
+
+    Sentences are synthesized without post-processing and run through one
+    DSPStream, so filter state and the normalization gain carry over between
+    sentences instead of every sentence being normalized to its own peak.
+    synthesize defaults to cached_tts_to_wav and is called with the same
+    arguments (and dsp=False).
+    """
+    synthesize = synthesize or cached_tts_to_wav
+    sentences = split_sentences(synth, text)
+    stream = None
+    for i, sentence in enumerate(sentences):
+        is_last = i == len(sentences) - 1
+        wav = synthesize(synth, sentence, speaker_id, pad_seconds=TAIL_SILENCE_SECONDS if is_last else SENTENCE_PAUSE_SECONDS,
+                         dsp=False)
+        try:
+            with get_metrics().span("postprocess"):
+                if stream is None:
+                    stream = get_dsp_chain(get_output_sample_rate(synth)).stream()
+                wav = stream.process(wav)
+        except Exception as e:
+            log.warning("Audio processing failed: %s", e)
+        yield wav
+
+def get_audio_cache_key(cache, synth, text, speaker_id=None, pad_seconds=TAIL_SILENCE_SECONDS, dsp=True):
+    """Cache key for a tts_to_wav() call, or None if the synthesizer's files are unknown."""
+    model_path = getattr(synth, "tts_checkpoint", None)
+    config_path = getattr(synth, "tts_config_path", None)
+    if not model_path or not config_path:
         return None
+    model_signature = get_file_signature(model_path)
+    config_signature = get_file_signature(config_path)
+    if model_signature is None or config_signature is None:
+        return None
+    sample_rate = get_output_sample_rate(synth)
+    settings = {
+        "config": config_signature,
+        "pad_seconds": pad_seconds,
+        "postprocess": POSTPROCESS_VERSION,
+        "dsp": get_dsp_chain(sample_rate).settings() if dsp else None,
+        "sample_rate": sample_rate,
+    }
+    return cache.make_key(text, speaker_id, model_signature, get_config_phonemizer(config_path), settings)
+
+def cached_tts_to_wav(synth, text, speaker_id=None, pad_seconds=TAIL_SILENCE_SECONDS, dsp=True):
+    """tts_to_wav() through the audio cache, so repeated phrases skip synthesis."""
+    cache = get_audio_cache()
+    key = get_audio_cache_key(cache, synth, text, speaker_id, pad_seconds, dsp) if cache is not None else None
+    if key is None:
+        return tts_to_wav(synth, text, speaker_id, pad_seconds, dsp)
+    cached = cache.get(key)
+    get_metrics().increment("audio_cache.hits" if cached is not None else "audio_cache.misses")
+    if cached is not None:
+        log.debug("Audio cache hit for: %r", _preview(text))
+        return cached[0]
+    wav = tts_to_wav(synth, text, speaker_id, pad_seconds, dsp)
+    cache.put(key, wav, get_output_sample_rate(synth))
+    return wav
+
+# Keyword names different TTS versions use for the speaker, in order of preference.
+# POSITIONAL means the speaker is passed as the second positional argument.
+SPEAKER_ARGUMENTS = ("speaker_name", "speaker", "speaker_idx", "speaker_id")
+POSITIONAL = "positional"
+
+_speaker_arguments = weakref.WeakKeyDictionary()  # synthesizer -> speaker argument
+
+def detect_speaker_argument(synth):
+    """Work out from the tts() signature how a synthesizer takes the speaker.
+
+    Returns a name from SPEAKER_ARGUMENTS, POSITIONAL, or None when the
+    signature does not tell (e.g. everything goes through **kwargs).
+    """
+    try:
+        params = list(inspect.signature(synth.tts).parameters.values())
+    except (TypeError, ValueError):
+        return None
+    named = [p.name for p in params if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)]
+    for name in SPEAKER_ARGUMENTS:
+        if name in named:
+            return name
+    positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+    if len(positional) >= 2:
+        return POSITIONAL
+    return None
+
+def _call_with_speaker(synth, text, speaker_id, argument):
+    if argument == POSITIONAL:
+        return synth.tts(text, speaker_id)
+    if argument == "speaker_name":
+        return synth.tts(text, speaker_name=str(speaker_id))
+    return synth.tts(text, **{argument: speaker_id})
 
-def tts_to_wav(synth, text, speaker_id=None):
-    """Convert text to speech using the loaded synthesizer. Tries all speaker argument names for multi-speaker models."""
+def _remember_speaker_argument(synth, argument):
+    try:
+        _speaker_arguments[synth] = argument
+    except TypeError:
+        pass  # Not weak-referenceable, resolve again next time
+
+def call_tts(synth, text, speaker_id=None):
+    """Call synth.tts() with the speaker passed the way this synthesizer expects.
+
+    The calling convention is resolved once per synthesizer and remembered,
+    so every later call is a single tts() call. Only when the signature does
+    not tell are the known conventions tried in turn, once.
+    """
+    if speaker_id is None:
+        return synth.tts(text)
+    try:
+        argument = _speaker_arguments.get(synth)
+    except TypeError:
+        argument = None
+    if argument is None:
+        argument = detect_speaker_argument(synth)
+        if argument is not None:
+            log.info("Speaker argument for this model: %s", argument)
+            _remember_speaker_argument(synth, argument)
+    if argument is not None:
+        return _call_with_speaker(synth, text, speaker_id, argument)
+    errors = []
+    for argument in SPEAKER_ARGUMENTS + (POSITIONAL,):
+        try:
+            wav = _call_with_speaker(synth, text, speaker_id, argument)
+        except Exception as e:
+            errors.append(f"{argument}: {e}")
+            continue
+        log.info("Speaker argument for this model: %s", argument)
+        _remember_speaker_argument(synth, argument)
+        return wav
+    raise Exception("All attempts to synthesize with speaker failed: " + " | ".join(errors))
+
+def tts_to_wav(synth, text, speaker_id=None, pad_seconds=TAIL_SILENCE_SECONDS, dsp=True):
+    """Convert text to speech using the loaded synthesizer.
+
+    The result is at get_output_sample_rate(synth). dsp=False skips the DSP
+    chain, for callers that post-process a stream of clips themselves.
+    """
     if synth is None:
         raise Exception("Model not loaded. Please load the model first.")
     
+    metrics = get_metrics()
     try:
-        print(f"Starting TTS synthesis for text: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-        print(f"Text length: {len(text)} characters")
+        log.debug("Starting TTS synthesis for text: %r (%d characters)", _preview(text), len(text))
         
-        wav = None
-        errors = []
-        if speaker_id is not None:
-            # Try all common argument names for multi-speaker models
-            try:
-                wav = synth.tts(text, speaker=speaker_id)
-            except Exception as e1:
-                errors.append(f"speaker: {e1}")
-                try:
-                    wav = synth.tts(text, speaker_idx=speaker_id)
-                except Exception as e2:
-                    errors.append(f"speaker_idx: {e2}")
-                    try:
-                        wav = synth.tts(text, speaker_id=speaker_id)
-                    except Exception as e3:
-                        errors.append(f"speaker_id: {e3}")
-                        try:
-                            wav = synth.tts(text, speaker_name=str(speaker_id))
-                        except Exception as e4:
-                            errors.append(f"speaker_name: {e4}")
-                            try:
-                                wav = synth.tts(text, speaker_id)
-                            except Exception as e5:
-                                errors.append(f"positional: {e5}")
-            if wav is None:
-                raise Exception("All attempts to synthesize with speaker failed: " + " | ".join(errors))
-        else:
-            wav = synth.tts(text)
-        print("TTS synthesis completed successfully")
-        
-        # Convert to numpy array
-        if isinstance(wav, list):
-            if all(isinstance(x, (float, int, np.floating, np.integer)) for x in wav):
-                wav = np.array(wav, dtype=np.float32)
-            elif all(hasattr(x, '__len__') for x in wav):
-                wav = np.concatenate([np.asarray(seg, dtype=np.float32) for seg in wav if seg is not None and len(seg) > 0])
-            else:
-                wav = np.array(wav, dtype=np.float32)
-        elif not isinstance(wav, np.ndarray):
-            wav = np.array(wav, dtype=np.float32)
-        
-        # Add silence buffer
-        buffer_samples = int(22050 * 0.5)  # 0.5 seconds of silence
-        silence_buffer = np.zeros(buffer_samples, dtype=wav.dtype)
-        wav = np.concatenate([wav, silence_buffer])
-        
-        # Improve audio clarity
-        wav = improve_audio_clarity(wav)
+        start = time.perf_counter()
+        with metrics.span("synthesis.tts"):
+            wav = call_tts(synth, text, speaker_id)
+        log.debug("TTS synthesis completed")
         
+        sample_rate = get_output_sample_rate(synth)
+        wav = postprocess_wav(wav, sample_rate, pad_seconds, dsp)
+        elapsed = time.perf_counter() - start
+        metrics.observe("synthesis.total", elapsed)
+        speech_seconds = len(wav) / sample_rate - pad_seconds
+        if speech_seconds > 0:
+            metrics.observe("synthesis.rtf", elapsed / speech_seconds, unit="ratio")
+            metrics.increment("synthesis.audio_seconds", speech_seconds)
+        metrics.increment("synthesis.characters", len(text))
         return wav
         
     except Exception as e:
-        print(f"TTS synthesis failed: {e}")
+        log.error("TTS synthesis failed: %s", e)
         raise Exception(f"TTS synthesis failed: {e}")
 
-def improve_audio_clarity(wav):
-    """Improve audio clarity with enhanced processing."""
+def postprocess_wav(wav, sample_rate, pad_seconds=TAIL_SILENCE_SECONDS, dsp=True):
+    """Turn raw synthesizer output into a float32 array, pad it with silence and clean it up."""
+    # Convert to numpy array
+    if isinstance(wav, list):
+        if all(isinstance(x, (float, int, np.floating, np.integer)) for x in wav):
+            wav = np.array(wav, dtype=np.float32)
+        elif all(hasattr(x, '__len__') for x in wav):
+            wav = np.concatenate([np.asarray(seg, dtype=np.float32) for seg in wav if seg is not None and len(seg) > 0])
+        else:
+            wav = np.array(wav, dtype=np.float32)
+    elif not isinstance(wav, np.ndarray):
+        wav = np.array(wav, dtype=np.float32)
+    
+    # Add silence buffer
+    buffer_samples = int(sample_rate * pad_seconds)
+    silence_buffer = np.zeros(buffer_samples, dtype=wav.dtype)
+    wav = np.concatenate([wav, silence_buffer])
+    if not dsp:
+        return wav.astype(np.float32, copy=False)
+    
+    # Improve audio clarity
+    return improve_audio_clarity(wav, sample_rate)
+
+def improve_audio_clarity(wav, sample_rate=22050):
+    """Improve audio clarity: high-pass, normalize and compress in one DSP chain pass."""
     try:
-        # Ensure audio is float32
-        wav = wav.astype(np.float32)
-        
-        # Normalize audio
-        max_val = np.max(np.abs(wav))
-        if max_val > 0:
-            wav = wav / max_val * 0.95
-        
-        # Apply gentle compression
-        threshold = 0.7
-        ratio = 4.0
-        wav_compressed = np.where(
-            np.abs(wav) > threshold,
-            threshold + (np.abs(wav) - threshold) / ratio * np.sign(wav),
-            wav
-        )
-        
-        return wav_compressed
+        with get_metrics().span("postprocess"):
+            return get_dsp_chain(sample_rate).process(wav)
         
     except Exception as e:
-        print(f"Audio processing failed: {e}")
+        log.warning("Audio processing failed: %s", e)
         return wav
 
 def debug_audio_info(wav, stage=""):
-    """Debug function to print audio information."""
+    """Log audio statistics at DEBUG level.
+
+    The reductions over the whole array only run when debug logging is on.
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return
     try:
-        print(f"DEBUG {stage}:")
-        print(f"  Shape: {wav.shape}")
-        print(f"  Data type: {wav.dtype}")
-        print(f"  Min value: {np.min(wav)}")
-        print(f"  Max value: {np.max(wav)}")
-        print(f"  Mean value: {np.mean(wav)}")
-        print(f"  Has NaN: {np.isnan(wav).any()}")
-        print(f"  Has Inf: {np.isinf(wav).any()}")
-        print(f"  Non-zero samples: {np.count_nonzero(wav)}")
-        print(f"  Total samples: {len(wav)}")
+        wav = np.asarray(wav)
+        log.debug("%s: shape=%s dtype=%s min=%.4f max=%.4f mean=%.4f nan=%s inf=%s non-zero=%d/%d",
+                  stage, wav.shape, wav.dtype, np.min(wav), np.max(wav), np.mean(wav),
+                  np.isnan(wav).any(), np.isinf(wav).any(), np.count_nonzero(wav), len(wav))
     except Exception as e:
-        print(f"DEBUG {stage}: Error getting audio info: {e}") 
\ No newline at end of file
+        log.debug("%s: Error getting audio info: %s", stage, e)
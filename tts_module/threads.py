@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import platform
+import threading
+from tts_module.model_manager import get_models_directory
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Sentence synthesized when measuring speed at different thread counts
+CALIBRATION_TEXT = ("The quick brown fox jumps over the lazy dog, "
+                    "and then it runs back home before the evening rain begins.")
+SETTINGS_FILENAME = "inference_threads.json"
+
+_applied = None
+_torch_default = None  # torch's own intra-op count, restored when the setting is cleared
+_interop_configured = False
+_lock = threading.Lock()
+
+def get_machine_key():
+    """Identify this machine, so a models folder shared between machines keeps one setting per machine."""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}"
+
+def get_settings_path():
+    return os.path.join(get_models_directory(), ".cache", SETTINGS_FILENAME)
+
+def _read_settings():
+    try:
+        with open(get_settings_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def load_saved_threads():
+    """Thread count saved for this machine, or None."""
+    entry = _read_settings().get(get_machine_key())
+    return entry.get("threads") if entry else None
+
+def save_threads(threads, measurements=None):
+    """Save the thread count for this machine (None or 0 removes the setting)."""
+    settings = _read_settings()
+    key = get_machine_key()
+    if threads:
+        settings[key] = {"threads": int(threads), "saved": time.strftime("%Y-%m-%d %H:%M:%S")}
+        if measurements:
+            settings[key]["real_time_factor"] = {str(n): round(rtf, 4) for n, rtf in measurements.items()}
+    else:
+        settings.pop(key, None)
+    path = get_settings_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log.warning("Could not save thread setting %s: %s", path, e)
+
+def get_inference_threads():
+    """Intra-op threads for inference: COCOSPEAK_INFER_THREADS, else the saved value, else None (torch default)."""
+    try:
+        threads = int(os.environ.get("COCOSPEAK_INFER_THREADS", 0))
+        if threads > 0:
+            return threads
+    except ValueError:
+        pass
+    return load_saved_threads()
+
+def get_interop_threads():
+    # Synthesis is a single stream of ops, extra inter-op threads only compete for cores
+    try:
+        return max(1, int(os.environ.get("COCOSPEAK_INTEROP_THREADS", 1)))
+    except ValueError:
+        return 1
+
+def configure_torch_threads(threads=None):
+    """Apply the inference thread setting to torch; returns the intra-op thread count in use.
+
+    Called when a model loads. Without an explicit or configured value torch
+    uses its own default.
+    """
+    global _applied, _torch_default, _interop_configured
+    threads = threads or get_inference_threads()
+    import torch
+    with _lock:
+        if _torch_default is None:
+            _torch_default = torch.get_num_threads()
+        if (threads or _torch_default) != torch.get_num_threads():
+            torch.set_num_threads(threads or _torch_default)
+        if threads and not _interop_configured:
+            _interop_configured = True
+            # Only possible before torch runs any parallel work
+            try:
+                torch.set_num_interop_threads(get_interop_threads())
+            except RuntimeError:
+                pass
+        current = torch.get_num_threads()
+        if current != _applied:
+            log.info("Torch threads: %d intra-op, %d inter-op", current, torch.get_num_interop_threads())
+            _applied = current
+        return current
+
+def candidate_thread_counts(max_threads=None):
+    """1, 2, 4, ... up to the core count, plus the core count itself."""
+    max_threads = max_threads or os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n < max_threads:
+        counts.append(n)
+        n *= 2
+    counts.append(max_threads)
+    return counts
+
+def autotune_threads(synth, speaker_id=None, candidates=None, repeats=2, text=CALIBRATION_TEXT, save=True):
+    """Measure the real-time factor at several thread counts and keep the fastest.
+
+    Real-time factor is synthesis seconds per second of audio (lower is
+    faster). Returns (best thread count, {threads: real-time factor}); the
+    best value is applied and, with save, stored for this machine.
+    """
+    import torch
+    from tts_module.synthesis import call_tts, get_output_sample_rate
+    sample_rate = get_output_sample_rate(synth)
+    measurements = {}
+    for threads in candidates or candidate_thread_counts():
+        torch.set_num_threads(threads)
+        call_tts(synth, text, speaker_id)  # warm-up
+        elapsed = 0.0
+        audio_seconds = 0.0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            wav = call_tts(synth, text, speaker_id)
+            elapsed += time.perf_counter() - start
+            audio_seconds += len(wav) / sample_rate
+        measurements[threads] = elapsed / audio_seconds if audio_seconds else float("inf")
+        log.info("Autotune: %d thread(s) -> real-time factor %.3f", threads, measurements[threads])
+    best = min(measurements, key=measurements.get)
+    log.info("Autotune: using %d thread(s)", best)
+    configure_torch_threads(best)
+    if save:
+        save_threads(best, measurements)
+    return best, measurements
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import importlib
+import subprocess
+
+# Modules imported on the way to a usable window, in startup order
+STARTUP_MODULES = ["PyQt6.QtWidgets", "gui.main_window", "torch", "TTS.utils.synthesizer"]
+
+# Written to stderr before the measured imports so interpreter startup is left out
+_MARKER = "--- cocospeak import report ---"
+
+def parse_importtime(output):
+    """Parse `python -X importtime` stderr into (module, self_us, cumulative_us, depth) tuples."""
+    entries = []
+    if _MARKER in output:
+        output = output.split(_MARKER, 1)[1]
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+def measure_subprocess(modules, root):
+    """Run the imports in a fresh interpreter with -X importtime."""
+    code = "\n".join([
+        "import sys",
+        f"sys.path.insert(0, {root!r})",
+        f"sys.stderr.write({_MARKER!r} + '\\n'); sys.stderr.flush()",
+        f"for m in {list(modules)!r}:",
+        "    try:",
+        # A plain import statement, importlib.import_module() hides the top-level entry
+        "        exec('import ' + m)",
+        "    except Exception as e:",
+        "        print(f'Failed to import {m}: {e}')",
+    ])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=root)
+    if result.stdout.strip():
+        print(result.stdout.strip())
+    return parse_importtime(result.stderr)
+
+def measure_in_process(modules):
+    """Fallback for frozen builds: time each top-level import in this process."""
+    entries = []
+    for module in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"Failed to import {module}: {e}")
+            continue
+        elapsed_us = int((time.perf_counter() - start) * 1e6)
+        entries.append((module, elapsed_us, elapsed_us, 0))
+    return entries
+
+def run_import_report(modules=None, top=25, output=None):
+    """Print an import-time breakdown of startup modules and optionally save it as JSON."""
+    modules = modules or STARTUP_MODULES
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    frozen = getattr(sys, 'frozen', False)
+    entries = measure_in_process(modules) if frozen else measure_subprocess(modules, root)
+    if not entries:
+        print("No import timings collected.")
+        return None
+    top_level = [e for e in entries if e[3] == 0]
+    total_us = sum(e[2] for e in top_level)
+    print(f"Import time report ({'in-process' if frozen else '-X importtime'}), total {total_us / 1e6:.3f}s")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"{cumulative_us / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms  {'  ' * depth}{name}")
+    for module in modules:
+        match = next((e for e in top_level if e[0] == module), None)
+        if match:
+            print(f"  {module}: {match[2] / 1e6:.3f}s")
+    report = {
+        "python": sys.version.split()[0],
+        "frozen": frozen,
+        "modules": modules,
+        "total_seconds": total_us / 1e6,
+        "entries": [{"module": n, "self_us": s, "cumulative_us": c, "depth": d} for n, s, c, d in entries],
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Import report saved to {output}")
+    return report
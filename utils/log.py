@@ -0,0 +1,86 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+
+ROOT_LOGGER = "cocospeak"
+DEFAULT_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+# Rotating log file: size per file and number of old files kept
+LOG_FILE_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+_listener = None
+_queue_handler = None
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records as they are; the listener's handlers do all the formatting."""
+
+    def prepare(self, record):
+        # QueueHandler.prepare() would format the message on the logging thread
+        return record
+
+def get_logger(name):
+    """Logger under the cocospeak hierarchy, e.g. get_logger(__name__) in tts_module/audio.py -> cocospeak.audio."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name.rsplit('.', 1)[-1]}")
+
+def get_log_level(level=None):
+    """Level from the argument, COCOSPEAK_LOG_LEVEL, or INFO."""
+    name = str(level or os.environ.get("COCOSPEAK_LOG_LEVEL") or DEFAULT_LEVEL).upper()
+    value = logging.getLevelName(name)
+    return value if isinstance(value, int) else logging.INFO
+
+def get_default_log_file():
+    """COCOSPEAK_LOG_FILE, or cocospeak.log next to the EXE when it has no console to print to."""
+    if os.environ.get("COCOSPEAK_LOG_FILE"):
+        return os.environ["COCOSPEAK_LOG_FILE"]
+    if getattr(sys, 'frozen', False) and sys.stdout is None:
+        return os.path.join(os.path.dirname(sys.executable), "cocospeak.log")
+    return None
+
+def setup_logging(level=None, log_file=None):
+    """Send cocospeak log records through a queue to console/file handlers on a background thread.
+
+    Callers only pay for the level check and putting the record on the queue;
+    message formatting and I/O happen on the listener thread, so arguments
+    passed to a log call should not be mutated afterwards. Safe to call again
+    to change the level.
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(get_log_level(level))
+    if _listener is not None:
+        return root
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    handlers = []
+    if sys.stdout is not None:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    log_file = log_file or get_default_log_file()
+    if log_file:
+        try:
+            handlers.append(logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8"))
+        except OSError as e:
+            print(f"Could not open log file {log_file}: {e}")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(records)
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    _listener = logging.handlers.QueueListener(records, *handlers)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
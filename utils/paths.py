@@ -11,6 +11,8 @@ def get_resource_path(relative_path):
 
 def get_models_directory():
     """Get the correct models directory path for both Python and EXE modes"""
+    if os.environ.get("COCOSPEAK_MODELS_DIR"):
+        return os.path.abspath(os.environ["COCOSPEAK_MODELS_DIR"])
     if getattr(sys, 'frozen', False):
         # Running as EXE (PyInstaller sets sys.frozen)
         exe_dir = os.path.dirname(sys.executable)